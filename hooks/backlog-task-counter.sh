@@ -5,89 +5,83 @@
 #
 # Fires when: Skill tool is called with implement|orchestrating pattern
 # Reads: Backlog file from session state or recent docs/backlogs/
-# Stores: Expected task count in .expected_task_count
+# Stores: Expected task count and backlog path in the session state store
+# Counts come from the shared backlog index (lib/backlog-index.sh), which
+# also schedules the pending tasks into parallel waves.
 
 set -euo pipefail
 
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+if [[ -z "${_WORKFLOW_BACKLOG_INDEX:-}" ]]; then
+  # shellcheck source=lib/backlog-index.sh
+  source "${HOOKS_DIR}/lib/backlog-index.sh"
+fi
 
-# Check for workflow skip
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-[[ -f "$SKIP_FILE" ]] && { echo '{}'; exit 0; }
+check_backlog_task_counter() {
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
 
-mkdir -p "$SESSION_DIR"
+  # Try to find the backlog path from session state or tool input
+  # First check if there's a backlog path in session state
+  local backlog_path="$WF_BACKLOG_PATH"
 
-# Try to find the backlog path from session state or tool input
-BACKLOG_PATH=""
+  # If not found, try to extract from tool input (args parameter)
+  if [[ -z "$backlog_path" && "$TOOL_INPUT" =~ (docs/backlogs/[^\"]+\.md) ]]; then
+    backlog_path="${BASH_REMATCH[1]}"
+  fi
 
-# First check if there's a backlog path in session state
-if [[ -f "${SESSION_DIR}/.backlog_path" ]]; then
-  BACKLOG_PATH=$(cat "${SESSION_DIR}/.backlog_path" 2>/dev/null || echo "")
-fi
+  # If still not found, look for most recent backlog file
+  if [[ -z "$backlog_path" && -d "docs/backlogs" ]]; then
+    local candidate
+    for candidate in docs/backlogs/*.md; do
+      [[ -f "$candidate" ]] || continue
+      if [[ -z "$backlog_path" || "$candidate" -nt "$backlog_path" ]]; then
+        backlog_path="$candidate"
+      fi
+    done
+  fi
 
-# If not found, try to extract from tool input (args parameter)
-if [[ -z "$BACKLOG_PATH" ]] && echo "$TOOL_INPUT" | grep -qE 'docs/backlogs/'; then
-  BACKLOG_PATH=$(echo "$TOOL_INPUT" | grep -oE 'docs/backlogs/[^"]+\.md' | head -1 || echo "")
-fi
+  # If no backlog found, warn but don't block
+  if [[ -z "$backlog_path" || ! -f "$backlog_path" ]]; then
+    hook_context "BACKLOG INFO: No backlog file found. If you're implementing from a backlog, ensure it exists in docs/backlogs/ or pass the path explicitly. Task count tracking will be skipped."
+    return 0
+  fi
 
-# If still not found, look for most recent backlog file
-if [[ -z "$BACKLOG_PATH" ]] && [[ -d "docs/backlogs" ]]; then
-  BACKLOG_PATH=$(ls -t docs/backlogs/*.md 2>/dev/null | head -1 || echo "")
-fi
+  # Count tasks in backlog (pattern: ### Task N: or ## Task N:)
+  backlog_index_load "$backlog_path" || return 0
+  local task_count="$BACKLOG_TASK_COUNT"
 
-# If no backlog found, warn but don't block
-if [[ -z "$BACKLOG_PATH" ]] || [[ ! -f "$BACKLOG_PATH" ]]; then
-  cat <<'EOF'
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BACKLOG INFO: No backlog file found. If you're implementing from a backlog, ensure it exists in docs/backlogs/ or pass the path explicitly. Task count tracking will be skipped."
-  }
-}
-EOF
-  exit 0
-fi
+  # Store expected count
+  hook_state_set expected_task_count "$task_count"
+  hook_state_set backlog_path "$backlog_path"
 
-# Count tasks in backlog (pattern: ### Task N: or ## Task N:)
-TASK_COUNT=$(grep -cE '^#{2,3}\s+Task\s+[0-9]+' "$BACKLOG_PATH" 2>/dev/null || echo "0")
+  # Generate output with size warning if applicable
+  if [[ "$task_count" -eq 0 ]]; then
+    hook_context "BACKLOG WARNING: No tasks found in $backlog_path. Expected pattern: '### Task N: [description]'. Please verify backlog format."
+  elif [[ "$task_count" -ge 16 ]]; then
+    hook_context "BACKLOG SIZE WARNING: Very large backlog detected ($task_count tasks in $backlog_path). Strongly recommend splitting into phases of 5-10 tasks each. Large backlogs risk context overflow and quality degradation in later tasks."
+  elif [[ "$task_count" -ge 11 ]]; then
+    hook_context "BACKLOG SIZE INFO: Large backlog detected ($task_count tasks). Consider splitting if tasks are complex. Found backlog at: $backlog_path"
+  else
+    hook_context "BACKLOG TRACKING: Found $task_count tasks in $backlog_path. Task completion will be verified at /verify."
+  fi
 
-# Store expected count
-echo "$TASK_COUNT" > "${SESSION_DIR}/.expected_task_count"
-echo "$BACKLOG_PATH" > "${SESSION_DIR}/.backlog_path"
-
-# Generate output with size warning if applicable
-if [[ "$TASK_COUNT" -eq 0 ]]; then
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BACKLOG WARNING: No tasks found in $BACKLOG_PATH. Expected pattern: '### Task N: [description]'. Please verify backlog format."
-  }
-}
-EOF
-elif [[ "$TASK_COUNT" -ge 16 ]]; then
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BACKLOG SIZE WARNING: Very large backlog detected ($TASK_COUNT tasks in $BACKLOG_PATH). Strongly recommend splitting into phases of 5-10 tasks each. Large backlogs risk context overflow and quality degradation in later tasks."
-  }
-}
-EOF
-elif [[ "$TASK_COUNT" -ge 11 ]]; then
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BACKLOG SIZE INFO: Large backlog detected ($TASK_COUNT tasks). Consider splitting if tasks are complex. Found backlog at: $BACKLOG_PATH"
-  }
+  # Waves of pending tasks that share no files; worth reporting when some can
+  # run side by side, or when the dependencies cannot be met
+  backlog_index_waves || return 0
+  local wave schedule parallel=""
+  for wave in ${BACKLOG_WAVES[@]+"${BACKLOG_WAVES[@]}"}; do
+    [[ "$wave" != *" "* ]] || parallel=1
+  done
+  if [[ -n "$parallel" || -n "$BACKLOG_WAVE_CYCLE" || ${#BACKLOG_WAVE_MISSING[@]} -gt 0 ]]; then
+    backlog_waves_summary schedule
+    hook_context "BACKLOG SCHEDULE: ${schedule} Tasks in one wave touch no common files and can be dispatched to implementers in parallel, each prompt with its own '## Task N:' header."
+  fi
 }
-EOF
-else
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BACKLOG TRACKING: Found $TASK_COUNT tasks in $BACKLOG_PATH. Task completion will be verified at /verify."
-  }
-}
-EOF
-fi
 
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_backlog_task_counter
+fi
@@ -0,0 +1,39 @@
+#!/usr/bin/env bash
+# Dry run of the /implement wave schedule for a backlog
+# Usage: backlog-waves.sh [<backlog>]    (default: the session's backlog_path)
+#
+# Prints the waves of pending tasks that can be dispatched to implementers in
+# parallel, one per line, then the critical path. Nothing is dispatched and
+# no session state is written. Exits 1 if the backlog is missing and 3 if its
+# dependencies loop. Goes through lib/backlog-index.sh, so the schedule is the
+# one backlog-task-counter.sh reports when /implement starts.
+
+set -euo pipefail
+
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+if [[ -z "${_WORKFLOW_BACKLOG_INDEX:-}" ]]; then
+  # shellcheck source=lib/backlog-index.sh
+  source "${HOOKS_DIR}/lib/backlog-index.sh"
+fi
+
+backlog_waves_main() {
+  [[ $# -le 1 ]] || { echo "usage: backlog-waves.sh [<backlog>]" >&2; return 2; }
+  hook_load_state
+  local backlog_path="${1:-$WF_BACKLOG_PATH}" summary
+  if [[ -z "$backlog_path" ]] || ! backlog_index_load "$backlog_path"; then
+    echo "backlog-waves.sh: no backlog at '${backlog_path}'" >&2
+    return 1
+  fi
+  backlog_index_waves
+  backlog_waves_summary summary
+  # One sentence per line
+  printf '%s\n' "${summary:-No pending tasks.}" | awk '{ gsub(/\. /, ".\n"); print }'
+  [[ -z "$BACKLOG_WAVE_CYCLE" ]] || return 3
+}
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  backlog_waves_main "$@"
+fi
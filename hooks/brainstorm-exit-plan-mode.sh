@@ -4,36 +4,28 @@
 
 set -euo pipefail
 
-# Read current workflow phase
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-PHASE=$(cat "$PHASE_FILE" 2>/dev/null || echo "idle")
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
 
-case "$PHASE" in
-  "brainstorming")
-    # Transition to backlog-ready to allow design write
-    echo "backlog-ready" > "$PHASE_FILE"
-    cat <<'EOF'
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BRAINSTORMING OUTPUT PHASE: You have exited plan mode. Phase transitioned to 'backlog-ready' to allow writing.\n\nNow:\n1. Write the design document to docs/designs/YYYY-MM-DD-<topic>-design.md\n2. STOP after writing - do NOT proceed to implementation\n3. User will run /backlog-development when ready\n\nDO NOT offer to implement, create backlogs, or proceed automatically."
-  }
+check_brainstorm_exit_plan_mode() {
+  case "${WF_PHASE:-idle}" in
+    "brainstorming")
+      # Transition to backlog-ready to allow design write
+      hook_set_phase "backlog-ready"
+      hook_context "BRAINSTORMING OUTPUT PHASE: You have exited plan mode. Phase transitioned to 'backlog-ready' to allow writing.\n\nNow:\n1. Write the design document to docs/designs/YYYY-MM-DD-<topic>-design.md\n2. STOP after writing - do NOT proceed to implementation\n3. User will run /backlog-development when ready\n\nDO NOT offer to implement, create backlogs, or proceed automatically."
+      ;;
+    "backlog-ready")
+      # Phase already allows writing, just provide guidance
+      hook_context "BACKLOG OUTPUT PHASE: You have exited plan mode.\n\nNow:\n1. Write the backlog document to docs/backlogs/YYYY-MM-DD-<feature>-backlog.md\n2. STOP after writing - do NOT proceed to implementation\n3. User will run /implement when ready\n\nDO NOT offer to implement, dispatch subagents, or proceed automatically."
+      ;;
+    *)
+      # Other phases - no special handling
+      ;;
+  esac
 }
-EOF
-    ;;
-  "backlog-ready")
-    # Phase already allows writing, just provide guidance
-    cat <<'EOF'
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BACKLOG OUTPUT PHASE: You have exited plan mode.\n\nNow:\n1. Write the backlog document to docs/backlogs/YYYY-MM-DD-<feature>-backlog.md\n2. STOP after writing - do NOT proceed to implementation\n3. User will run /implement when ready\n\nDO NOT offer to implement, dispatch subagents, or proceed automatically."
-  }
-}
-EOF
-    ;;
-  *)
-    # Other phases - no special handling
-    echo '{}'
-    ;;
-esac
-exit 0
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_brainstorm_exit_plan_mode
+fi
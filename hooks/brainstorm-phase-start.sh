@@ -4,18 +4,17 @@
 
 set -euo pipefail
 
-# Create session directory if needed
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-mkdir -p "$SESSION_DIR"
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
 
-PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-echo "brainstorming" > "$PHASE_FILE"
+check_brainstorm_phase_start() {
+  hook_set_phase "brainstorming"
 
-cat <<'EOF'
-{
-  "hookSpecificOutput": {
-    "additionalContext": "BRAINSTORMING PHASE STARTED: Use plan mode for exploration (Explore/Plan subagents). Remember: EXIT plan mode before writing the design document to docs/designs/."
-  }
+  hook_context "BRAINSTORMING PHASE STARTED: Use plan mode for exploration (Explore/Plan subagents). Remember: EXIT plan mode before writing the design document to docs/designs/."
 }
-EOF
-exit 0
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_brainstorm_phase_start
+fi
@@ -0,0 +1,97 @@
+#!/usr/bin/env bash
+# Hook dispatcher: run every check registered for one hook event in a single process
+# Usage: run-hook.cmd dispatch.sh <event> <matcher>
+#        run-hook.cmd dispatch.sh --list
+#
+# hooks.json carries one dispatch command per (event, matcher) pair instead of
+# one command per script. Session state and the git branch are read once, each
+# applicable check is sourced and called in-process, and their messages are
+# merged into a single JSON response.
+
+set -euo pipefail
+
+# shellcheck source=lib/common.sh
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+
+# Per-check timing log (lib/timing.sh), opt-in via WORKFLOW_HOOK_TIMING=1
+_DISPATCH_TIMING=""
+if [[ "${WORKFLOW_HOOK_TIMING:-}" == "1" ]]; then
+  _DISPATCH_TIMING=1
+  # shellcheck source=lib/timing.sh
+  source "${HOOKS_DIR}/lib/timing.sh"
+fi
+
+# Registry: "<event> <matcher> <check> [<check>...]"
+# Checks are hook script names without .sh; each script defines check_<name>.
+# Order matters: checks run (and their messages merge) in the order listed.
+HOOK_REGISTRY=(
+  "SessionStart startup|resume|clear|compact session-start"
+  "PreToolUse Bash verify-before-commit tdd-precommit-check"
+  "PreToolUse Task validate-task-description todo-injector"
+  "PreToolUse Skill.*brainstorming brainstorm-phase-start"
+  "PreToolUse Skill.*(orchestrating|implement) backlog-task-counter todo-batch-injector"
+  "PreToolUse Skill.*(verification|verify) verify-task-count todo-sweep"
+  "PostToolUse Skill.*brainstorming phase-transition"
+  "PostToolUse Skill.*(backlog-development|developing-backlogs) phase-transition"
+  "PostToolUse Skill.*(git-workflow|branch) phase-transition"
+  "PostToolUse Skill.*(orchestrating|implement) phase-transition"
+  "PostToolUse Skill.*(verification|verify) phase-transition"
+  "PostToolUse Skill.*workflow.*skip workflow-skip-set"
+  "PostToolUse ExitPlanMode brainstorm-exit-plan-mode"
+  "PostToolUse Task subagent-dispatch-tracker implementer-evidence-check"
+  "PostToolUse Write|Edit backlog-lint main-branch-protection workflow-phase-check"
+  "PostToolUse TodoWrite subagent-review-check"
+)
+
+# Source and run each check in order; output accumulates in the HOOK_* globals
+dispatch_event() {
+  local event="$1" matcher="$2" checks="" check
+  local entry rest
+  for entry in "${HOOK_REGISTRY[@]}"; do
+    [[ "${entry%% *}" == "$event" ]] || continue
+    rest="${entry#* }"
+    [[ "${rest%% *}" == "$matcher" ]] || continue
+    checks="${rest#* }"
+    break
+  done
+
+  if [[ -z "$checks" ]]; then
+    echo "dispatch.sh: no checks registered for $event '$matcher'" >&2
+    return 0
+  fi
+
+  hook_load_state
+  for check in $checks; do
+    dispatch_load_check "$check"
+    if [[ -n "$_DISPATCH_TIMING" ]]; then
+      hook_timing_check "$event" "$matcher" "$check"
+    else
+      "check_${check//-/_}"
+    fi
+  done
+  # Everything the checks changed goes to the state store in one write
+  hook_state_commit
+}
+
+# Source a check script unless its check function is already defined
+dispatch_load_check() {
+  declare -F "check_${1//-/_}" > /dev/null && return 0
+  # shellcheck source=/dev/null
+  source "${HOOKS_DIR}/${1}.sh"
+}
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  if [[ "${1:-}" == "--list" ]]; then
+    printf '%s\n' "${HOOK_REGISTRY[@]}"
+    exit 0
+  fi
+
+  if [[ $# -lt 2 ]]; then
+    echo "Usage: dispatch.sh <event> <matcher> | --list" >&2
+    exit 1
+  fi
+
+  [[ -z "$_DISPATCH_TIMING" ]] || trap hook_timing_abort EXIT
+  dispatch_event "$1" "$2"
+  hook_flush
+fi
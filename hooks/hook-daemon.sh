@@ -0,0 +1,217 @@
+#!/usr/bin/env bash
+# Resident hook daemon: serve dispatch.sh requests from one long-lived process
+# Usage: hook-daemon.sh start|stop|status
+#
+# Opt-in: set WORKFLOW_HOOK_DAEMON=1 and SessionStart launches it, or start it
+# by hand. While it runs, run-hook.cmd forwards each dispatch.sh call over a
+# named pipe instead of starting bash and sourcing the checks again. The
+# daemon keeps the checks and the session state store loaded between
+# requests.
+#
+# Protocol (all paths under ${SESSION_DIR}/.hookd):
+#   client writes <req>.meta   event, matcher, tool name, working directory
+#                 <req>.input  CLAUDE_TOOL_INPUT
+#                 <req>.output CLAUDE_TOOL_OUTPUT
+#   client creates FIFO <req>.reply, writes "<req>" to the requests FIFO,
+#   then reads the JSON response from <req>.reply.
+# An empty reply makes the client run the hook directly, so a dead daemon
+# never changes hook behavior: if the daemon dies mid-request the client
+# sees EOF, and if it dies before opening the requests FIFO or the reply,
+# the client's watchdog opens them itself. Stopped with TERM or INT, the
+# daemon answers the requests already queued before it exits.
+#
+# The daemon exits after WORKFLOW_HOOK_DAEMON_IDLE seconds without requests
+# (default 1800).
+
+set -euo pipefail
+
+# shellcheck source=dispatch.sh
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/dispatch.sh"
+
+HOOKD_DIR="${SESSION_DIR}/.hookd"
+HOOKD_FIFO="${HOOKD_DIR}/requests"
+HOOKD_PIDFILE="${HOOKD_DIR}/pid"
+HOOKD_STAMP="${HOOKD_DIR}/stamp"
+HOOKD_IDLE="${WORKFLOW_HOOK_DAEMON_IDLE:-1800}"
+
+# State files whose external changes (e.g. /workflow reset) force a reload:
+# the state store, and the legacy per-key files hook_load_state migrates
+HOOKD_WATCHED=("${STATE_FILE##*/}")
+for _hookd_entry in "${HOOK_STATE_LEGACY[@]}"; do
+  HOOKD_WATCHED+=("${_hookd_entry% *}")
+done
+unset _hookd_entry
+
+# Per-process bookkeeping for cache invalidation
+_HOOKD_PRESENT=""
+_HOOKD_SERVED=0
+_HOOKD_GARBAGE=()
+_HOOKD_STOPPING=""
+
+# Print the daemon pid and succeed when one is running for this session
+hookd_running() {
+  local pid=""
+  [[ -p "$HOOKD_FIFO" && -f "$HOOKD_PIDFILE" ]] || return 1
+  { read -r pid || true; } < "$HOOKD_PIDFILE"
+  [[ -n "$pid" ]] && kill -0 "$pid" 2> /dev/null || return 1
+  echo "$pid"
+}
+
+hookd_start() {
+  hookd_running > /dev/null && return 0
+  hook_ensure_session_dir
+  mkdir -p "$HOOKD_DIR"
+  rm -f "$HOOKD_FIFO"
+  mkfifo "$HOOKD_FIFO"
+  nohup "${HOOKS_DIR}/hook-daemon.sh" serve < /dev/null > /dev/null 2>&1 &
+  echo "$!" > "$HOOKD_PIDFILE"
+}
+
+hookd_stop() {
+  local pid
+  pid=$(hookd_running) || return 0
+  # Stop routing clients to it right away; the daemon may take up to a
+  # second to notice the signal
+  rm -f "$HOOKD_FIFO" "$HOOKD_PIDFILE"
+  kill "$pid" 2> /dev/null || true
+}
+
+# Existence of each watched file, as a string of 0/1 flags
+_hookd_presence() {
+  local name flags=""
+  for name in "${HOOKD_WATCHED[@]}"; do
+    if [[ -e "${SESSION_DIR}/${name}" ]]; then flags+=1; else flags+=0; fi
+  done
+  printf -v "$1" '%s' "$flags"
+}
+
+# Drop cached state that changed outside the daemon since the last request.
+# The daemon's own writes keep the WF_* globals current, so only files that
+# appeared, vanished or were modified since the stamp need a reload. Files as
+# new as the stamp count as modified: timestamps are too coarse to tell.
+_hookd_refresh() {
+  local present name
+  _hookd_presence present
+  if [[ "$present" != "$_HOOKD_PRESENT" ]]; then
+    WF_STATE_LOADED=""
+  else
+    for name in "${HOOKD_WATCHED[@]}"; do
+      if [[ ! "${SESSION_DIR}/${name}" -ot "$HOOKD_STAMP" ]]; then
+        WF_STATE_LOADED=""
+        break
+      fi
+    done
+  fi
+
+  # The branch is read from HEAD without running git, so re-probe every
+  # request: the branch may have changed in a terminal as well
+  WF_GIT_PROBED=""
+}
+
+# Remember what the state files looked like once this request is done
+_hookd_mark() {
+  _HOOKD_SERVED=$((_HOOKD_SERVED + 1))
+  printf '%s\n' "$_HOOKD_SERVED" > "$HOOKD_STAMP"
+  _hookd_presence _HOOKD_PRESENT
+}
+
+_hookd_handle() {
+  local req="$1" event="" matcher="" cwd=""
+  [[ -f "${req}.meta" && -p "${req}.reply" ]] || return 0
+  {
+    IFS= read -r event || true
+    IFS= read -r matcher || true
+    IFS= read -r TOOL_NAME || true
+    IFS= read -r cwd || true
+  } < "${req}.meta"
+  hook_read_file TOOL_INPUT "${req}.input"
+  hook_read_file TOOL_OUTPUT "${req}.output"
+
+  # Open the reply before running checks: if the daemon dies mid-request the
+  # client sees EOF and falls back to running the hook itself. The open waits
+  # for the client to start reading, so skip clients that have already exited.
+  _HOOKD_GARBAGE+=("${req}.meta" "${req}.input" "${req}.output" "${req}.reply")
+  kill -0 "${req##*.}" 2> /dev/null || return 0
+  exec 4> "${req}.reply"
+  cd "$cwd" 2> /dev/null || cd /
+  _hookd_refresh
+  hook_reset_output
+  dispatch_event "$event" "$matcher"
+  # Mark before replying: anything changed after the client has its answer
+  # must count as an external change
+  _hookd_mark
+  hook_flush >&4
+  exec 4>&-
+
+  # Under sustained load there may be no idle second to clean up in
+  [[ ${#_HOOKD_GARBAGE[@]} -lt 256 ]] || _hookd_collect
+}
+
+# Remove finished request files; runs while idle to keep rm off the hot path
+_hookd_collect() {
+  [[ ${#_HOOKD_GARBAGE[@]} -gt 0 ]] || return 0
+  rm -f "${_HOOKD_GARBAGE[@]}"
+  _HOOKD_GARBAGE=()
+}
+
+_hookd_cleanup() {
+  rm -f "$HOOKD_FIFO" "$HOOKD_PIDFILE" "$HOOKD_STAMP" ${_HOOKD_GARBAGE[@]+"${_HOOKD_GARBAGE[@]}"}
+  _HOOKD_GARBAGE=()
+}
+
+hookd_serve() {
+  trap _hookd_cleanup EXIT
+  trap '_HOOKD_STOPPING=1' TERM INT
+  echo "$$" > "$HOOKD_PIDFILE"
+
+  # Load every registered check once, up front
+  local entry check
+  for entry in "${HOOK_REGISTRY[@]}"; do
+    for check in ${entry#* * }; do
+      dispatch_load_check "$check"
+    done
+  done
+  hook_load_state
+  _hookd_mark
+
+  # Hold the FIFO open read-write so the loop never sees EOF between clients
+  exec 3<> "$HOOKD_FIFO"
+  local req idle_since="$SECONDS"
+  while [[ -z "$_HOOKD_STOPPING" ]]; do
+    if IFS= read -r -t 1 req <&3; then
+      # A failing check must not take the daemon down
+      _hookd_handle "$req" || true
+      idle_since="$SECONDS"
+    else
+      _hookd_collect
+      (( SECONDS - idle_since < HOOKD_IDLE )) || break
+    fi
+  done
+
+  # Idle or stopped: stop accepting requests, then answer any already queued
+  _hookd_cleanup
+  while IFS= read -r -t 1 req <&3; do
+    _hookd_handle "$req" || true
+  done
+  _hookd_collect
+}
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  case "${1:-}" in
+    start) hookd_start ;;
+    stop) hookd_stop ;;
+    status)
+      if pid=$(hookd_running); then
+        echo "hook daemon running (pid $pid)"
+      else
+        echo "hook daemon not running"
+        exit 1
+      fi
+      ;;
+    serve) hookd_serve ;;
+    *)
+      echo "Usage: hook-daemon.sh start|stop|status" >&2
+      exit 1
+      ;;
+  esac
+fi
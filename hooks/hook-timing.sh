@@ -0,0 +1,66 @@
+#!/usr/bin/env bash
+# Summarize the per-check timing log written when WORKFLOW_HOOK_TIMING=1
+# Usage: hook-timing.sh [summary]   p50/p95/p99/max wall time per check
+#        hook-timing.sh clear       remove the log
+#
+# Reads ${SESSION_DIR}/.hook_timing.jsonl and its previous segment (see
+# lib/timing.sh). Checks are listed slowest first by p95; times are in ms.
+
+set -euo pipefail
+
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+# shellcheck source=lib/timing.sh
+source "${HOOKS_DIR}/lib/timing.sh"
+
+# Print "<hook> <calls> <p50> <p95> <p99> <max>" per hook, slowest p95 first
+hook_timing_summary() {
+  local logs=() log
+  for log in "${HOOK_TIMING_LOG}.1" "$HOOK_TIMING_LOG"; do
+    [[ -s "$log" ]] && logs+=("$log")
+  done
+  if [[ ${#logs[@]} -eq 0 ]]; then
+    echo "No timing records in ${HOOK_TIMING_LOG} (set WORKFLOW_HOOK_TIMING=1)" >&2
+    return 1
+  fi
+
+  printf '%-30s %7s %9s %9s %9s %9s\n' "hook" "calls" "p50 ms" "p95 ms" "p99 ms" "max ms"
+  LC_ALL=C awk '
+    match($0, /"hook": *"[^"]*"/) {
+      hook = substr($0, RSTART, RLENGTH)
+      sub(/^"hook": *"/, "", hook)
+      sub(/"$/, "", hook)
+    }
+    match($0, /"ms": *[0-9.]+/) {
+      ms = substr($0, RSTART, RLENGTH)
+      sub(/^"ms": */, "", ms)
+      print hook, ms
+    }
+  ' "${logs[@]}" | LC_ALL=C sort -k1,1 -k2,2n | LC_ALL=C awk '
+    # Nearest-rank percentile of the sorted values v[1..n]
+    function rank(p,   r) { r = int(p * n + 0.999999); return v[r < 1 ? 1 : r] }
+    function emit() {
+      if (n) printf "%-30s %7d %9.3f %9.3f %9.3f %9.3f\n", hook, n, rank(0.50), rank(0.95), rank(0.99), v[n]
+    }
+    $1 != hook { emit(); hook = $1; n = 0 }
+    { v[++n] = $2 }
+    END { emit() }
+  ' | LC_ALL=C sort -k4,4nr -k1,1
+}
+
+hook_timing_main() {
+  case "${1:-summary}" in
+    summary) hook_timing_summary ;;
+    clear) rm -f "$HOOK_TIMING_LOG" "${HOOK_TIMING_LOG}.1" ;;
+    *)
+      echo "Usage: hook-timing.sh [summary|clear]" >&2
+      return 2
+      ;;
+  esac
+}
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_timing_main "$@"
+fi
@@ -8,83 +8,97 @@
 
 set -euo pipefail
 
-TOOL_NAME="${CLAUDE_TOOL_NAME:-}"
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-TOOL_OUTPUT="${CLAUDE_TOOL_OUTPUT:-}"
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
 
-# Only process Task tool completions
-[[ "$TOOL_NAME" != "Task" ]] && { echo '{}'; exit 0; }
+# Longest excerpt of a matching line quoted back in the warning, in bytes
+EVIDENCE_EXCERPT_MAX=80
 
-# Only check code-implementer dispatches
-echo "$TOOL_INPUT" | grep -qE 'code-implementer' || { echo '{}'; exit 0; }
+# Scan TOOL_OUTPUT once, a line at a time, for the three evidence classes:
+#   test   test runner output (pass/fail counts, assertions, pytest, jest)
+#   git    a git reference (diff, commit hash, HEAD, staged/modified)
+#   files  a source file path or extension
+# Prints "<class>\t<line number>\t<excerpt>" for the first line matching
+# each class and stops reading as soon as all three are found, so large
+# reports with early evidence are not read to the end. Memory use is one
+# line plus the three excerpts, whatever the size of the report. A
+# JSON-encoded report is split into lines at its \n escapes.
+evidence_scan() {
+  LC_ALL=C awk -v max="$EVIDENCE_EXCERPT_MAX" '
+    BEGIN { RS = "\n|\\\\n" }
+    function hit(class,    s) {
+      s = $0
+      gsub(/[\001-\037\177]/, " ", s)
+      sub(/^ +/, "", s)
+      if (length(s) > max) {
+        s = substr(s, 1, max)
+        # Do not leave half a UTF-8 character at the cut
+        sub(/[\300-\377][\200-\277]*$/, "", s)
+        s = s "..."
+      }
+      printf "%s\t%d\t%s\n", class, NR, s
+      found[class] = 1
+      if (++n == 3) exit
+    }
+    {
+      lower = tolower($0)
+      if (!("test" in found) && lower ~ /pass|fail|assert|pytest|jest|test.*result|\342\234\223|\342\234\227/) hit("test")
+      if (!("git" in found) && lower ~ /git diff|git commit|commit [a-f0-9][a-f0-9][a-f0-9][a-f0-9][a-f0-9][a-f0-9][a-f0-9]|head|staged|modified:/) hit("git")
+      if (!("files" in found) && $0 ~ /\.(py|ts|tsx|js|jsx|go|rs|java|rb|sh|md)([^A-Za-z0-9_]|$)|src\/|tests?\/|lib\/|app\//) hit("files")
+    }
+  ' <<< "$TOOL_OUTPUT"
+}
 
-# Check for workflow skip
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-[[ -f "$SKIP_FILE" ]] && { echo '{}'; exit 0; }
+check_implementer_evidence_check() {
+  # Only process Task tool completions
+  [[ "$TOOL_NAME" == "Task" ]] || return 0
 
-# Check if in implementing phase
-PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-PHASE=$(cat "$PHASE_FILE" 2>/dev/null || echo "")
-[[ "$PHASE" != "implementing" ]] && { echo '{}'; exit 0; }
+  # Only check code-implementer dispatches
+  local agent
+  hook_subagent_type agent
+  [[ "$agent" == "code-implementer" ]] || return 0
 
-# Check for evidence patterns in the output
-# Note: TOOL_OUTPUT may be truncated or unavailable in some cases
-if [[ -z "$TOOL_OUTPUT" ]]; then
-  # Can't check output - just provide reminder
-  cat <<'EOF'
-{
-  "hookSpecificOutput": {
-    "additionalContext": "EVIDENCE REMINDER: Ensure implementer provided verification evidence including: test output (passed/failed counts), git diff reference, and list of files modified."
-  }
-}
-EOF
-  exit 0
-fi
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
 
-# Initialize evidence tracking
-HAS_TEST_EVIDENCE=false
-HAS_GIT_EVIDENCE=false
-HAS_FILE_EVIDENCE=false
+  # Check if in implementing phase
+  [[ "$WF_PHASE" == "implementing" ]] || return 0
 
-# Check for test output evidence
-if echo "$TOOL_OUTPUT" | grep -qiE 'passed|failed|assert|pytest|jest|test.*result|PASS|FAIL|✓|✗|tests? (pass|fail)'; then
-  HAS_TEST_EVIDENCE=true
-fi
+  # Check for evidence patterns in the output
+  # Note: TOOL_OUTPUT may be truncated or unavailable in some cases
+  if [[ -z "$TOOL_OUTPUT" ]]; then
+    # Can't check output - just provide reminder
+    hook_context "EVIDENCE REMINDER: Ensure implementer provided verification evidence including: test output (passed/failed counts), git diff reference, and list of files modified."
+    return 0
+  fi
 
-# Check for git evidence
-if echo "$TOOL_OUTPUT" | grep -qiE 'git diff|git commit|commit [a-f0-9]{7}|HEAD|staged|modified:'; then
-  HAS_GIT_EVIDENCE=true
-fi
+  local missing="" found="" seen=" " class line excerpt label
+  while IFS=$'\t' read -r class line excerpt; do
+    seen+="${class} "
+    excerpt="${excerpt//\\/\\\\}"
+    excerpt="${excerpt//\"/\\\"}"
+    case "$class" in
+      test) label="test output" ;;
+      git) label="git reference" ;;
+      *) label="file paths" ;;
+    esac
+    found="${found}${label} (line ${line}: ${excerpt}), "
+  done < <(evidence_scan)
 
-# Check for file path evidence
-if echo "$TOOL_OUTPUT" | grep -qE '\.(py|ts|tsx|js|jsx|go|rs|java|rb|sh|md)\b|src/|tests?/|lib/|app/'; then
-  HAS_FILE_EVIDENCE=true
-fi
+  [[ "$seen" == *" test "* ]] || missing="${missing}test output, "
+  [[ "$seen" == *" git "* ]] || missing="${missing}git reference, "
+  [[ "$seen" == *" files "* ]] || missing="${missing}file paths, "
 
-# Generate warning if evidence is missing
-MISSING=""
-if [[ "$HAS_TEST_EVIDENCE" != "true" ]]; then
-  MISSING="${MISSING}test output, "
-fi
-if [[ "$HAS_GIT_EVIDENCE" != "true" ]]; then
-  MISSING="${MISSING}git reference, "
-fi
-if [[ "$HAS_FILE_EVIDENCE" != "true" ]]; then
-  MISSING="${MISSING}file paths, "
-fi
+  # Generate warning if evidence is missing
+  [[ -n "$missing" ]] || return 0
 
-if [[ -n "$MISSING" ]]; then
-  MISSING="${MISSING%, }"  # Remove trailing comma
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "EVIDENCE WARNING: Implementer completion may lack verification evidence. Missing: ${MISSING}. Completion reports should include: (1) test output with pass/fail counts, (2) git diff or commit reference, (3) list of files modified. Reviewers need this evidence to verify work."
-  }
+  missing="${missing%, }"  # Remove trailing comma
+  [[ -z "$found" ]] || found=" Found: ${found%, }."
+  hook_context "EVIDENCE WARNING: Implementer completion may lack verification evidence. Missing: ${missing}.${found} Completion reports should include: (1) test output with pass/fail counts, (2) git diff or commit reference, (3) list of files modified. Reviewers need this evidence to verify work."
 }
-EOF
-else
-  echo '{}'
-fi
 
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_implementer_evidence_check
+fi
@@ -0,0 +1,91 @@
+# Backlog index builder: one pass over a backlog markdown file
+# Usage: awk -v key="<mtime> <size>" -v path=<backlog> -f backlog-index.awk <backlog>
+#
+# Prints the index read by lib/backlog-index.sh, one record per line with
+# fields separated by the ASCII unit separator (\037) so that empty fields
+# survive bash's read:
+#   key        <mtime> <size>      of the backlog when it was indexed
+#   path       <backlog path>
+#   tasks      <number of tasks>
+#   completed  <number of tasks marked [COMPLETED]>
+# then one row per task, in backlog order:
+#   <number> <done 0/1> <title> <test path> <run command> <files> <depends>
+# Files are the Create: and Modify: paths, space-separated, without line
+# ranges; depends are the task numbers named on a "Depends on:" line.
+# Fields inside code fences are ignored.
+
+BEGIN { US = "\037" }
+
+# Field value with markdown decoration and control characters removed
+function value(s) {
+  sub(/^[^:]*:[ \t]*/, "", s)
+  gsub(/[\001-\037]/, " ", s)
+  gsub(/\*\*|`/, "", s)
+  sub(/^ +/, "", s)
+  sub(/ +$/, "", s)
+  return s
+}
+
+function finish() {
+  if (!tasks) return
+  rows[tasks] = num US done US title US test US run US files US depends
+  completed += done
+}
+
+/^[ \t]*(```|~~~)/ {
+  fence = !fence
+  next
+}
+
+!fence && /^###?[ \t]+Task[ \t]+[0-9]/ {
+  finish()
+  tasks++
+  title = $0
+  sub(/^#+[ \t]+Task[ \t]+/, "", title)
+  num = title
+  sub(/[^0-9].*/, "", num)
+  sub(/^[0-9]+[ \t]*:?[ \t]*/, "", title)
+  done = (index(title, "[COMPLETED]") > 0)
+  gsub(/[ \t]*\[COMPLETED\]/, "", title)
+  gsub(/[\001-\037]/, " ", title)
+  test = run = files = depends = ""
+  next
+}
+
+!tasks { next }
+
+/^\[COMPLETED\]/ { done = 1 }
+
+/^[ \t]*([-*][ \t]+)?(\*\*)?Run:/ {
+  if (run == "") run = value($0)
+  next
+}
+
+fence { next }
+
+/^[ \t]*([-*][ \t]+)?(\*\*)?Test:/ {
+  if (test == "") test = value($0)
+  next
+}
+
+/^[ \t]*([-*][ \t]+)?(\*\*)?[Dd]epends [Oo]n:/ {
+  rest = value($0)
+  while (match(rest, /[0-9]+/)) {
+    depends = depends (depends == "" ? "" : " ") substr(rest, RSTART, RLENGTH)
+    rest = substr(rest, RSTART + RLENGTH)
+  }
+  next
+}
+
+/^[ \t]*([-*][ \t]+)?(\*\*)?(Create|Modify):/ {
+  file = value($0)
+  sub(/:[0-9][-0-9,]*$/, "", file)
+  if (file != "") files = files (files == "" ? "" : " ") file
+}
+
+END {
+  finish()
+  printf "key%s%s\npath%s%s\n", US, key, US, path
+  printf "tasks%s%d\ncompleted%s%d\n", US, tasks, US, completed
+  for (i = 1; i <= tasks; i++) print rows[i]
+}
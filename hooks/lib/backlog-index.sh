@@ -0,0 +1,172 @@
+# shellcheck shell=bash
+# Parsed backlog index shared by the backlog-aware hooks
+# Sourced after lib/common.sh; defines globals and functions only.
+#
+# The backlog is parsed once (lib/backlog-index.awk) into
+# ${SESSION_DIR}/.backlog_index, keyed on the backlog's mtime and size.
+# backlog-lint.sh builds it when a backlog is written; the task counter,
+# verify-task-count.sh and todo-injector.sh read task counts, completion
+# state and per-task test paths from it instead of scanning the markdown.
+# backlog_index_waves schedules the pending tasks from it (lib/backlog-waves.awk).
+
+[[ -n "${_WORKFLOW_BACKLOG_INDEX:-}" ]] && return 0
+_WORKFLOW_BACKLOG_INDEX=1
+
+BACKLOG_INDEX="${SESSION_DIR}/.backlog_index"
+
+# Filled by backlog_index_load
+BACKLOG_TASK_COUNT=0
+BACKLOG_COMPLETED_COUNT=0
+_BACKLOG_INDEXED_KEY=""
+_BACKLOG_INDEXED_PATH=""
+
+# Filled by backlog_index_task
+BACKLOG_TASK_DONE=""
+BACKLOG_TASK_TITLE=""
+BACKLOG_TASK_TEST=""
+BACKLOG_TASK_RUN=""
+BACKLOG_TASK_FILES=""
+BACKLOG_TASK_DEPENDS=""
+
+# Filled by backlog_index_waves; task numbers are space-separated
+BACKLOG_WAVES=()
+BACKLOG_CRITICAL_PATH=""
+BACKLOG_WAVE_CYCLE=""
+BACKLOG_WAVE_MISSING=()
+
+# "<mtime> <size>" of a file into the named variable (GNU or BSD stat)
+_backlog_index_key() {
+  local __key
+  __key=$(stat -c '%Y %s' "$2" 2> /dev/null || stat -f '%m %z' "$2" 2> /dev/null) || return 1
+  printf -v "$1" '%s' "$__key"
+}
+
+# Parse a backlog into the index; written atomically so readers never see
+# a partial file
+backlog_index_build() {
+  local path="$1" key tmp
+  _backlog_index_key key "$path" || return 1
+  hook_ensure_session_dir
+  tmp="${BACKLOG_INDEX}.$$"
+  if LC_ALL=C awk -v key="$key" -v path="$path" \
+    -f "${HOOKS_DIR}/lib/backlog-index.awk" "$path" > "$tmp"; then
+    mv -f "$tmp" "$BACKLOG_INDEX"
+  else
+    rm -f "$tmp"
+    return 1
+  fi
+}
+
+# Header fields of the index file into globals (all empty/0 if missing)
+_backlog_index_header() {
+  local field value
+  _BACKLOG_INDEXED_KEY=""
+  _BACKLOG_INDEXED_PATH=""
+  BACKLOG_TASK_COUNT=0
+  BACKLOG_COMPLETED_COUNT=0
+  [[ -f "$BACKLOG_INDEX" ]] || return 0
+  while IFS=$'\037' read -r field value; do
+    case "$field" in
+      key) _BACKLOG_INDEXED_KEY="$value" ;;
+      path) _BACKLOG_INDEXED_PATH="$value" ;;
+      tasks) BACKLOG_TASK_COUNT="$value" ;;
+      completed)
+        BACKLOG_COMPLETED_COUNT="$value"
+        break
+        ;;
+    esac
+  done < "$BACKLOG_INDEX"
+}
+
+# Make sure the index describes the given backlog, rebuilding it when the
+# backlog changed, then load the task counts. Fails if the backlog is missing.
+# A backlog older than its index is current without a stat call; otherwise
+# the recorded mtime and size decide.
+backlog_index_load() {
+  local path="$1" key
+  [[ -f "$path" ]] || return 1
+  _backlog_index_header
+
+  if [[ "$_BACKLOG_INDEXED_PATH" == "$path" && "$path" -ot "$BACKLOG_INDEX" ]]; then
+    return 0
+  fi
+  if [[ "$_BACKLOG_INDEXED_PATH" == "$path" ]]; then
+    _backlog_index_key key "$path" || return 1
+    if [[ "$key" == "$_BACKLOG_INDEXED_KEY" ]]; then
+      # Unchanged; the timestamps were just too coarse to tell
+      touch "$BACKLOG_INDEX"
+      return 0
+    fi
+  fi
+  backlog_index_build "$path" || return 1
+  _backlog_index_header
+}
+
+# Look up one task of the loaded index by number; fails if it is not there
+backlog_index_task() {
+  local number state title test run files depends
+  BACKLOG_TASK_DONE=""
+  BACKLOG_TASK_TITLE=""
+  BACKLOG_TASK_TEST=""
+  BACKLOG_TASK_RUN=""
+  BACKLOG_TASK_FILES=""
+  BACKLOG_TASK_DEPENDS=""
+  [[ -f "$BACKLOG_INDEX" ]] || return 1
+  while IFS=$'\037' read -r number state title test run files depends; do
+    [[ "$number" == "$1" ]] || continue
+    BACKLOG_TASK_DONE="$state"
+    BACKLOG_TASK_TITLE="$title"
+    BACKLOG_TASK_TEST="$test"
+    BACKLOG_TASK_RUN="$run"
+    BACKLOG_TASK_FILES="$files"
+    BACKLOG_TASK_DEPENDS="$depends"
+    return 0
+  done < "$BACKLOG_INDEX"
+  return 1
+}
+
+# Schedule the pending tasks of the loaded index into waves that can be
+# implemented in parallel; BACKLOG_WAVES[i] holds wave i+1. Dependencies on
+# unknown tasks land in BACKLOG_WAVE_MISSING ("<task> <dependency>"), and a
+# dependency loop leaves its tasks in BACKLOG_WAVE_CYCLE.
+backlog_index_waves() {
+  local kind first rest
+  BACKLOG_WAVES=()
+  BACKLOG_CRITICAL_PATH=""
+  BACKLOG_WAVE_CYCLE=""
+  BACKLOG_WAVE_MISSING=()
+  [[ -f "$BACKLOG_INDEX" ]] || return 1
+  while IFS=$'\037' read -r kind first rest; do
+    case "$kind" in
+      wave) BACKLOG_WAVES+=("$rest") ;;
+      critical) BACKLOG_CRITICAL_PATH="$first" ;;
+      cycle) BACKLOG_WAVE_CYCLE="$first" ;;
+      missing) BACKLOG_WAVE_MISSING+=("$first $rest") ;;
+    esac
+  done < <(LC_ALL=C awk -F '\037' -f "${HOOKS_DIR}/lib/backlog-waves.awk" "$BACKLOG_INDEX")
+}
+
+# The schedule from backlog_index_waves as one line of text, into the named
+# variable: "Wave 1: Tasks 1, 2. Wave 2: Task 3. Critical path: ..."
+backlog_waves_summary() {
+  local __parts=() __tasks=() __i __pending=0 __missing
+  for __i in "${!BACKLOG_WAVES[@]}"; do
+    read -ra __tasks <<< "${BACKLOG_WAVES[$__i]}"
+    __pending=$((__pending + ${#__tasks[@]}))
+    if [[ ${#__tasks[@]} -eq 1 ]]; then
+      __parts+=("Wave $((__i + 1)): Task ${__tasks[0]}.")
+    else
+      __parts+=("Wave $((__i + 1)): Tasks ${BACKLOG_WAVES[$__i]// /, }.")
+    fi
+  done
+  if [[ -n "$BACKLOG_CRITICAL_PATH" ]]; then
+    __parts+=("Critical path: Task ${BACKLOG_CRITICAL_PATH// / -> Task } (${#BACKLOG_WAVES[@]} of ${__pending} pending tasks in sequence).")
+  fi
+  if [[ -n "$BACKLOG_WAVE_CYCLE" ]]; then
+    __parts+=("Dependency loop: Tasks ${BACKLOG_WAVE_CYCLE// /, } cannot be scheduled.")
+  fi
+  for __missing in ${BACKLOG_WAVE_MISSING[@]+"${BACKLOG_WAVE_MISSING[@]}"}; do
+    __parts+=("Task ${__missing% *} depends on Task ${__missing#* }, which is not in the backlog.")
+  done
+  printf -v "$1" '%s' "${__parts[*]}"
+}
@@ -0,0 +1,190 @@
+# Backlog lint engine: one streaming pass over a backlog markdown file
+# Usage: awk -f backlog-lint.awk docs/backlogs/<name>.md
+#
+# Splits the file into tasks ("## Task N" / "### Task N" headings) and code
+# fences, applies every rule as each line goes by, and prints the findings
+# grouped per task as JSON string contents (literal \n between lines).
+# Prints nothing when the backlog is clean.
+#
+# Rules:
+#   - TODO, FIXME, XXX anywhere
+#   - in code fences only: a standalone "..." line, "# implement" / "# add" /
+#     "// implement" / "// add" comments, "raise NotImplementedError",
+#     "pass" as a whole function body, and functions with no body at all
+#   - a task without a "Run:" line
+# Fences tagged as text, console, output and the like hold prose, not code.
+# Stubs under @overload or @abstractmethod are real code and are not flagged.
+
+# Replace by splitting and joining: gsub replacement strings treat
+# backslashes differently across awk implementations
+function swap(s, re, with,    parts, n, i, out) {
+  n = split(s, parts, re)
+  out = parts[1]
+  for (i = 2; i <= n; i++) out = out with parts[i]
+  return out
+}
+
+# Trimmed, shortened source line, escaped for a JSON string
+function snippet(s) {
+  gsub(/[\001-\037]/, " ", s)
+  sub(/^ +/, "", s)
+  sub(/ +$/, "", s)
+  if (length(s) > 80) s = substr(s, 1, 77) "..."
+  if (index(s, "\\")) s = swap(s, "\\\\", "\\\\")
+  if (index(s, "\"")) s = swap(s, "\"", "\\\"")
+  return s
+}
+
+function indent_of(s) {
+  match(s, /^[ \t]*/)
+  return RLENGTH
+}
+
+function finding(text) {
+  findings[group] = findings[group] "\\n    " text
+  count[group]++
+  total++
+}
+
+function flag(desc, line) {
+  finding("line " FNR ": " desc ": " snippet(line))
+}
+
+# Start a new finding group; tasks also track whether they have a Run: line
+function open_group(label, is_task) {
+  close_task()
+  group = ++groups
+  labels[group] = snippet(label)
+  in_task = is_task
+  has_run = 0
+}
+
+function close_task() {
+  if (in_task && !has_run) {
+    findings[group] = findings[group] "\\n    no test command (missing 'Run:' line)"
+    count[group]++
+    total++
+  }
+  in_task = 0
+}
+
+function close_def() {
+  if (def_line != "" && !def_exempt) {
+    findings[group] = findings[group] "\\n    line " def_at ": Empty function definition: " snippet(def_line)
+    count[group]++
+    total++
+  }
+  def_line = ""
+}
+
+BEGIN {
+  group = groups = 1
+  labels[1] = "Preamble"
+  prose_fence["text"] = prose_fence["txt"] = prose_fence["plain"] = 1
+  prose_fence["plaintext"] = prose_fence["markdown"] = prose_fence["md"] = 1
+  prose_fence["console"] = prose_fence["output"] = prose_fence["log"] = 1
+}
+
+# Fence delimiters; the info string decides whether code rules apply
+/^[ \t]*(```|~~~)/ {
+  if (fence) {
+    close_def()
+    fence = 0
+  } else {
+    lang = $0
+    sub(/^[ \t]*(```+|~~~+)[ \t]*/, "", lang)
+    sub(/[^A-Za-z0-9_+-].*/, "", lang)
+    fence = (tolower(lang) in prose_fence) ? 2 : 1
+    decorated = ""
+    body_of = ""
+  }
+  next
+}
+
+# Headings outside fences delimit tasks; a heading at the task's level or
+# above ends the current task
+!fence && /^###?[ \t]+Task[ \t]+[0-9]/ {
+  match($0, /^#+/)
+  task_level = RLENGTH
+  open_group(substr($0, RLENGTH + 2), 1)
+  next
+}
+
+!fence && /^##?#?[ \t]/ {
+  match($0, /^#+/)
+  if (in_task && RLENGTH <= task_level) open_group(substr($0, RLENGTH + 2), 0)
+  next
+}
+
+/TODO|FIXME|XXX/ { flag("TODO/FIXME/XXX placeholder", $0) }
+
+/^[ \t]*([-*][ \t]+)?(\*\*)?Run:/ { has_run = 1 }
+
+fence != 1 { next }
+
+# Code fence: Python-aware placeholder rules
+/^[ \t]*$/ { next }
+
+{
+  ind = indent_of($0)
+  # The first statement after a def header decides whether it has a body
+  if (def_line != "") {
+    if (ind <= def_indent) close_def()
+    else def_line = ""
+  }
+}
+
+/^[ \t]*\.\.\.[ \t]*$/ {
+  if (!(body_of != "" && ind > body_indent && stub_ok)) flag("Ellipsis placeholder", $0)
+  next
+}
+
+/(#|\/\/)[ \t]*(implement|add)([^A-Za-z0-9_]|$)/ {
+  flag("Placeholder implementation comment", $0)
+}
+
+/raise[ \t]+NotImplementedError/ {
+  if (!(body_of != "" && ind > body_indent && stub_ok)) flag("NotImplementedError placeholder", $0)
+}
+
+/^[ \t]*pass[ \t]*$/ {
+  # pass is fine in class, except and loop bodies, not as a function body
+  if (prev_was_def && !stub_ok) flag("pass as function body", $0)
+}
+
+{ prev_was_def = 0 }
+
+/^[ \t]*@/ {
+  decorated = decorated " " $0
+  next
+}
+
+/^[ \t]*(async[ \t]+)?def[ \t]+[A-Za-z_][A-Za-z0-9_]*[ \t]*\(.*\).*:[ \t]*(#.*)?$/ {
+  def_line = $0
+  def_at = FNR
+  def_indent = ind
+  body_of = $0
+  body_indent = ind
+  stub_ok = (decorated ~ /@(typing\.)?overload|abstractmethod/)
+  def_exempt = stub_ok
+  prev_was_def = 1
+}
+
+{ decorated = "" }
+
+END {
+  close_task()
+  if (fence) close_def()
+  if (!total) exit
+  shown = 0
+  for (g = 1; g <= groups; g++) {
+    if (!count[g]) continue
+    if (++shown > 10) {
+      rest += count[g]
+      more++
+      continue
+    }
+    printf "%s- %s:%s", (shown > 1 ? "\\n" : ""), labels[g], findings[g]
+  }
+  if (more) printf "\\n- ... and %d more finding(s) in %d more section(s)", rest, more
+}
@@ -0,0 +1,95 @@
+# Wave scheduler: which pending backlog tasks can be implemented at once
+# Usage: awk -F '\037' -f backlog-waves.awk <backlog index>
+#
+# Reads the index written by backlog-index.awk. A pending task depends on
+# the tasks its "Depends on:" line names and on the last earlier pending
+# task touching one of its files (Create:, Modify: or Test: path), so tasks
+# in one wave never share a file. Completed tasks are already satisfied.
+# Prints records separated by the ASCII unit separator (\037):
+#   wave      <N> <task numbers>     one row per wave, in execution order
+#   critical  <task numbers>         a longest dependency chain, first to last
+#   missing   <task> <dependency>    dependency on a task not in the backlog
+#   cycle     <task numbers>         tasks left unscheduled by a dependency loop
+# Task numbers within a field are space-separated, in backlog order.
+
+BEGIN { US = "\037" }
+
+NR <= 4 { next }
+
+{ known[$1] = 1 }
+
+$2 != 0 { next }
+
+{
+  order[++n] = $1
+  pending[$1] = 1
+  ndeps[$1] = 0
+  count = split($7, list, " ")
+  for (i = 1; i <= count; i++) explicit[$1, i] = list[i]
+  nexplicit[$1] = count
+  # Conflicts only look back, so they always point at an earlier task
+  count = split($6 " " $4, list, " ")
+  for (i = 1; i <= count; i++) {
+    if (list[i] in owner && owner[list[i]] != $1) depend($1, owner[list[i]])
+    owner[list[i]] = $1
+  }
+}
+
+function depend(task, dep,    i) {
+  for (i = 1; i <= ndeps[task]; i++) if (deps[task, i] == dep) return
+  deps[task, ++ndeps[task]] = dep
+}
+
+END {
+  for (i = 1; i <= n; i++) {
+    task = order[i]
+    for (j = 1; j <= nexplicit[task]; j++) {
+      dep = explicit[task, j]
+      if (dep == task) continue
+      if (!(dep in known)) print "missing" US task US dep
+      else if (dep in pending) depend(task, dep)
+    }
+  }
+
+  # Each wave takes every task whose dependencies sit in earlier waves
+  left = n
+  while (left > 0) {
+    waves++
+    tasks = ""
+    for (i = 1; i <= n; i++) {
+      task = order[i]
+      if (task in wave) continue
+      ready = 1
+      for (j = 1; j <= ndeps[task]; j++) {
+        dep = deps[task, j]
+        if (!(dep in wave) || wave[dep] == waves) ready = 0
+      }
+      if (!ready) continue
+      wave[task] = waves
+      tasks = tasks (tasks == "" ? "" : " ") task
+      left--
+    }
+    if (tasks == "") break
+    print "wave" US waves US tasks
+  }
+
+  if (left > 0) {
+    tasks = ""
+    for (i = 1; i <= n; i++) if (!(order[i] in wave)) tasks = tasks (tasks == "" ? "" : " ") order[i]
+    print "cycle" US tasks
+    exit
+  }
+  if (!n) exit
+
+  # Walk back from the first task of the last wave through a dependency one
+  # wave earlier at each step
+  for (i = 1; i <= n; i++) if (wave[order[i]] == waves) break
+  task = order[i]
+  chain = task
+  while (wave[task] > 1) {
+    for (j = 1; j <= ndeps[task]; j++) if (wave[deps[task, j]] == wave[task] - 1) break
+    task = deps[task, j]
+    chain = task " " chain
+  }
+  print "critical" US chain
+}
@@ -0,0 +1,221 @@
+# shellcheck shell=bash
+# Shared helpers for workflow ecosystem hooks
+# Sourced by every hook script and by dispatch.sh; defines globals and
+# functions only, never produces output on its own.
+#
+# Checks report through hook_context / hook_message / hook_block instead of
+# printing JSON themselves, so several checks can run in one process and
+# hook_flush emits a single merged response.
+#
+# Message arguments are JSON string contents: they must already be escaped
+# (literal \n for newlines) so they can be placed inside a JSON string as-is.
+
+[[ -n "${_WORKFLOW_HOOK_COMMON:-}" ]] && return 0
+_WORKFLOW_HOOK_COMMON=1
+
+HOOKS_DIR="${BASH_SOURCE[0]%/lib/common.sh}"
+PLUGIN_ROOT="${HOOKS_DIR}/.."
+
+TOOL_NAME="${CLAUDE_TOOL_NAME:-}"
+TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
+TOOL_OUTPUT="${CLAUDE_TOOL_OUTPUT:-}"
+
+# Per-session state directory (SESSION_DIR, SESSION_STATE_ROOT)
+# shellcheck source=session-dir.sh
+source "${HOOKS_DIR}/lib/session-dir.sh"
+workflow_session_dir
+
+# Merged response, filled by checks and printed by hook_flush
+HOOK_EVENT_NAME=""
+HOOK_CONTEXT=()
+HOOK_MESSAGES=()
+HOOK_DECISION=""
+HOOK_REASON=""
+
+# Session state, read once per process by hook_load_state (lib/state.sh)
+WF_STATE_LOADED=""
+WF_PHASE=""
+WF_SKIP=""
+WF_DISPATCHES=""
+WF_NEEDS_REFIX=""
+WF_REVIEWED=""
+WF_EXPECTED_TASKS=""
+WF_BACKLOG_PATH=""
+WF_TODOS=""
+
+# Git probe, run at most once per process by hook_git_branch (lib/git.sh)
+WF_GIT_PROBED=""
+WF_IN_GIT=""
+WF_BRANCH=""
+WF_GIT_DIR=""
+
+# Namespaced session directories are private to the user
+hook_ensure_session_dir() {
+  [[ -d "$SESSION_DIR" ]] && return 0
+  if [[ -n "$SESSION_STATE_ROOT" ]]; then
+    [[ -d "$SESSION_STATE_ROOT" ]] || mkdir -p -m 700 "$SESSION_STATE_ROOT"
+    mkdir -p -m 700 "$SESSION_DIR"
+  else
+    mkdir -p "$SESSION_DIR"
+  fi
+}
+
+# Read a whole file into the named variable without forking (empty if missing)
+hook_read_file() {
+  local __content=""
+  if [[ -f "$2" ]]; then
+    IFS= read -r -d '' __content < "$2" || true
+  fi
+  printf -v "$1" '%s' "$__content"
+}
+
+# Escape a file's contents as JSON string contents into the named variable.
+# Streams the file through a single awk pass, so cost is linear in its size.
+# Trailing newlines are dropped, matching $(cat file).
+hook_json_escape_file() {
+  local __escaped
+  __escaped=$(LC_ALL=C awk '
+    # Replace by splitting and joining: gsub replacement strings treat
+    # backslashes differently across awk implementations
+    function swap(s, re, with,    parts, n, i, out) {
+      n = split(s, parts, re)
+      out = parts[1]
+      for (i = 2; i <= n; i++) out = out with parts[i]
+      return out
+    }
+    BEGIN {
+      for (i = 1; i < 32; i++) ord[sprintf("%c", i)] = i
+    }
+    {
+      line = $0
+      if (index(line, "\\")) line = swap(line, "\\\\", "\\\\")
+      if (index(line, "\"")) line = swap(line, "\"", "\\\"")
+      if (line ~ /[\001-\037]/) {
+        out = ""
+        for (i = 1; i <= length(line); i++) {
+          c = substr(line, i, 1)
+          if (c == "\t") c = "\\t"
+          else if (c == "\r") c = "\\r"
+          else if (c in ord) c = sprintf("\\u%04x", ord[c])
+          out = out c
+        }
+        line = out
+      }
+      # Hold back blank lines until more content follows
+      if (line == "") { blanks++; next }
+      for (i = 0; i < blanks + started; i++) printf "\\n"
+      printf "%s", line
+      started = 1
+      blanks = 0
+    }' "$2") || return 1
+  printf -v "$1" '%s' "$__escaped"
+}
+
+hook_set_phase() {
+  hook_state_set phase "$1"
+}
+
+# Workflow agent a Task tool call dispatches, into the named variable: its
+# subagent_type (without a plugin prefix), else the first workflow agent the
+# tool input mentions, so a reviewer prompt that cites the code-implementer
+# still counts as a review
+hook_subagent_type() {
+  local __agent=""
+  if [[ "$TOOL_INPUT" =~ \"subagent_type\"[[:space:]]*:[[:space:]]*\"([^\"]+)\" ]]; then
+    __agent="${BASH_REMATCH[1]##*:}"
+  elif [[ "$TOOL_INPUT" == *code-implementer* ]]; then
+    __agent=code-implementer
+  elif [[ "$TOOL_INPUT" == *spec-reviewer* ]]; then
+    __agent=spec-reviewer
+  elif [[ "$TOOL_INPUT" == *quality-reviewer* ]]; then
+    __agent=quality-reviewer
+  fi
+  printf -v "$1" '%s' "$__agent"
+}
+
+hook_context() {
+  HOOK_CONTEXT+=("$1")
+}
+
+hook_message() {
+  HOOK_MESSAGES+=("$1")
+}
+
+hook_block() {
+  HOOK_DECISION="block"
+  HOOK_REASON="$1"
+}
+
+hook_reset_output() {
+  HOOK_EVENT_NAME=""
+  HOOK_CONTEXT=()
+  HOOK_MESSAGES=()
+  HOOK_DECISION=""
+  HOOK_REASON=""
+}
+
+# Join pre-escaped fragments with a blank line between them into the named
+# variable (no command substitution, so flushing never forks)
+_hook_join() {
+  local __var="$1" __joined="" __item
+  shift
+  for __item in "$@"; do
+    __joined="${__joined:+${__joined}\\n\\n}${__item}"
+  done
+  printf -v "$__var" '%s' "$__joined"
+}
+
+# Print everything reported so far as one JSON object ('{}' when empty)
+hook_flush() {
+  local fields=() specific joined
+  if [[ -n "$HOOK_DECISION" ]]; then
+    fields+=("  \"decision\": \"${HOOK_DECISION}\",
+  \"reason\": \"${HOOK_REASON}\"")
+  fi
+  if [[ ${#HOOK_MESSAGES[@]} -gt 0 ]]; then
+    _hook_join joined "${HOOK_MESSAGES[@]}"
+    fields+=("  \"systemMessage\": \"${joined}\"")
+  fi
+  if [[ ${#HOOK_CONTEXT[@]} -gt 0 ]]; then
+    specific="  \"hookSpecificOutput\": {"
+    if [[ -n "$HOOK_EVENT_NAME" ]]; then
+      specific+="
+    \"hookEventName\": \"${HOOK_EVENT_NAME}\","
+    fi
+    _hook_join joined "${HOOK_CONTEXT[@]}"
+    specific+="
+    \"additionalContext\": \"${joined}\"
+  }"
+    fields+=("$specific")
+  fi
+
+  if [[ ${#fields[@]} -eq 0 ]]; then
+    echo '{}'
+    return 0
+  fi
+
+  local i
+  echo "{"
+  for (( i = 0; i < ${#fields[@]}; i++ )); do
+    if (( i < ${#fields[@]} - 1 )); then
+      printf '%s,\n' "${fields[$i]}"
+    else
+      printf '%s\n' "${fields[$i]}"
+    fi
+  done
+  echo "}"
+}
+
+# Entry point for a hook script executed directly: run one check, print JSON.
+# Hook scripts call this only when they are not being sourced by dispatch.sh.
+hook_main() {
+  hook_load_state
+  "$1"
+  hook_state_commit
+  hook_flush
+}
+
+# shellcheck source=state.sh
+source "${HOOKS_DIR}/lib/state.sh"
+# shellcheck source=git.sh
+source "${HOOKS_DIR}/lib/git.sh"
@@ -0,0 +1,135 @@
+# shellcheck shell=bash
+# Git probes for workflow ecosystem hooks
+# Sourced by lib/common.sh; defines globals and functions only.
+#
+# The branch comes straight from the repository's HEAD file, found by walking
+# up from the working directory to .git. A .git file ("gitdir: <path>", as in
+# linked worktrees and submodules) is followed to the real git directory, so
+# no git process is started. git itself is only run when the layout is not
+# one we can read (GIT_DIR set, reftable refs, unreadable HEAD).
+#
+# The staged file list is cached in ${SESSION_DIR}/.git_staged and reused
+# while the index, HEAD, the HEAD reflog and the checked-out branch ref are
+# all older than the cache; any commit, checkout, reset or `git add` makes one
+# of them newer and the next query runs git again.
+
+# Dependencies of the staged file cache, filled by _hook_git_index_deps
+_HOOK_GIT_DEPS=()
+
+# Set WF_GIT_DIR for the working directory. Returns 1 when there is no .git
+# at or above it, 2 when the layout needs git to interpret.
+_hook_git_find_dir() {
+  local dir="$PWD" line
+  [[ -z "${GIT_DIR:-}" ]] || return 2
+  while [[ -n "$dir" && ! -e "${dir}/.git" ]]; do
+    dir="${dir%/*}"
+  done
+  [[ -n "$dir" ]] || return 1
+
+  if [[ -d "${dir}/.git" ]]; then
+    WF_GIT_DIR="${dir}/.git"
+  else
+    line=""
+    { read -r line || true; } 2> /dev/null < "${dir}/.git"
+    [[ "$line" == "gitdir: "* ]] || return 2
+    line="${line#gitdir: }"
+    [[ "$line" == /* ]] || line="${dir}/${line}"
+    WF_GIT_DIR="$line"
+  fi
+  [[ -f "${WF_GIT_DIR}/HEAD" ]] || return 2
+}
+
+# Probe the current git branch once per process; sets WF_IN_GIT, WF_BRANCH
+# (empty on a detached HEAD) and WF_GIT_DIR (empty if git had to be asked)
+hook_git_branch() {
+  [[ -n "$WF_GIT_PROBED" ]] && return 0
+  WF_GIT_PROBED=1
+  WF_IN_GIT=""
+  WF_BRANCH=""
+  WF_GIT_DIR=""
+
+  local status=0 head=""
+  _hook_git_find_dir || status=$?
+  [[ "$status" -ne 1 ]] || return 0
+  if [[ "$status" -eq 0 ]]; then
+    { read -r head || true; } 2> /dev/null < "${WF_GIT_DIR}/HEAD"
+    if [[ "$head" == "ref: refs/heads/"* && "$head" != "ref: refs/heads/.invalid" ]]; then
+      WF_IN_GIT=1
+      WF_BRANCH="${head#ref: refs/heads/}"
+      return 0
+    fi
+    if [[ "$head" =~ ^[0-9a-f]{40}([0-9a-f]{24})?$ ]]; then
+      WF_IN_GIT=1
+      return 0
+    fi
+  fi
+
+  WF_GIT_DIR=""
+  if WF_BRANCH=$(git branch --show-current 2>/dev/null); then
+    WF_IN_GIT=1
+  else
+    WF_BRANCH=""
+  fi
+}
+
+# Files whose change invalidates the staged file cache, into _HOOK_GIT_DEPS
+_hook_git_index_deps() {
+  local common="$WF_GIT_DIR" line=""
+  if [[ -f "${WF_GIT_DIR}/commondir" ]]; then
+    { read -r line || true; } < "${WF_GIT_DIR}/commondir"
+    [[ "$line" == /* ]] || line="${WF_GIT_DIR}/${line}"
+    common="$line"
+  fi
+  _HOOK_GIT_DEPS=("${WF_GIT_DIR}/index" "${WF_GIT_DIR}/HEAD" "${WF_GIT_DIR}/logs/HEAD" "${common}/packed-refs")
+  [[ -z "$WF_BRANCH" ]] || _HOOK_GIT_DEPS+=("${common}/refs/heads/${WF_BRANCH}")
+}
+
+# True if the named file is newer than every existing dependency
+_hook_git_newer_than() {
+  local stamp="$1" dep
+  shift
+  for dep in "$@"; do
+    [[ ! -e "$dep" || "$stamp" -nt "$dep" ]] || return 1
+  done
+}
+
+# Staged file names (git diff --cached --name-only) into the named variable,
+# one per line; empty outside a repository
+hook_git_staged() {
+  local __staged="" cache="${SESSION_DIR}/.git_staged" line=""
+  hook_git_branch
+  if [[ -z "$WF_IN_GIT" ]]; then
+    printf -v "$1" '%s' ""
+    return 0
+  fi
+  if [[ -z "$WF_GIT_DIR" ]]; then
+    __staged=$(git diff --cached --name-only 2>/dev/null || true)
+    printf -v "$1" '%s' "$__staged"
+    return 0
+  fi
+
+  _hook_git_index_deps
+  if [[ -f "$cache" ]] && _hook_git_newer_than "$cache" "${_HOOK_GIT_DEPS[@]}"; then
+    { IFS= read -r line || true; } < "$cache"
+    if [[ "$line" == "$WF_GIT_DIR" ]]; then
+      hook_read_file __staged "$cache"
+      __staged="${__staged#*$'\n'}"
+      printf -v "$1" '%s' "${__staged%$'\n'}"
+      return 0
+    fi
+  fi
+
+  # The start stamp predates git's read of the index: the result is only
+  # cached if nothing it depends on changed since then
+  local start="${cache}.$$.start" tmp="${cache}.$$"
+  hook_ensure_session_dir
+  : > "$start"
+  __staged=$(git diff --cached --name-only 2>/dev/null || true)
+  if _hook_git_newer_than "$start" "${_HOOK_GIT_DEPS[@]}" \
+    && printf '%s\n%s\n' "$WF_GIT_DIR" "$__staged" > "$tmp" && mv -f "$tmp" "$cache" \
+    && ! _hook_git_newer_than "$start" "${_HOOK_GIT_DEPS[@]}"; then
+    rm -f "$cache"
+  fi
+  rm -f "$start" "$tmp"
+  printf -v "$1" '%s' "$__staged"
+}
@@ -0,0 +1,45 @@
+# shellcheck shell=sh
+# Fast-path event filter for run-hook.cmd
+# Sourced by run-hook.cmd (POSIX sh) before it starts bash for dispatch.sh;
+# defines one function only.
+#
+# hooks.json matchers only see the tool name, so every Bash or Task call
+# reaches the dispatcher. Most of them cannot trigger any registered check:
+# the Bash checks only act on `git commit`, the Task checks only on the
+# workflow's own subagents. For those events the wrapper answers `{}` itself
+# and no bash process is started.
+#
+# Each pattern must match every input on which at least one check for the
+# event could act (a superset of the checks' own tests in dispatch.sh's
+# registry); events not listed here always run. Tested in
+# tests/test_prefilter.py.
+
+# Succeed if dispatch.sh <event> <matcher> could act on CLAUDE_TOOL_INPUT.
+# Uses case patterns only: no subshells, no external commands.
+hook_prefilter() {
+  case "$1 $2" in
+    "PreToolUse Bash")
+      # verify-before-commit, tdd-precommit-check: git<space>commit
+      case ${CLAUDE_TOOL_INPUT:-} in
+        *git*commit*) return 0 ;;
+      esac
+      ;;
+    "PreToolUse Task" | "PostToolUse Task")
+      # validate-task-description, todo-injector, subagent-dispatch-tracker,
+      # implementer-evidence-check: workflow subagents only
+      case ${CLAUDE_TOOL_INPUT:-} in
+        *code-implementer* | *spec-reviewer* | *quality-reviewer*) return 0 ;;
+      esac
+      ;;
+    "PostToolUse TodoWrite")
+      # subagent-review-check: a todo marked completed
+      case ${CLAUDE_TOOL_INPUT:-} in
+        *'"completed"'*) return 0 ;;
+      esac
+      ;;
+    *)
+      return 0
+      ;;
+  esac
+  return 1
+}
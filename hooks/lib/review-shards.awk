@@ -0,0 +1,62 @@
+# Review shard planner: one pass over `git diff --numstat` output
+# Usage: git diff --numstat --no-renames <base> <head> |
+#          awk -v budget=<lines> -f review-shards.awk
+#
+# Splits a diff into file groups for parallel quality-reviewer dispatches.
+# Files stay with their directory; directories are packed in path order
+# into shards of at most <budget> changed lines, and a directory larger
+# than the budget is split between files (its last files may share a shard
+# with the next directory). A file over budget gets a shard of its own.
+# Binary files count as one line. Prints one record per shard, fields
+# separated by the ASCII unit separator (\037):
+#   <shard number> <changed lines> <paths, separated by \036>
+
+BEGIN {
+  US = "\037"
+  PS = "\036"
+  if (budget < 1) budget = 400
+}
+
+NF >= 3 {
+  path = $0
+  sub(/^[^\t]*\t[^\t]*\t/, "", path)
+  size = ($1 == "-" ? 1 : $1 + $2)
+  if (size < 1) size = 1
+  dir = path
+  if (!sub(/\/[^\/]*$/, "", dir)) dir = "."
+  if (!(dir in dir_size)) dirs[++ndirs] = dir
+  dir_size[dir] += size
+  files[dir, ++dir_files[dir]] = path
+  sizes[dir, dir_files[dir]] = size
+}
+
+function close_shard() {
+  if (shard_paths == "") return
+  print ++shards US shard_size US shard_paths
+  shard_paths = ""
+  shard_size = 0
+}
+
+function add(paths, size) {
+  shard_paths = shard_paths (shard_paths == "" ? "" : PS) paths
+  shard_size += size
+}
+
+END {
+  for (d = 1; d <= ndirs; d++) {
+    dir = dirs[d]
+    if (dir_size[dir] <= budget) {
+      if (shard_size + dir_size[dir] > budget) close_shard()
+      paths = ""
+      for (f = 1; f <= dir_files[dir]; f++) paths = paths (f > 1 ? PS : "") files[dir, f]
+      add(paths, dir_size[dir])
+      continue
+    }
+    close_shard()
+    for (f = 1; f <= dir_files[dir]; f++) {
+      if (shard_size + sizes[dir, f] > budget) close_shard()
+      add(files[dir, f], sizes[dir, f])
+    }
+  }
+  close_shard()
+}
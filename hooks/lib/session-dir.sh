@@ -0,0 +1,94 @@
+# shellcheck shell=sh
+# Session state directory resolution
+# Sourced by lib/common.sh (bash) and run-hook.cmd (POSIX sh), so both agree
+# on where a session's state lives; defines variables and functions only,
+# runs no commands.
+#
+# CLAUDE_SESSION_DIR, when set, is used as is. Otherwise every session gets
+# its own namespace, keyed on the session id and the repository root:
+#
+#   <root>/<session id>.<repository root, "/" replaced by "%">
+#
+# <root> is WORKFLOW_STATE_DIR, else ${XDG_RUNTIME_DIR}/claude-workflow
+# (per-user tmpfs on most Linux systems), else
+# ${TMPDIR:-/tmp}/claude-workflow-<user>. The repository root is the nearest
+# directory at or above CLAUDE_PROJECT_DIR (default: the working directory)
+# that contains .git, found without running git.
+#
+# Hooks always get CLAUDE_SESSION_ID; scripts run from the Bash tool, such as
+# workflow-state.sh, may not. SessionStart therefore records its session id
+# per repository in <root>/.active.<repository root>, and without
+# CLAUDE_SESSION_ID the recorded session is used, so the CLI sees the state
+# the hooks write. With several sessions on one repository that is the one
+# started last. Without either, the id is "default".
+#
+# Idle namespaces are removed by hook_state_gc (lib/state.sh).
+
+# Set SESSION_DIR, SESSION_STATE_ROOT to the namespace root and
+# SESSION_ACTIVE_FILE to the repository's active-session record (both empty
+# when CLAUDE_SESSION_DIR is used). Pure parameter expansion and a builtin
+# read: no subshells.
+workflow_session_dir() {
+  if [ -n "${CLAUDE_SESSION_DIR:-}" ]; then
+    SESSION_DIR=$CLAUDE_SESSION_DIR
+    SESSION_STATE_ROOT=""
+    SESSION_ACTIVE_FILE=""
+    return 0
+  fi
+
+  if [ -n "${WORKFLOW_STATE_DIR:-}" ]; then
+    SESSION_STATE_ROOT=$WORKFLOW_STATE_DIR
+  elif [ -n "${XDG_RUNTIME_DIR:-}" ] && [ -d "$XDG_RUNTIME_DIR" ]; then
+    SESSION_STATE_ROOT="${XDG_RUNTIME_DIR}/claude-workflow"
+  else
+    SESSION_STATE_ROOT="${TMPDIR:-/tmp}/claude-workflow-${USER:-${LOGNAME:-user}}"
+  fi
+
+  _wf_repo=${CLAUDE_PROJECT_DIR:-$PWD}
+  _wf_dir=$_wf_repo
+  while [ -n "$_wf_dir" ] && [ ! -e "${_wf_dir}/.git" ]; do
+    _wf_dir=${_wf_dir%/*}
+  done
+  [ -n "$_wf_dir" ] && _wf_repo=$_wf_dir
+
+  # Flatten the root into one path component; keep the (most specific) tail
+  # of very deep paths so the name stays well under NAME_MAX
+  _wf_name=""
+  while :; do
+    case $_wf_repo in
+      */*)
+        _wf_name="${_wf_name}${_wf_repo%%/*}%"
+        _wf_repo=${_wf_repo#*/}
+        ;;
+      *)
+        _wf_name="${_wf_name}${_wf_repo}"
+        break
+        ;;
+    esac
+  done
+  while [ ${#_wf_name} -gt 160 ]; do
+    _wf_name=${_wf_name#?}
+  done
+
+  SESSION_ACTIVE_FILE="${SESSION_STATE_ROOT}/.active.${_wf_name}"
+  _wf_id=${CLAUDE_SESSION_ID:-}
+  if [ -z "$_wf_id" ] && [ -f "$SESSION_ACTIVE_FILE" ]; then
+    read -r _wf_id < "$SESSION_ACTIVE_FILE" || :
+  fi
+  case $_wf_id in
+    "" | */* | .*) _wf_id=default ;;
+  esac
+
+  SESSION_DIR="${SESSION_STATE_ROOT}/${_wf_id}.${_wf_name}"
+  unset _wf_repo _wf_dir _wf_name _wf_id
+}
+
+# Record CLAUDE_SESSION_ID as the repository's active session (SessionStart);
+# the namespace root must exist
+workflow_session_record() {
+  [ -n "${SESSION_ACTIVE_FILE:-}" ] && [ -n "${CLAUDE_SESSION_ID:-}" ] || return 0
+  case $CLAUDE_SESSION_ID in
+    */* | .*) return 0 ;;
+  esac
+  printf '%s\n' "$CLAUDE_SESSION_ID" > "$SESSION_ACTIVE_FILE"
+}
@@ -0,0 +1,389 @@
+# shellcheck shell=bash
+# Session state store for workflow ecosystem hooks
+# Sourced by lib/common.sh; defines globals and functions only.
+#
+# All session state lives in one file, ${SESSION_DIR}/.workflow_state, one
+# "<key><TAB><value>" record per line. Scalar keys appear once; list keys
+# (dispatch, needs_refix, reviewed, todo) repeat, one line per entry in
+# insertion order:
+#
+#   phase                 current workflow phase               WF_PHASE
+#   skip                  1 while enforcement is bypassed      WF_SKIP
+#   dispatch              subagents dispatched per task        WF_DISPATCHES
+#   needs_refix           tasks fixed since their last review  WF_NEEDS_REFIX
+#   reviewed              last commit each reviewer reviewed   WF_REVIEWED
+#   expected_task_count   task count recorded at /implement    WF_EXPECTED_TASKS
+#   backlog_path          backlog being implemented            WF_BACKLOG_PATH
+#   todo                  TODO:BACKLOG ledger entries          WF_TODOS
+#
+# Dispatch entries are "task-<N>:<agent>" for a backlog task whose number the
+# prompt names, or just "<agent>" when it names none; needs_refix entries are
+# "task-<N>", or 1 for the unnumbered task (see hook_task_dispatches). A
+# reviewer entry may go on with the reviewed commit and the verdict,
+# "<agent> <sha> <approved|issues>", either being "-" when unknown. reviewed
+# keeps "[task-<N>:]<agent> <sha> <verdict>" per reviewer across fix cycles,
+# the base a scoped re-review starts from.
+#
+# hook_load_state reads the file once per process. Checks change state with
+# hook_state_set / hook_state_add, which update the WF_* globals right away
+# and queue the change; hook_state_commit then applies every queued change to
+# the current file under a lock and replaces it atomically (temp file and
+# rename). Concurrent hooks therefore never tear the file or lose an append,
+# and each invocation reads once and writes at most once.
+#
+# The one-file-per-key state of earlier versions (.workflow_phase,
+# .subagent_dispatch, ...) is imported into the store and removed on load.
+
+STATE_FILE="${SESSION_DIR}/.workflow_state"
+STATE_LOCK="${SESSION_DIR}/.workflow_state.lock"
+
+# Earlier per-key state files: "<file> <key>"
+HOOK_STATE_LEGACY=(
+  ".workflow_phase phase"
+  ".workflow_skip skip"
+  ".subagent_dispatch dispatch"
+  ".needs_refix needs_refix"
+  ".expected_task_count expected_task_count"
+  ".backlog_path backlog_path"
+  ".backlog_todos todo"
+)
+
+# Queued changes, "<set|add|del><TAB><key><TAB><value>", applied by hook_state_commit
+HOOK_STATE_OPS=()
+
+# Records of the store as last read or written
+_HOOK_STATE_RECORDS=()
+
+# flock(1) when available, otherwise a noclobber lock file; probed once
+_HOOK_STATE_FLOCK=""
+
+_hook_state_clear() {
+  WF_PHASE=""
+  WF_SKIP=""
+  WF_DISPATCHES=""
+  WF_NEEDS_REFIX=""
+  WF_REVIEWED=""
+  WF_EXPECTED_TASKS=""
+  WF_BACKLOG_PATH=""
+  WF_TODOS=""
+}
+
+# Whether an entry matches a del pattern: a glob, negated by a leading "!"
+_hook_state_match() {
+  local pattern="${2#!}"
+  case "$1" in
+    $pattern) [[ "$2" != "!"* ]] ;;
+    *) [[ "$2" == "!"* ]] ;;
+  esac
+}
+
+# Lines of a list global that do not match a pattern, into the named variable
+_hook_state_without() {
+  local __kept="" __line
+  while IFS= read -r __line; do
+    [[ -z "$__line" ]] || _hook_state_match "$__line" "$3" || __kept+="${__line}"$'\n'
+  done <<< "$2"
+  printf -v "$1" '%s' "$__kept"
+}
+
+# Apply one change to the WF_* globals. List globals hold one entry per line;
+# "del" removes the entries matching a pattern.
+_hook_state_assign() {
+  local op="$1" key="$2" value="$3"
+  if [[ "$op" == "del" ]]; then
+    case "$key" in
+      dispatch) _hook_state_without WF_DISPATCHES "$WF_DISPATCHES" "$value" ;;
+      needs_refix) _hook_state_without WF_NEEDS_REFIX "$WF_NEEDS_REFIX" "$value" ;;
+      reviewed) _hook_state_without WF_REVIEWED "$WF_REVIEWED" "$value" ;;
+      todo) _hook_state_without WF_TODOS "$WF_TODOS" "$value" ;;
+    esac
+    return 0
+  fi
+  case "$key" in
+    phase) WF_PHASE="$value" ;;
+    skip) WF_SKIP="$value" ;;
+    expected_task_count) WF_EXPECTED_TASKS="$value" ;;
+    backlog_path) WF_BACKLOG_PATH="$value" ;;
+    dispatch)
+      [[ "$op" == "add" ]] || WF_DISPATCHES=""
+      [[ -z "$value" ]] || WF_DISPATCHES+="${value}"$'\n'
+      ;;
+    needs_refix)
+      [[ "$op" == "add" ]] || WF_NEEDS_REFIX=""
+      [[ -z "$value" ]] || WF_NEEDS_REFIX+="${value}"$'\n'
+      ;;
+    reviewed)
+      [[ "$op" == "add" ]] || WF_REVIEWED=""
+      [[ -z "$value" ]] || WF_REVIEWED+="${value}"$'\n'
+      ;;
+    todo)
+      [[ "$op" == "add" ]] || WF_TODOS=""
+      [[ -z "$value" ]] || WF_TODOS+="${value}"$'\n'
+      ;;
+  esac
+}
+
+# Set the WF_* globals from state records ("<key><TAB><value>" arguments)
+_hook_state_parse() {
+  local line
+  _hook_state_clear
+  for line in "$@"; do
+    _hook_state_assign add "${line%%$'\t'*}" "${line#*$'\t'}"
+  done
+}
+
+# Read the store's records into _HOOK_STATE_RECORDS
+_hook_state_records() {
+  local line
+  _HOOK_STATE_RECORDS=()
+  [[ -f "$STATE_FILE" ]] || return 0
+  while IFS= read -r line || [[ -n "$line" ]]; do
+    [[ "$line" == *$'\t'* ]] && _HOOK_STATE_RECORDS+=("$line")
+  done < "$STATE_FILE"
+  return 0
+}
+
+_hook_state_lock() {
+  if [[ -z "$_HOOK_STATE_FLOCK" ]]; then
+    if type -P flock > /dev/null; then _HOOK_STATE_FLOCK=1; else _HOOK_STATE_FLOCK=0; fi
+  fi
+  if [[ "$_HOOK_STATE_FLOCK" == 1 ]]; then
+    exec 9>> "$STATE_LOCK"
+    flock -x 9
+    return 0
+  fi
+
+  # Portable fallback: whoever creates the owner file holds the lock. A lock
+  # whose owner has exited, or that is held for over ~5s, is broken.
+  local owner="" tries=0
+  while :; do
+    set -C
+    if { printf '%s\n' "$$" > "${STATE_LOCK}.owner"; } 2> /dev/null; then
+      set +C
+      return 0
+    fi
+    set +C
+    owner=""
+    if { read -r owner || true; } 2> /dev/null < "${STATE_LOCK}.owner"; then
+      if [[ -n "$owner" ]] && ! kill -0 "$owner" 2> /dev/null || (( ++tries > 500 )); then
+        rm -f "${STATE_LOCK}.owner"
+        tries=0
+        continue
+      fi
+    fi
+    sleep 0.01
+  done
+}
+
+_hook_state_unlock() {
+  if [[ "$_HOOK_STATE_FLOCK" == 1 ]]; then
+    exec 9>&-
+  else
+    rm -f "${STATE_LOCK}.owner"
+  fi
+}
+
+# Import and remove state files written by earlier versions
+_hook_state_migrate() {
+  local entry file key line found=()
+  for entry in "${HOOK_STATE_LEGACY[@]}"; do
+    file="${SESSION_DIR}/${entry% *}"
+    [[ -f "$file" ]] || continue
+    key="${entry#* }"
+    found+=("$file")
+    case "$key" in
+      skip|needs_refix) hook_state_set "$key" 1 ;;
+      dispatch|todo)
+        hook_state_set "$key" ""
+        while IFS= read -r line || [[ -n "$line" ]]; do
+          [[ -z "$line" ]] || hook_state_add "$key" "$line"
+        done < "$file"
+        ;;
+      *)
+        line=""
+        { read -r line || true; } < "$file"
+        hook_state_set "$key" "$line"
+        ;;
+    esac
+  done
+  [[ ${#found[@]} -gt 0 ]] || return 0
+  hook_state_commit
+  rm -f "${found[@]}"
+}
+
+# Read the session state once; later calls are no-ops.
+# WF_PHASE is empty when no phase has been recorded yet, WF_DISPATCHES holds
+# the subagents dispatched for the current task, one per line.
+# Checks that write state keep these globals in step with the store, so a
+# long-lived process (hook-daemon.sh) can keep using them between requests.
+hook_load_state() {
+  [[ -n "$WF_STATE_LOADED" ]] && return 0
+  WF_STATE_LOADED=1
+  # Mark the namespace as in use for hook_state_gc; reads alone never move
+  # the state file's mtime
+  [[ -z "$SESSION_STATE_ROOT" || ! -d "$SESSION_DIR" ]] || : 2> /dev/null > "${SESSION_DIR}/.seen" || true
+  _hook_state_records
+  _hook_state_parse ${_HOOK_STATE_RECORDS[@]+"${_HOOK_STATE_RECORDS[@]}"}
+  _hook_state_migrate
+}
+
+# Replace a key's value (every entry, for list keys); an empty value
+# removes the key
+hook_state_set() {
+  local value="${2:-}"
+  value="${value//[$'\t\n']/ }"
+  HOOK_STATE_OPS+=("set"$'\t'"$1"$'\t'"$value")
+  _hook_state_assign set "$1" "$value"
+}
+
+# Append an entry to a list key
+hook_state_add() {
+  local value="${2//[$'\t\n']/ }"
+  HOOK_STATE_OPS+=("add"$'\t'"$1"$'\t'"$value")
+  _hook_state_assign add "$1" "$value"
+}
+
+# Remove a list key's entries matching a pattern (a glob, negated by a
+# leading "!", e.g. "task-3:*" or "!*:*")
+hook_state_del() {
+  HOOK_STATE_OPS+=("del"$'\t'"$1"$'\t'"$2")
+  _hook_state_assign del "$1" "$2"
+}
+
+# Agents dispatched for a task ("task-<N>", or empty for the unnumbered
+# task), one per line, into the named variable
+hook_task_dispatches() {
+  local __agents="" __entry
+  while IFS= read -r __entry; do
+    [[ -n "$__entry" ]] || continue
+    if [[ -n "$3" ]]; then
+      [[ "$__entry" == "$3:"* ]] && __agents+="${__entry#*:}"$'\n'
+    else
+      [[ "$__entry" == *:* ]] || __agents+="${__entry}"$'\n'
+    fi
+  done <<< "$2"
+  printf -v "$1" '%s' "$__agents"
+}
+
+# "<sha> <verdict>" of an agent's latest entry among a task's dispatches
+# (from hook_task_dispatches), "- -" if it recorded none; fails if the agent
+# was not dispatched
+hook_task_review() {
+  local __entry __review=""
+  while IFS= read -r __entry; do
+    [[ "$__entry" == "$3" || "$__entry" == "$3 "* ]] || continue
+    __review="${__entry#"$3"}"
+    __review="${__review# }"
+    __review="${__review:-- -}"
+  done <<< "$2"
+  printf -v "$1" '%s' "$__review"
+  [[ -n "$__review" ]]
+}
+
+# Apply queued changes to the store in one locked, atomic write, then reload
+# the globals from the result so changes committed by concurrent hooks show
+hook_state_commit() {
+  [[ ${#HOOK_STATE_OPS[@]} -gt 0 ]] || return 0
+  hook_ensure_session_dir
+  _hook_state_lock
+
+  local records kept entry op key value record tmp="${STATE_FILE}.$$"
+  _hook_state_records
+  records=(${_HOOK_STATE_RECORDS[@]+"${_HOOK_STATE_RECORDS[@]}"})
+  for entry in "${HOOK_STATE_OPS[@]}"; do
+    op="${entry%%$'\t'*}"
+    entry="${entry#*$'\t'}"
+    key="${entry%%$'\t'*}"
+    value="${entry#*$'\t'}"
+    if [[ "$op" == "set" || "$op" == "del" ]]; then
+      kept=()
+      for record in ${records[@]+"${records[@]}"}; do
+        if [[ "${record%%$'\t'*}" != "$key" ]] \
+          || { [[ "$op" == "del" ]] && ! _hook_state_match "${record#*$'\t'}" "$value"; }; then
+          kept+=("$record")
+        fi
+      done
+      records=(${kept[@]+"${kept[@]}"})
+    fi
+    [[ "$op" == "del" || -z "$value" ]] || records+=("${key}"$'\t'"${value}")
+  done
+  HOOK_STATE_OPS=()
+
+  if printf '%s\n' ${records[@]+"${records[@]}"} > "$tmp" && mv -f "$tmp" "$STATE_FILE"; then
+    _hook_state_unlock
+  else
+    rm -f "$tmp"
+    _hook_state_unlock
+    return 1
+  fi
+  _HOOK_STATE_RECORDS=(${records[@]+"${records[@]}"})
+  _hook_state_parse ${records[@]+"${records[@]}"}
+}
+
+# Remove all session state (e.g. /workflow reset)
+hook_state_reset() {
+  local entry files=()
+  hook_ensure_session_dir
+  for entry in "${HOOK_STATE_LEGACY[@]}"; do
+    files+=("${SESSION_DIR}/${entry% *}")
+  done
+  _hook_state_lock
+  rm -f "$STATE_FILE" "${files[@]}"
+  _hook_state_unlock
+  HOOK_STATE_OPS=()
+  _hook_state_clear
+}
+
+# Remove session namespaces idle for longer than WORKFLOW_STATE_IDLE_MINUTES
+# (default 1440, 0 disables), keeping the current one and any with a live
+# hook daemon, along with .active.* records that point to removed ones. Only
+# applies to namespaced state (see lib/session-dir.sh). A namespace is idle
+# when neither it nor anything directly in it changed within the window;
+# hook_load_state rewrites its .seen file on every read. Runs at most once
+# per window (or per day, if shorter): the time of the last run is kept in
+# <root>/.gc, so most calls fork nothing. Where bash cannot tell the time
+# without forking (before 4.2) it runs every time.
+hook_state_gc() {
+  local idle="${WORKFLOW_STATE_IDLE_MINUTES:-1440}" dir pid now="${EPOCHSECONDS:-}" last="" every
+  local root="$SESSION_STATE_ROOT" active=$'\n' record id
+  [[ -n "$root" && "$idle" =~ ^[0-9]+$ && "$idle" -gt 0 ]] || return 0
+  [[ -d "$root" ]] || return 0
+  [[ -n "$now" ]] || printf -v now '%(%s)T' -1 2> /dev/null || now=""
+  if [[ "$now" =~ ^[0-9]+$ ]]; then
+    every=$((idle * 60))
+    [[ "$every" -le 86400 ]] || every=86400
+    if [[ -f "${root}/.gc" ]]; then
+      { read -r last || true; } < "${root}/.gc"
+      if [[ "$last" =~ ^[0-9]+$ ]] && (( last <= now && now - last < every )); then
+        return 0
+      fi
+    fi
+    printf '%s\n' "$now" > "${root}/.gc"
+  fi
+
+  # Namespaces with anything changed inside the window
+  while IFS= read -r -d '' dir; do
+    dir="${dir#"$root"/}"
+    active+="${dir%%/*}"$'\n'
+  done < <(find "$root" -mindepth 1 -maxdepth 2 -mmin "-${idle}" -print0 2> /dev/null)
+
+  for dir in "$root"/*/; do
+    dir="${dir%/}"
+    [[ -d "$dir" && "$dir" != "$SESSION_DIR" ]] || continue
+    [[ "$active" != *$'\n'"${dir##*/}"$'\n'* ]] || continue
+    pid=""
+    if [[ -f "${dir}/.hookd/pid" ]] && { read -r pid || true; } < "${dir}/.hookd/pid" \
+      && [[ -n "$pid" ]] && kill -0 "$pid" 2> /dev/null; then
+      continue
+    fi
+    rm -rf -- "$dir"
+  done
+
+  for record in "$root"/.active.*; do
+    [[ -f "$record" ]] || continue
+    id=""
+    { read -r id || true; } < "$record"
+    [[ -n "$id" && -d "${root}/${id}.${record##*/.active.}" ]] || rm -f -- "$record"
+  done
+  return 0
+}
@@ -0,0 +1,75 @@
+# shellcheck shell=bash
+# Opt-in per-check timing log for dispatch.sh
+# Sourced by dispatch.sh only when WORKFLOW_HOOK_TIMING=1, so hooks pay a
+# single variable test when timing is off. Defines globals and functions only.
+#
+# Every check dispatch.sh runs appends one JSON line to
+# ${SESSION_DIR}/.hook_timing.jsonl:
+#
+#   {"ts":1760000000.123456,"hook":"tdd-precommit-check","event":"PreToolUse",
+#    "matcher":"Bash","ms":3.215,"status":0,"bytes":412}
+#
+# ms is wall time from EPOCHREALTIME (no forks), status the check's exit
+# status, bytes the size of the messages it added to the response. Events
+# answered by run-hook.cmd's fast path (lib/prefilter.sh) never start bash
+# and are not logged.
+#
+# The log is a two-segment ring: once the live file holds more than
+# WORKFLOW_HOOK_TIMING_MAX records (default 5000) it becomes
+# .hook_timing.jsonl.1, replacing the previous segment, so between MAX and
+# 2*MAX recent records are kept. The size is checked on about one write in
+# 64 to keep `wc` out of the common path. hook-timing.sh summarizes both.
+
+[[ -n "${_WORKFLOW_HOOK_TIMING:-}" ]] && return 0
+_WORKFLOW_HOOK_TIMING=1
+
+HOOK_TIMING_LOG="${SESSION_DIR}/.hook_timing.jsonl"
+HOOK_TIMING_MAX="${WORKFLOW_HOOK_TIMING_MAX:-5000}"
+
+# Check being timed: "<start µs>\037<event>\037<matcher>\037<check>\037<bytes before>"
+_HOOK_TIMING_PENDING=""
+
+# Total length of the messages collected so far, into the named variable
+_hook_timing_bytes() {
+  local __bytes=$(( ${#HOOK_REASON} )) item
+  for item in ${HOOK_CONTEXT[@]+"${HOOK_CONTEXT[@]}"} ${HOOK_MESSAGES[@]+"${HOOK_MESSAGES[@]}"}; do
+    __bytes=$(( __bytes + ${#item} ))
+  done
+  printf -v "$1" '%d' "$__bytes"
+}
+
+# Append the record for the pending check, finished with the given status
+_hook_timing_record() {
+  local status="$1" now="${EPOCHREALTIME/./}" start event matcher check before bytes us lines
+  [[ -n "$_HOOK_TIMING_PENDING" ]] || return 0
+  IFS=$'\037' read -r start event matcher check before <<< "$_HOOK_TIMING_PENDING"
+  _HOOK_TIMING_PENDING=""
+  _hook_timing_bytes bytes
+  us=$(( now - start ))
+  hook_ensure_session_dir
+  printf '{"ts":%s,"hook":"%s","event":"%s","matcher":"%s","ms":%d.%03d,"status":%d,"bytes":%d}\n' \
+    "$EPOCHREALTIME" "$check" "$event" "$matcher" $(( us / 1000 )) $(( us % 1000 )) \
+    "$status" $(( bytes - before )) >> "$HOOK_TIMING_LOG"
+
+  if (( RANDOM % 64 == 0 )); then
+    lines=$(wc -l < "$HOOK_TIMING_LOG" 2> /dev/null || echo 0)
+    if (( lines > HOOK_TIMING_MAX )); then
+      mv -f "$HOOK_TIMING_LOG" "${HOOK_TIMING_LOG}.1"
+    fi
+  fi
+}
+
+# Run one check and log its timing. A check that fails under `set -e` ends
+# the process; hook_timing_abort (an EXIT trap) logs it with its status.
+hook_timing_check() {
+  local event="$1" matcher="$2" check="$3" before
+  _hook_timing_bytes before
+  _HOOK_TIMING_PENDING="${EPOCHREALTIME/./}"$'\037'"${event}"$'\037'"${matcher}"$'\037'"${check}"$'\037'"${before}"
+  "check_${check//-/_}"
+  _hook_timing_record 0
+}
+
+hook_timing_abort() {
+  local status=$?
+  _hook_timing_record "$status"
+}
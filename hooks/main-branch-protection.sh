@@ -8,41 +8,28 @@
 
 set -euo pipefail
 
-TOOL_NAME="${CLAUDE_TOOL_NAME:-}"
-
-# Only check Write and Edit tools
-if [[ "$TOOL_NAME" != "Write" && "$TOOL_NAME" != "Edit" ]]; then
-  echo '{}'
-  exit 0
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
 fi
 
-# Check for workflow skip marker
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-if [[ -f "$SKIP_FILE" ]]; then
-  echo '{}'
-  exit 0
-fi
+check_main_branch_protection() {
+  # Only check Write and Edit tools
+  [[ "$TOOL_NAME" == "Write" || "$TOOL_NAME" == "Edit" ]] || return 0
+
+  # Check for workflow skip marker
+  [[ -z "$WF_SKIP" ]] || return 0
 
-# Check if we're in a git repo
-if ! git rev-parse --git-dir > /dev/null 2>&1; then
   # Not a git repo - skip enforcement
-  echo '{}'
-  exit 0
-fi
+  hook_git_branch
+  [[ -n "$WF_IN_GIT" ]] || return 0
 
-# Get current branch
-CURRENT_BRANCH=$(git branch --show-current 2>/dev/null || echo "")
+  # On feature branch - no warning needed
+  [[ "$WF_BRANCH" == "main" || "$WF_BRANCH" == "master" ]] || return 0
 
-if [[ "$CURRENT_BRANCH" == "main" || "$CURRENT_BRANCH" == "master" ]]; then
-  cat <<'EOF'
-{
-  "systemMessage": "⚠️ WARNING: Edit made on main/master branch!\n\n**What happened:**\n- You just edited a file on the protected main/master branch\n- This bypasses the feature branch workflow\n\n**Recommended action:**\n1. Undo this change: `git checkout -- <file>`\n2. Create a feature branch: `git checkout -b feat/<slug>`\n3. Redo the change on the feature branch\n\n**Why this matters:** Feature branch workflow protects main from incomplete work. Changes should be reviewed via PR before merging.\n\n**Note:** Blocking was attempted but Claude Code runtime ignores PreToolUse blocks for Write/Edit (Issue #4669)."
+  hook_message '⚠️ WARNING: Edit made on main/master branch!\n\n**What happened:**\n- You just edited a file on the protected main/master branch\n- This bypasses the feature branch workflow\n\n**Recommended action:**\n1. Undo this change: `git checkout -- <file>`\n2. Create a feature branch: `git checkout -b feat/<slug>`\n3. Redo the change on the feature branch\n\n**Why this matters:** Feature branch workflow protects main from incomplete work. Changes should be reviewed via PR before merging.\n\n**Note:** Blocking was attempted but Claude Code runtime ignores PreToolUse blocks for Write/Edit (Issue #4669).'
 }
-EOF
-  exit 0
-fi
 
-# On feature branch - no warning needed
-echo '{}'
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_main_branch_protection
+fi
@@ -4,61 +4,58 @@
 
 set -euo pipefail
 
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
 
-# Create session directory if needed
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-mkdir -p "$SESSION_DIR"
+check_phase_transition() {
+  local old_phase="${WF_PHASE:-idle}"
+  local new_phase="$old_phase"
+  local message=""
 
-PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-OLD_PHASE=$(cat "$PHASE_FILE" 2>/dev/null || echo "idle")
-NEW_PHASE="$OLD_PHASE"
-MESSAGE=""
+  # Determine new phase based on skill invoked
+  # Match skill names from the Skill tool input
+  # Workflow order: /branch → /brainstorm (plan mode) → /backlog-development (plan mode) → /implement → /verify
+  case "$TOOL_INPUT" in
+    *git-workflow*|*branch*)
+      # UNCONDITIONAL RESET: Starting new branch = new workflow
+      # Clear any stale session state from previous workflows
+      hook_state_set backlog_path ""
+      hook_state_set dispatch ""
+      hook_state_set expected_task_count ""
+      hook_state_set needs_refix ""
+      hook_state_set reviewed ""
+      rm -f "${SESSION_DIR}/.backlog_index" 2>/dev/null || true
+      rm -rf "${SESSION_DIR}/.review_shards" 2>/dev/null || true
+      new_phase="branched"
+      message="Branch created. Workflow reset. Ready for /brainstorm (use plan mode: shift+tab twice)."
+      ;;
+    *brainstorm*)
+      new_phase="brainstorming"
+      message="Brainstorming complete. Ready for /backlog-development (use plan mode)."
+      ;;
+    *developing-backlogs*|*backlog-development*)
+      new_phase="backlog-ready"
+      message="Backlog ready. Proceed with /implement or manual implementation."
+      ;;
+    *orchestrating*|*implement*)
+      new_phase="implementing"
+      message="Implementation in progress."
+      ;;
+    *verification*|*verify*)
+      new_phase="verifying"
+      message="Verification phase. Ready for PR when complete."
+      ;;
+  esac
 
-# Determine new phase based on skill invoked
-# Match skill names from the Skill tool input
-# Workflow order: /branch → /brainstorm (plan mode) → /backlog-development (plan mode) → /implement → /verify
-case "$TOOL_INPUT" in
-  *git-workflow*|*branch*)
-    # UNCONDITIONAL RESET: Starting new branch = new workflow
-    # Clear any stale session state from previous workflows
-    rm -f "${SESSION_DIR}/.backlog_path" 2>/dev/null || true
-    rm -f "${SESSION_DIR}/.subagent_dispatch" 2>/dev/null || true
-    rm -f "${SESSION_DIR}/.expected_task_count" 2>/dev/null || true
-    rm -f "${SESSION_DIR}/.needs_refix" 2>/dev/null || true
-    NEW_PHASE="branched"
-    MESSAGE="Branch created. Workflow reset. Ready for /brainstorm (use plan mode: shift+tab twice)."
-    ;;
-  *brainstorm*)
-    NEW_PHASE="brainstorming"
-    MESSAGE="Brainstorming complete. Ready for /backlog-development (use plan mode)."
-    ;;
-  *developing-backlogs*|*backlog-development*)
-    NEW_PHASE="backlog-ready"
-    MESSAGE="Backlog ready. Proceed with /implement or manual implementation."
-    ;;
-  *orchestrating*|*implement*)
-    NEW_PHASE="implementing"
-    MESSAGE="Implementation in progress."
-    ;;
-  *verification*|*verify*)
-    NEW_PHASE="verifying"
-    MESSAGE="Verification phase. Ready for PR when complete."
-    ;;
-esac
+  # Only report if phase changed
+  [[ "$new_phase" != "$old_phase" ]] || return 0
 
-# Only output if phase changed
-if [[ "$NEW_PHASE" != "$OLD_PHASE" ]]; then
-  echo "$NEW_PHASE" > "$PHASE_FILE"
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "WORKFLOW PHASE: $OLD_PHASE → $NEW_PHASE. $MESSAGE"
-  }
+  hook_set_phase "$new_phase"
+  hook_context "WORKFLOW PHASE: $old_phase → $new_phase. $message"
 }
-EOF
-else
-  echo '{}'
-fi
 
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_phase_transition
+fi
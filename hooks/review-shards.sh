@@ -0,0 +1,45 @@
+#!/usr/bin/env bash
+# Plan a sharded quality review of a task's diff
+# Usage: review-shards.sh <base> [<head>]    (head defaults to HEAD)
+#
+# Prints one line per shard, "Shard <i>/<K> (<N> lines): <paths>" with the
+# paths shell-quoted (ready for `git diff <base> <head> -- <paths>`), grouping
+# the files changed between the two commits by directory into shards of at
+# most WORKFLOW_REVIEW_SHARD_LINES changed lines (default 400; see
+# lib/review-shards.awk). Each shard goes to its own quality-reviewer with
+# "Review shard: <i>/<K>" in the prompt; the dispatch tracker merges the
+# shard reports into one Quality Review handoff.
+
+set -euo pipefail
+
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+
+review_shards_main() {
+  [[ $# -ge 1 && $# -le 2 ]] || { echo "usage: review-shards.sh <base> [<head>]" >&2; return 2; }
+  local shards
+  shards=$(git diff --numstat --no-renames "$1" "${2:-HEAD}" \
+    | LC_ALL=C awk -v budget="${WORKFLOW_REVIEW_SHARD_LINES:-400}" \
+      -f "${HOOKS_DIR}/lib/review-shards.awk") || return 1
+  if [[ -z "$shards" ]]; then
+    echo "No changes between $1 and ${2:-HEAD}."
+    return 0
+  fi
+  local total number size paths path quoted
+  total=$(wc -l <<< "$shards")
+  total="${total// /}"
+  while IFS=$'\037' read -r number size paths; do
+    quoted=""
+    while IFS= read -r -d $'\036' path; do
+      printf -v path '%q' "$path"
+      quoted+=" ${path}"
+    done <<< "${paths}"$'\036'
+    printf 'Shard %s/%s (%s lines):%s\n' "$number" "$total" "$size" "$quoted"
+  done <<< "$shards"
+}
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  review_shards_main "$@"
+fi
@@ -13,7 +13,66 @@ exit /b
 CMDBLOCK
 
 # Unix shell runs from here
-SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+case "$0" in
+  */*) SCRIPT_DIR="${0%/*}" ;;
+  *) SCRIPT_DIR="." ;;
+esac
 SCRIPT_NAME="$1"
 shift
+
+# Events no registered check can act on are answered here, without starting
+# bash (see lib/prefilter.sh)
+if [ "$SCRIPT_NAME" = "dispatch.sh" ] && [ "$#" -eq 2 ]; then
+  . "${SCRIPT_DIR}/lib/prefilter.sh"
+  if ! hook_prefilter "$1" "$2"; then
+    echo '{}'
+    exit 0
+  fi
+fi
+
+# Forward dispatcher calls to the resident hook daemon when one is running
+# (see hook-daemon.sh); any failure falls through to running the script.
+. "${SCRIPT_DIR}/lib/session-dir.sh"
+workflow_session_dir
+HOOKD_DIR="${SESSION_DIR}/.hookd"
+if [ "$SCRIPT_NAME" = "dispatch.sh" ] && [ "$#" -eq 2 ] \
+  && [ -p "${HOOKD_DIR}/requests" ] && [ -f "${HOOKD_DIR}/pid" ] \
+  && read -r HOOKD_PID < "${HOOKD_DIR}/pid" && kill -0 "$HOOKD_PID" 2>/dev/null \
+  && mkfifo "${HOOKD_DIR}/req.$$.reply" 2>/dev/null; then
+  REQ="${HOOKD_DIR}/req.$$"
+  printf '%s\n' "$1" "$2" "${CLAUDE_TOOL_NAME:-}" "$PWD" > "${REQ}.meta"
+  printf '%s' "${CLAUDE_TOOL_INPUT:-}" > "${REQ}.input"
+  printf '%s' "${CLAUDE_TOOL_OUTPUT:-}" > "${REQ}.output"
+  # Opening the requests FIFO, and then the reply, blocks until the daemon
+  # opens it too. Should the daemon die first, a watchdog opens both instead
+  # (the requests FIFO read-write, which never blocks), so the read below
+  # sees an empty reply and the hook runs directly.
+  (
+    while kill -0 "$HOOKD_PID" 2>/dev/null; do sleep 0.2; done
+    if [ -p "${HOOKD_DIR}/requests" ]; then
+      exec 3<> "${HOOKD_DIR}/requests"
+    fi
+    : > "${REQ}.reply"
+  ) > /dev/null 2>&1 &
+  HOOKD_WATCH=$!
+  printf '%s\n' "$REQ" >> "${HOOKD_DIR}/requests"
+  if [ -p "${HOOKD_DIR}/requests" ]; then
+    REPLY_JSON=""
+    while IFS= read -r LINE; do
+      REPLY_JSON="${REPLY_JSON}${LINE}
+"
+    done < "${REQ}.reply"
+    kill "$HOOKD_WATCH" 2>/dev/null
+    if [ -n "$REPLY_JSON" ]; then
+      printf '%s' "$REPLY_JSON"
+      exit 0
+    fi
+  else
+    # Daemon shut down between the check and the write
+    kill "$HOOKD_WATCH" 2>/dev/null
+    rm -f "${HOOKD_DIR}/requests"
+  fi
+  rm -f "${REQ}.meta" "${REQ}.input" "${REQ}.output" "${REQ}.reply"
+fi
+
 "${SCRIPT_DIR}/${SCRIPT_NAME}" "$@"
@@ -3,60 +3,145 @@
 
 set -euo pipefail
 
-# Determine plugin root directory (one level up from hooks/)
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]:-$0}")" && pwd)"
-PLUGIN_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
-
-# Session state directory
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-mkdir -p "$SESSION_DIR"
-
-# Branch detection (A2): Auto-set phase to 'branched' if on feature branch with idle phase
-BRANCH_INFO=""
-if git rev-parse --git-dir > /dev/null 2>&1; then
-  CURRENT_BRANCH=$(git branch --show-current 2>/dev/null || echo "")
-  if [[ -n "$CURRENT_BRANCH" && "$CURRENT_BRANCH" != "main" && "$CURRENT_BRANCH" != "master" ]]; then
-    PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-    CURRENT_PHASE=$(cat "$PHASE_FILE" 2>/dev/null || echo "idle")
-    if [[ "$CURRENT_PHASE" == "idle" || -z "$CURRENT_PHASE" ]]; then
-      echo "branched" > "$PHASE_FILE"
-      BRANCH_INFO="\\n\\n**Branch detected:** On '$CURRENT_BRANCH'. Phase auto-set to 'branched'. Ready for /brainstorm (plan mode)."
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+
+# Skills injected at startup: names under skills/ or paths to SKILL.md files,
+# separated by commas or spaces. The first one is introduced as the entry point.
+SESSION_SKILLS="${WORKFLOW_SESSION_SKILLS:-using-ecosystem}"
+
+# Escaped skill payloads are cached here, one file per plugin install and
+# skill list. Line 1 holds the content key, the rest is the payload.
+SESSION_CACHE_DIR="${XDG_CACHE_HOME:-${HOME:-/tmp}/.cache}/workflow-ecosystem/session-start"
+
+# Resolve SESSION_SKILLS into parallel SKILL_NAMES / SKILL_PATHS arrays
+_session_resolve_skills() {
+  local entries entry name
+  SKILL_NAMES=()
+  SKILL_PATHS=()
+  IFS=', ' read -r -a entries <<< "$SESSION_SKILLS"
+  for entry in "${entries[@]}"; do
+    if [[ "$entry" == */* ]]; then
+      name="${entry%/*}"
+      SKILL_NAMES+=("${name##*/}")
+      SKILL_PATHS+=("$entry")
+    else
+      SKILL_NAMES+=("$entry")
+      SKILL_PATHS+=("${PLUGIN_ROOT}/skills/${entry}/SKILL.md")
+    fi
+  done
+}
+
+# Build the escaped skills block into the named variable
+_session_build_skills() {
+  local i name content block=""
+  for (( i = 0; i < ${#SKILL_PATHS[@]}; i++ )); do
+    name="${SKILL_NAMES[$i]}"
+    if [[ ! -r "${SKILL_PATHS[$i]}" ]] || ! hook_json_escape_file content "${SKILL_PATHS[$i]}"; then
+      content="Error reading ${name} skill"
     fi
+    if [[ -z "$block" ]]; then
+      block="**Below is the full content of your '${name}' skill - your introduction to the workflow ecosystem. For all other skills, use the 'Skill' tool:**\n\n${content}"
+    else
+      block+="\n\n**Below is the full content of your '${name}' skill:**\n\n${content}"
+    fi
+  done
+  printf -v "$1" '%s' "$block"
+}
+
+# Content key: plugin version, skill list and skill file contents
+_session_cache_key() {
+  local manifest version="" __key path readable=()
+  hook_read_file manifest "${PLUGIN_ROOT}/.claude-plugin/plugin.json"
+  if [[ "$manifest" =~ \"version\"[[:space:]]*:[[:space:]]*\"([^\"]+)\" ]]; then
+    version="${BASH_REMATCH[1]}"
+  fi
+  for path in "${SKILL_PATHS[@]}"; do
+    [[ ! -r "$path" ]] || readable+=("$path")
+  done
+  __key=$({ printf '%s\n%s\n' "$version" "$SESSION_SKILLS"; cat ${readable[@]+"${readable[@]}"}; } | cksum)
+  printf -v "$1" '%s' "${__key// /-}"
+}
+
+# Load the skills block into the named variable, from cache when possible.
+# Warm path: stat checks and one file read. When a source file is not older
+# than the cache its contents are hashed, so touched-but-unchanged files
+# (or edits within the same timestamp tick) never serve a stale payload.
+_session_skills_payload() {
+  local __var="$1" cache name path data key stale=""
+  _session_resolve_skills
+
+  name="${HOOKS_DIR%/hooks}|${SESSION_SKILLS}"
+  name="${name//[^A-Za-z0-9._-]/_}"
+  cache="${SESSION_CACHE_DIR}/${name}"
+  if [[ ${#name} -gt 200 ]]; then
+    _session_build_skills "$__var"
+    return 0
   fi
-fi
 
-# Read using-ecosystem content
-using_ecosystem_content=$(cat "${PLUGIN_ROOT}/skills/using-ecosystem/SKILL.md" 2>&1 || echo "Error reading using-ecosystem skill")
-
-# Escape outputs for JSON using pure bash
-escape_for_json() {
-    local input="$1"
-    local output=""
-    local i char
-    for (( i=0; i<${#input}; i++ )); do
-        char="${input:$i:1}"
-        case "$char" in
-            $'\\') output+='\\' ;;
-            '"') output+='\"' ;;
-            $'\n') output+='\n' ;;
-            $'\r') output+='\r' ;;
-            $'\t') output+='\t' ;;
-            *) output+="$char" ;;
-        esac
+  if [[ -f "$cache" ]]; then
+    for path in "${PLUGIN_ROOT}/.claude-plugin/plugin.json" "${SKILL_PATHS[@]}"; do
+      if [[ -e "$path" && ! "$path" -ot "$cache" ]]; then
+        stale=1
+        break
+      fi
     done
-    printf '%s' "$output"
+    hook_read_file data "$cache"
+    if [[ -z "$stale" ]]; then
+      printf -v "$__var" '%s' "${data#*$'\n'}"
+      return 0
+    fi
+  fi
+
+  _session_cache_key key
+  if [[ -n "$stale" && "${data%%$'\n'*}" == "$key" ]]; then
+    touch "$cache" 2> /dev/null || true
+    printf -v "$__var" '%s' "${data#*$'\n'}"
+    return 0
+  fi
+
+  _session_build_skills "$__var"
+  # Best effort: an unwritable cache just means rebuilding next time
+  if mkdir -p "$SESSION_CACHE_DIR" 2> /dev/null; then
+    printf '%s\n%s' "$key" "${!__var}" > "${cache}.$$" 2> /dev/null \
+      && mv -f "${cache}.$$" "$cache" 2> /dev/null \
+      || rm -f "${cache}.$$"
+  fi
 }
 
-using_ecosystem_escaped=$(escape_for_json "$using_ecosystem_content")
+check_session_start() {
+  HOOK_EVENT_NAME="SessionStart"
+  hook_ensure_session_dir
+  # Let scripts run without CLAUDE_SESSION_ID find this session's state
+  workflow_session_record 2> /dev/null || true
+  # Drop state left behind by sessions that have gone idle
+  hook_state_gc
 
-# Output context injection as JSON
-cat <<EOF
-{
-  "hookSpecificOutput": {
-    "hookEventName": "SessionStart",
-    "additionalContext": "<EXTREMELY_IMPORTANT>\nYou have access to the workflow ecosystem.${BRANCH_INFO}\n\n**Below is the full content of your 'using-ecosystem' skill - your introduction to the workflow ecosystem. For all other skills, use the 'Skill' tool:**\n\n${using_ecosystem_escaped}\n\n</EXTREMELY_IMPORTANT>"
-  }
+  # Opt-in resident daemon (no-op when already running)
+  if [[ "${WORKFLOW_HOOK_DAEMON:-}" == "1" ]]; then
+    "${HOOKS_DIR}/hook-daemon.sh" start || true
+  fi
+
+  # Branch detection (A2): Auto-set phase to 'branched' if on feature branch with idle phase
+  local branch_info=""
+  hook_git_branch
+  if [[ -n "$WF_IN_GIT" && -n "$WF_BRANCH" && "$WF_BRANCH" != "main" && "$WF_BRANCH" != "master" ]]; then
+    if [[ "${WF_PHASE:-idle}" == "idle" ]]; then
+      hook_set_phase "branched"
+      branch_info="\\n\\n**Branch detected:** On '$WF_BRANCH'. Phase auto-set to 'branched'. Ready for /brainstorm (plan mode)."
+    fi
+  fi
+
+  # Static skill payload comes from the cache; only the branch fragment is dynamic
+  local skills
+  _session_skills_payload skills
+
+  # Context injection
+  hook_context "<EXTREMELY_IMPORTANT>\nYou have access to the workflow ecosystem.${branch_info}\n\n${skills}\n\n</EXTREMELY_IMPORTANT>"
 }
-EOF
 
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_session_start
+fi
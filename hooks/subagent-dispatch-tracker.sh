@@ -2,60 +2,284 @@
 # PostToolUse hook: Track subagent dispatch during /implement
 # Tracks Task tool dispatches and records in session state
 #
-# This hook tracks which subagents have been dispatched for the current task.
-# It resets the tracker when a new code-implementer is dispatched (new task).
+# This hook tracks which subagents have been dispatched for each backlog task,
+# keyed by the "## Task N" header in the prompt (see hooks/lib/state.sh), so
+# several tasks can be in flight at once. A new code-implementer dispatch for
+# a task resets that task's tracker only. Reviewer entries record the commit
+# reviewed and the verdict; once both reviewers of a task have reported,
+# their verdicts are merged, and reviews of different commits are flagged.
+# The last commit each reviewer reviewed outlives a fix cycle, so the
+# re-review can be scoped to the fix: a review whose prompt says
+# "Re-review since: <sha>" counts as fresh when <sha> is that commit.
+# A quality review sharded by review-shards.sh ("Review shard: <i>/<K>" in
+# each prompt) counts once all K shards have reported, as one merged review.
 # Only active during the implementing phase.
 
 set -euo pipefail
 
-TOOL_NAME="${CLAUDE_TOOL_NAME:-}"
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-
-# Only process Task tool completions
-[[ "$TOOL_NAME" != "Task" ]] && { echo '{}'; exit 0; }
-
-# Check for workflow skip
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-[[ -f "$SKIP_FILE" ]] && { echo '{}'; exit 0; }
-
-# Check if in implementing phase
-PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-PHASE=$(cat "$PHASE_FILE" 2>/dev/null || echo "")
-[[ "$PHASE" != "implementing" ]] && { echo '{}'; exit 0; }
-
-mkdir -p "$SESSION_DIR"
-TRACKER_FILE="${SESSION_DIR}/.subagent_dispatch"
-
-# Fix tracking file (B3)
-NEEDS_REFIX_FILE="${SESSION_DIR}/.needs_refix"
-
-# Detect subagent type from tool input and update tracker
-# The tool input contains the subagent_type parameter
-if echo "$TOOL_INPUT" | grep -qE 'code-implementer'; then
-  # Check if this is a re-dispatch after reviewers found issues
-  if [[ -f "$TRACKER_FILE" ]] && grep -q "spec-reviewer\|quality-reviewer" "$TRACKER_FILE" 2>/dev/null; then
-    # Reviewers were dispatched, now implementer re-dispatched = fix cycle
-    # Set needs_refix flag to ensure fresh reviews after fix
-    touch "$NEEDS_REFIX_FILE"
-  fi
-  # New task or fix started - reset tracker but preserve needs_refix
-  echo "code-implementer" > "$TRACKER_FILE"
-elif echo "$TOOL_INPUT" | grep -qE 'spec-reviewer'; then
-  # Append spec-reviewer to tracker
-  echo "spec-reviewer" >> "$TRACKER_FILE"
-  # Clear needs_refix if this is a fresh review after fix
-  if [[ -f "$NEEDS_REFIX_FILE" ]]; then
-    rm -f "$NEEDS_REFIX_FILE"
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+
+# The "task-<N>" a dispatch prompt is about, into the named variable: N from
+# its "## Task N" header, else from "Task N of M"; empty when it names none
+dispatch_task() {
+  local __task=""
+  if [[ "$TOOL_INPUT" =~ \#\#+[[:space:]]*[Tt]ask[[:space:]]+([0-9]+) ]]; then
+    __task="task-${BASH_REMATCH[1]}"
+  elif [[ "$TOOL_INPUT" =~ [Tt]ask[[:space:]]+([0-9]+)[[:space:]]+of[[:space:]]+[0-9]+ ]]; then
+    __task="task-${BASH_REMATCH[1]}"
+  fi
+  printf -v "$1" '%s' "$__task"
+}
+
+# Commit a review refers to, into the named variable: "Reviewed commit: <sha>"
+# in the report, else "Review commit: <sha>" in the prompt; "-" if neither
+REVIEW_COMMIT_PATTERN='[Rr]eview(ed)?[[:space:]]+[Cc]ommit[[:space:]:*`]*([0-9a-f]{7,40})'
+review_commit() {
+  local __commit="-"
+  if [[ "$TOOL_OUTPUT" =~ $REVIEW_COMMIT_PATTERN ]]; then
+    __commit="${BASH_REMATCH[2]}"
+  elif [[ "$TOOL_INPUT" =~ $REVIEW_COMMIT_PATTERN ]]; then
+    __commit="${BASH_REMATCH[2]}"
+  fi
+  printf -v "$1" '%s' "$__commit"
+}
+
+# Base commit of a scoped re-review, into the named variable: "Re-review
+# since: <sha>" in the prompt or the report; empty for a full review
+REVIEW_BASE_PATTERN='[Rr]e-?review[[:space:]]+since[[:space:]:*`]*([0-9a-f]{7,40})'
+review_base() {
+  local __base=""
+  if [[ "$TOOL_INPUT" =~ $REVIEW_BASE_PATTERN || "$TOOL_OUTPUT" =~ $REVIEW_BASE_PATTERN ]]; then
+    __base="${BASH_REMATCH[1]}"
+  fi
+  printf -v "$1" '%s' "$__base"
+}
+
+# Verdict of a review report's "## Spec Review: X" or "## Quality Review: X"
+# heading, into the named variable: approved, issues, or "-" if absent
+review_verdict() {
+  local __verdict="-"
+  if [[ "$TOOL_OUTPUT" =~ (Spec|Quality)[[:space:]]+Review:[[:space:]]*([A-Z]+) ]]; then
+    __verdict=issues
+    [[ "${BASH_REMATCH[2]}" != "APPROVED" ]] || __verdict=approved
+  fi
+  printf -v "$1" '%s' "$__verdict"
+}
+
+# Shard of a sharded quality review, into the named variable: "<i>/<K>" from
+# "Review shard: <i>/<K>" in the prompt (see review-shards.sh); fails if none
+REVIEW_SHARD_PATTERN='[Rr]eview[[:space:]]+shard[[:space:]:*`]*([0-9]+)[[:space:]]*/[[:space:]]*([0-9]+)'
+review_shard() {
+  local __shard="" __number __total
+  if [[ "$TOOL_INPUT" =~ $REVIEW_SHARD_PATTERN ]]; then
+    __number=$((10#${BASH_REMATCH[1]}))
+    __total=$((10#${BASH_REMATCH[2]}))
+    (( __number < 1 || __number > __total )) || __shard="${__number}/${__total}"
+  fi
+  printf -v "$1" '%s' "$__shard"
+  [[ -n "$__shard" ]]
+}
+
+# Whether two recorded commits are the same, either possibly abbreviated
+same_commit() {
+  [[ "$1" == "$2"* || "$2" == "$1"* ]]
+}
+
+# Record one shard of a task's quality review as "quality-reviewer#<i>/<K>"
+# and keep its findings. Once all K shards of the commit have reported, hand
+# off their merged report and set the named commit and verdict variables to
+# the merged review's. Fails while shards are outstanding or disagree on the
+# commit. Usage: _merge_review_shards <commit var> <verdict var> <shard> <task> <name>
+_merge_review_shards() {
+  local __commit="${!1}" __verdict="${!2}" shard="$3" task="$4" name="$5"
+  local prefix="${task:+${task}:}" number="${3%/*}" total="${3#*/}"
+  local dir="${SESSION_DIR}/.review_shards/${task:-task}" agents id sha result entry
+  hook_state_del dispatch "${prefix}quality-reviewer#${number}/*"
+  # Shards of a review split into a different number of shards are stale
+  while IFS= read -r entry; do
+    [[ "$entry" == "${prefix}quality-reviewer#"* && "$entry" != *"/${total} "* ]] || continue
+    hook_state_del dispatch "$entry"
+  done <<< "$WF_DISPATCHES"
+  hook_state_add dispatch "${prefix}quality-reviewer#${shard} ${__commit} ${__verdict}"
+  hook_ensure_session_dir
+  mkdir -p "$dir"
+  printf '%s\n' "$TOOL_OUTPUT" | awk '
+    /^#+[ \t]/ { keep = ($0 ~ /^###[ \t]+For (Code-)?Implementer/); next }
+    keep && NF { print }
+  ' > "${dir}/${number}"
+  # Commit now: of shards finishing together, the last to commit sees them all
+  hook_state_commit
+  hook_task_dispatches agents "$WF_DISPATCHES" "$task"
+
+  local reported=() outstanding="" merged=approved i
+  while read -r id sha result; do
+    [[ "$id" =~ ^quality-reviewer#([0-9]+)/${total}$ ]] || continue
+    if [[ "$__commit" != "-" && "$sha" != "-" ]] && ! same_commit "$__commit" "$sha"; then
+      hook_message "⚠️ WARNING: Review shards of different commits!\\n\\n- quality-reviewer shard ${shard} of ${name} reviewed ${__commit}\\n- shard ${id#*#} reviewed ${sha}\\n\\nEvery shard must review the same implementer commit. Re-dispatch the stale shards against the current commit."
+      return 1
+    fi
+    [[ "$__commit" != "-" ]] || __commit="$sha"
+    reported[BASH_REMATCH[1]]="$result"
+  done <<< "$agents"
+  for (( i = 1; i <= total; i++ )); do
+    [[ -n "${reported[i]:-}" ]] || outstanding+="${outstanding:+, }${i}"
+  done
+  if [[ -n "$outstanding" ]]; then
+    hook_context "REVIEW SHARD ${shard} recorded (${name}): waiting for quality-reviewer shards ${outstanding} of ${total} before the review counts."
+    return 1
+  fi
+
+  # Merged verdict: approved only if every shard approved
+  local handoff="${dir}/handoff" findings summary="" fixes="" escaped
+  for (( i = 1; i <= total; i++ )); do
+    summary+="- Shard ${i}/${total}: ${reported[i]}"$'\n'
+    if [[ "${reported[i]}" == issues ]]; then
+      merged=issues
+    elif [[ "${reported[i]}" != approved && "$merged" == approved ]]; then
+      merged="-"
+    fi
+    hook_read_file findings "${dir}/${i}"
+    [[ -n "$findings" || "${reported[i]}" != issues ]] || findings="- See the report of shard ${i}."$'\n'
+    [[ -z "$findings" ]] || fixes+=$'\n'"#### Shard ${i}/${total}"$'\n'"${findings}"
+  done
+  {
+    printf '## Quality Review: %s\n\n' "$([[ "$merged" == approved ]] && echo APPROVED || echo "ISSUES FOUND")"
+    printf '**Reviewed commit:** `%s`\n\n' "$__commit"
+    printf '### Assessment Summary\n%s\n' "$summary"
+    [[ -z "$fixes" ]] || printf '### For Implementer\n%s\n' "$fixes"
+    printf '### For Orchestrator\n- Code quality: merged from %s quality-reviewer shards\n' "$total"
+    printf '%s\n' "- Ready to merge: $([[ "$merged" == approved ]] && echo Yes || echo "No - requires fixes")"
+  } > "$handoff"
+  hook_json_escape_file escaped "$handoff"
+  rm -rf "$dir"
+  hook_state_del dispatch "${prefix}quality-reviewer#*"
+  hook_context "REVIEW SHARDS MERGED (${name}): all ${total} quality-reviewer shards reported. Use this merged report as the Quality Review handoff:\\n\\n${escaped}"
+  printf -v "$1" '%s' "$__commit"
+  printf -v "$2" '%s' "$merged"
+}
+
+_clear_needs_refix() {
+  [[ $'\n'"$WF_NEEDS_REFIX" == *$'\n'"$1"$'\n'* ]] || return 0
+  hook_state_del needs_refix "$1"
+}
+
+# After a fix, point each reviewer at the diff since the commit it last
+# reviewed instead of the whole task
+_scoped_rereview_hint() {
+  local name="$1" agent sha verdict scopes=""
+  while read -r agent sha verdict; do
+    [[ -n "$agent" && "$sha" != "-" ]] || continue
+    scopes+=" ${agent}: '**Re-review since:** ${sha}', the output of \`git diff ${sha}..HEAD\` and its previous verdict (${verdict})."
+  done <<< "$2"
+  [[ -n "$scopes" ]] || return 0
+  hook_context "SCOPED RE-REVIEW (${name}): give each reviewer only the fix, not the whole task.${scopes} Each report still states its **Reviewed commit:**."
+}
+
+check_subagent_dispatch_tracker() {
+  # Only process Task tool completions
+  [[ "$TOOL_NAME" == "Task" ]] || return 0
+
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
+
+  # Check if in implementing phase
+  [[ "$WF_PHASE" == "implementing" ]] || return 0
+
+  # Entries for a numbered task are prefixed "task-N:"; the unnumbered task's
+  # entries are bare agent names and its refix flag is 1
+  local task agents reviewed prefix refix scope name="this task"
+  dispatch_task task
+  prefix="${task:+${task}:}"
+  refix="${task:-1}"
+  scope="${prefix}*"
+  [[ -n "$task" ]] || scope="!*:*"
+  [[ -z "$task" ]] || name="Task ${task#task-}"
+  hook_task_dispatches agents "$WF_DISPATCHES" "$task"
+  hook_task_dispatches reviewed "$WF_REVIEWED" "$task"
+
+  # Detect subagent type from tool input and update tracker
+  local agent other
+  hook_subagent_type agent
+  case "$agent" in
+    code-implementer)
+      # Check if this is a re-dispatch after reviewers found issues
+      if [[ "$agents" == *spec-reviewer* || "$agents" == *quality-reviewer* ]]; then
+        # Reviewers were dispatched, now implementer re-dispatched = fix cycle
+        # Flag the task so fresh reviews are required after the fix (B3)
+        _clear_needs_refix "$refix"
+        hook_state_add needs_refix "$refix"
+        _scoped_rereview_hint "$name" "$reviewed"
+      else
+        # New task: reviews of an earlier unnumbered task are no base
+        hook_state_del reviewed "$scope"
+      fi
+      # New task or fix started - reset this task's tracker but preserve needs_refix
+      hook_state_del dispatch "$scope"
+      rm -rf "${SESSION_DIR}/.review_shards/${task:-task}"
+      hook_state_add dispatch "${prefix}code-implementer"
+      return 0
+      ;;
+    spec-reviewer) other=quality-reviewer ;;
+    quality-reviewer) other=spec-reviewer ;;
+    *) return 0 ;;
+  esac
+
+  # A scoped re-review only counts if it covers everything since the commit
+  # this reviewer last reviewed
+  local base review last_commit
+  review_base base
+  if [[ -n "$base" ]]; then
+    last_commit="-"
+    if hook_task_review review "$reviewed" "$agent"; then
+      last_commit="${review%% *}"
+    fi
+    if [[ "$last_commit" == "-" ]] || ! same_commit "$base" "$last_commit"; then
+      hook_message "⚠️ WARNING: Scoped re-review not accepted!\\n\\n- ${agent} re-reviewed ${name} since ${base}\\n- Its last review was of ${last_commit/#-/no recorded commit}\\n\\nA scoped re-review must cover every change since the reviewer's last review. Re-dispatch ${agent} with the right 'Re-review since:' commit, or for a full review."
+      return 0
+    fi
+  fi
+
+  # A quality-reviewer shard only counts once every shard has reported, as
+  # the merged review
+  local commit verdict shard entry="${prefix}${agent}"
+  review_commit commit
+  review_verdict verdict
+  if [[ "$agent" == quality-reviewer ]] && review_shard shard; then
+    _merge_review_shards commit verdict "$shard" "$task" "$name" || return 0
+    hook_task_dispatches agents "$WF_DISPATCHES" "$task"
+  fi
+
+  # Append the reviewer, with the commit and verdict when known, to the
+  # task's tracker, and keep the commit as the base of its next re-review
+  [[ "$commit $verdict" == "- -" ]] || entry+=" ${commit} ${verdict}"
+  hook_state_add dispatch "$entry"
+  if [[ "$commit" != "-" ]]; then
+    hook_state_del reviewed "${prefix}${agent} *"
+    hook_state_add reviewed "${prefix}${agent} ${commit} ${verdict}"
   fi
-elif echo "$TOOL_INPUT" | grep -qE 'quality-reviewer'; then
-  # Append quality-reviewer to tracker
-  echo "quality-reviewer" >> "$TRACKER_FILE"
   # Clear needs_refix if this is a fresh review after fix
-  if [[ -f "$NEEDS_REFIX_FILE" ]]; then
-    rm -f "$NEEDS_REFIX_FILE"
+  _clear_needs_refix "$refix"
+
+  # Merge with the other reviewer's latest verdict on the same commit
+  local other_commit other_verdict label="${task:+Task ${task#task-}, }"
+  hook_task_review review "$agents" "$other" || return 0
+  read -r other_commit other_verdict <<< "$review"
+  if [[ "$commit" != "-" && "$other_commit" != "-" ]] && ! same_commit "$commit" "$other_commit"; then
+    hook_message "⚠️ WARNING: Reviews of different commits!\\n\\n- ${agent} reviewed ${commit}\\n- ${other} reviewed ${other_commit}\\n\\nBoth reviews of ${name} must refer to the same implementer commit. Re-dispatch the stale reviewer against the current commit."
+    return 0
   fi
-fi
+  [[ "$verdict" != "-" && "$other_verdict" != "-" ]] || return 0
+  [[ "$commit" != "-" ]] || commit="$other_commit"
+  if [[ "$verdict" == approved && "$other_verdict" == approved ]]; then
+    hook_context "REVIEWS MERGED (${label}commit ${commit}): spec-reviewer and quality-reviewer both approved. The task can be marked complete."
+  else
+    hook_context "REVIEWS MERGED (${label}commit ${commit}): ${agent} ${verdict}, ${other} ${other_verdict}. Re-dispatch code-implementer with the findings of every review that found issues, then re-dispatch BOTH reviewers against the fix commit."
+  fi
+}
 
-echo '{}'
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_subagent_dispatch_tracker
+fi
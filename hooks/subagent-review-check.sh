@@ -3,8 +3,13 @@
 # Checks tracker for missing spec-reviewer or quality-reviewer dispatch
 #
 # This hook fires after TodoWrite marks a task as completed.
-# It checks the dispatch tracker to ensure all three subagents were dispatched.
-# If reviews are missing, it warns about the violation.
+# It checks the dispatch tracker of each completed backlog task ("Task N" in
+# the todo content, warning too when the task has no dispatches at all) to
+# ensure all three subagents were dispatched for it,
+# and that both reviews approved the same commit. A sharded quality review
+# counts once all its shards have been merged. If reviews are missing,
+# found issues or refer to different commits, it warns about the violation.
+# With WORKFLOW_REVIEW_MODE=parallel, reviews must also name their commit.
 # Only active during the implementing phase.
 #
 # NOTE: This was previously a PreToolUse blocking hook, but Claude Code runtime
@@ -13,72 +18,138 @@
 
 set -euo pipefail
 
-TOOL_NAME="${CLAUDE_TOOL_NAME:-}"
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-
-# Only check TodoWrite tool
-[[ "$TOOL_NAME" != "TodoWrite" ]] && { echo '{}'; exit 0; }
-
-# Only check if marking task as completed
-# The tool input is JSON with todos array containing status fields
-if ! echo "$TOOL_INPUT" | grep -qE '"status"[[:space:]]*:[[:space:]]*"completed"'; then
-  echo '{}'
-  exit 0
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
 fi
 
-# Check for workflow skip
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-[[ -f "$SKIP_FILE" ]] && { echo '{}'; exit 0; }
+check_subagent_review_check() {
+  # Only check TodoWrite tool
+  [[ "$TOOL_NAME" == "TodoWrite" ]] || return 0
 
-# Check if in implementing phase
-PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-PHASE=$(cat "$PHASE_FILE" 2>/dev/null || echo "")
-[[ "$PHASE" != "implementing" ]] && { echo '{}'; exit 0; }
+  # Only check if marking task as completed
+  # The tool input is JSON with todos array containing status fields
+  [[ "$TOOL_INPUT" =~ \"status\"[[:space:]]*:[[:space:]]*\"completed\" ]] || return 0
 
-# Check dispatch tracker
-TRACKER_FILE="${SESSION_DIR}/.subagent_dispatch"
-[[ ! -f "$TRACKER_FILE" ]] && { echo '{}'; exit 0; }
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
 
-DISPATCHES=$(cat "$TRACKER_FILE" 2>/dev/null || echo "")
+  # Check if in implementing phase
+  [[ "$WF_PHASE" == "implementing" ]] || return 0
 
-# Check for needs_refix flag (B3)
-NEEDS_REFIX_FILE="${SESSION_DIR}/.needs_refix"
-FIX_WARNING=""
-if [[ -f "$NEEDS_REFIX_FILE" ]]; then
-  FIX_WARNING="\\n\\n**FIX CYCLE WARNING:** Issues were found in previous review and implementer was re-dispatched to fix them. Fresh reviews are required after fixes."
-fi
+  # Check dispatch tracker
+  [[ -n "$WF_DISPATCHES" ]] || return 0
 
-# Check for missing reviewers
-MISSING=""
-if ! echo "$DISPATCHES" | grep -q "spec-reviewer"; then
-  MISSING="${MISSING}spec-reviewer, "
-fi
-if ! echo "$DISPATCHES" | grep -q "quality-reviewer"; then
-  MISSING="${MISSING}quality-reviewer, "
-fi
+  # Trackers to check: the task each completed todo names ("Task N"), whether
+  # or not it has dispatches. Todos without a number fall back to the only
+  # task tracked, or with several to all dispatches taken together. In an
+  # unnumbered flow (no "task-N:" entries) every todo is the unnumbered task.
+  # One expansion splits the input at each "completed" (globbing off for
+  # the unquoted split); a completed todo is the text around a cut, back to
+  # its "{" and on to its "}"
+  local tasks=() task todo parts i entry tracked="" unnumbered="" IFS=$'\037'
+  set -f
+  parts=(${TOOL_INPUT//\"completed\"/$'\037'})
+  set +f
+  IFS=$' \t\n'
+  for (( i = 1; i < ${#parts[@]}; i++ )); do
+    todo="${parts[i-1]%\{*}"
+    todo="${parts[i-1]:${#todo}+1}"
+    [[ "$todo" =~ \"status\"[[:space:]]*:[[:space:]]*$ ]] || continue
+    todo+="${parts[i]%%\}*}"
+    if [[ "$todo" =~ [Tt]ask[[:space:]]+([0-9]+) ]]; then
+      task="task-${BASH_REMATCH[1]}"
+      [[ " ${tasks[*]:-} " == *" ${task} "* ]] || tasks+=("$task")
+    else
+      unnumbered=1
+    fi
+  done
+  while IFS= read -r entry; do
+    [[ -n "$entry" ]] || continue
+    task=""
+    [[ "$entry" != *:* ]] || task="${entry%%:*}"
+    if [[ -z "$tracked" || "$tracked" == "=$task" ]]; then
+      tracked="=$task"
+    else
+      tracked="*"
+      break
+    fi
+  done <<< "$WF_DISPATCHES"
+  if [[ "$tracked" == "=" ]]; then
+    tasks=("")
+  elif [[ -n "$unnumbered" ]]; then
+    task="${tracked#=}"
+    [[ " ${tasks[*]:-} " == *" ${task} "* ]] || tasks+=("$task")
+  fi
+  [[ ${#tasks[@]} -gt 0 ]] || return 0
 
-if [[ -n "$MISSING" ]] || [[ -n "$FIX_WARNING" ]]; then
-  # Remove trailing comma and space
-  MISSING="${MISSING%, }"
+  # Check for missing reviewers, the needs_refix flag (B3) and reviews that
+  # do not approve one commit, per task
+  local missing="" fix_warning="" problems="" agents task_missing name review shards total
+  local spec_commit spec_verdict quality_commit quality_verdict
+  for task in "${tasks[@]}"; do
+    name="this task"
+    if [[ "$task" == "*" ]]; then
+      # Every dispatch, with its task prefix dropped
+      agents=""
+      while IFS= read -r entry; do
+        [[ "$entry" != task-*:* ]] || entry="${entry#*:}"
+        agents+="${entry}"$'\n'
+      done <<< "$WF_DISPATCHES"
+    else
+      [[ -z "$task" ]] || name="Task ${task#task-}"
+      hook_task_dispatches agents "$WF_DISPATCHES" "$task"
+    fi
+    task_missing=""
+    [[ "$agents" == *spec-reviewer* ]] || task_missing="${task_missing}spec-reviewer, "
+    # Shards of a sharded quality review count once merged
+    if ! hook_task_review review "$agents" quality-reviewer; then
+      shards=0 total=""
+      while IFS= read -r entry; do
+        [[ "$entry" =~ ^quality-reviewer#[0-9]+/([0-9]+) ]] || continue
+        shards=$((shards + 1))
+        total="${BASH_REMATCH[1]}"
+      done <<< "$agents"
+      task_missing="${task_missing}quality-reviewer${total:+: ${shards} of ${total} shards}, "
+    fi
+    # Remove trailing comma and space
+    task_missing="${task_missing%, }"
+    if [[ -n "$task_missing" ]]; then
+      [[ "$name" == "this task" ]] || task_missing="${task_missing} (${name})"
+      missing="${missing:+${missing}; }${task_missing}"
+    fi
+    if [[ $'\n'"$WF_NEEDS_REFIX" == *$'\n'"${task:-1}"$'\n'* \
+      || ( "$task" == "*" && -n "$WF_NEEDS_REFIX" ) ]]; then
+      fix_warning="\\n\\n**FIX CYCLE WARNING:** Issues were found in previous review and implementer was re-dispatched to fix them. Fresh reviews are required after fixes."
+    fi
+    # Reviews of different tasks name different commits
+    [[ -z "$task_missing" && "$task" != "*" ]] || continue
+    hook_task_review review "$agents" spec-reviewer
+    read -r spec_commit spec_verdict <<< "$review"
+    hook_task_review review "$agents" quality-reviewer
+    read -r quality_commit quality_verdict <<< "$review"
+    [[ "$spec_verdict" != issues ]] || problems+="\\n- spec-reviewer found issues in ${name}"
+    [[ "$quality_verdict" != issues ]] || problems+="\\n- quality-reviewer found issues in ${name}"
+    if [[ "$spec_commit" != "-" && "$quality_commit" != "-" ]]; then
+      if [[ "$spec_commit" != "$quality_commit"* && "$quality_commit" != "$spec_commit"* ]]; then
+        problems+="\\n- ${name}: spec-reviewer reviewed ${spec_commit}, quality-reviewer ${quality_commit}"
+      fi
+    elif [[ "${WORKFLOW_REVIEW_MODE:-}" == "parallel" ]]; then
+      problems+="\\n- ${name}: the reviews do not name the commit they reviewed"
+    fi
+  done
 
-  if [[ -n "$MISSING" ]]; then
-    cat <<EOF
-{
-  "systemMessage": "⚠️ WARNING: Task marked complete without required reviews!\\n\\n**What happened:**\\n- You just marked a task as completed\\n- Missing reviewers: ${MISSING}${FIX_WARNING}\\n\\n**Recommended action:**\\n1. Dispatch missing reviewers via Task tool\\n2. Wait for approvals (or fix issues if found)\\n3. Consider reverting the completion status until reviewed\\n\\n**Why this matters:** Per orchestrating-subagents skill, every task requires:\\n  code-implementer -> spec-reviewer -> quality-reviewer\\n\\n**Note:** Blocking was attempted but Claude Code runtime ignores PreToolUse blocks for TodoWrite (Issue #4669)."
-}
-EOF
-  elif [[ -n "$FIX_WARNING" ]]; then
+  if [[ -n "$missing" ]]; then
+    hook_message "⚠️ WARNING: Task marked complete without required reviews!\\n\\n**What happened:**\\n- You just marked a task as completed\\n- Missing reviewers: ${missing}${fix_warning}\\n\\n**Recommended action:**\\n1. Dispatch missing reviewers via Task tool\\n2. Wait for approvals (or fix issues if found)\\n3. Consider reverting the completion status until reviewed\\n\\n**Why this matters:** Per orchestrating-subagents skill, every task requires:\\n  code-implementer -> spec-reviewer -> quality-reviewer\\n\\n**Note:** Blocking was attempted but Claude Code runtime ignores PreToolUse blocks for TodoWrite (Issue #4669)."
+  elif [[ -n "$fix_warning" ]]; then
     # All dispatches present but needs_refix is set
-    cat <<EOF
-{
-  "systemMessage": "⚠️ WARNING: Task marked complete without fresh reviews after fix!\\n\\n**What happened:**\\n- Previous review found issues\\n- Implementer was re-dispatched to fix\\n- Reviewers NOT re-dispatched after fix\\n- You marked the task complete anyway\\n\\n**Recommended action:**\\n1. Re-dispatch spec-reviewer to verify fix\\n2. Re-dispatch quality-reviewer to verify fix\\n3. Consider reverting the completion status until re-reviewed\\n\\n**Why this matters:** Reviews before fixes are stale and don't validate the fix.\\n\\n**Note:** Blocking was attempted but Claude Code runtime ignores PreToolUse blocks for TodoWrite (Issue #4669)."
-}
-EOF
+    hook_message "⚠️ WARNING: Task marked complete without fresh reviews after fix!\\n\\n**What happened:**\\n- Previous review found issues\\n- Implementer was re-dispatched to fix\\n- Reviewers NOT re-dispatched after fix\\n- You marked the task complete anyway\\n\\n**Recommended action:**\\n1. Re-dispatch spec-reviewer to verify fix\\n2. Re-dispatch quality-reviewer to verify fix\\n   (a re-review scoped to the fix counts: 'Re-review since: <sha of its last review>' plus that diff)\\n3. Consider reverting the completion status until re-reviewed\\n\\n**Why this matters:** Reviews before fixes are stale and don't validate the fix.\\n\\n**Note:** Blocking was attempted but Claude Code runtime ignores PreToolUse blocks for TodoWrite (Issue #4669)."
+  elif [[ -n "$problems" ]]; then
+    # Both reviewers dispatched, but they do not approve the same commit
+    hook_message "⚠️ WARNING: Task marked complete without both reviews approving one commit!\\n\\n**What happened:**${problems}\\n\\n**Recommended action:**\\n1. Re-dispatch code-implementer with the findings of every review that found issues\\n2. Re-dispatch spec-reviewer and quality-reviewer against the same fix commit\\n3. Consider reverting the completion status until both approve\\n\\n**Note:** Blocking was attempted but Claude Code runtime ignores PreToolUse blocks for TodoWrite (Issue #4669)."
   fi
-  exit 0
-fi
+}
 
-# All dispatches present, no fix needed - no warning
-echo '{}'
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_subagent_review_check
+fi
@@ -0,0 +1,92 @@
+#!/usr/bin/env bash
+# PreToolUse hook: Pre-inject TODO:BACKLOG markers for a whole backlog
+# Fires when: Skill tool is called with implement|orchestrating pattern,
+# after backlog-task-counter.sh has recorded the backlog
+# Purpose: Place every task's marker up front instead of one per dispatch
+#
+# Reads the parsed backlog index, groups open tasks by their Test: file and
+# writes each existing test file once with all of its markers. Tasks whose
+# test file does not exist yet are recorded as pending. Tasks already in the
+# todo ledger are left alone, so re-runs never restore a marker the
+# implementer removed. New ledger entries reach the state store in the
+# invocation's single commit. todo-injector.sh still runs per dispatch and
+# finds the markers already in place.
+
+set -euo pipefail
+
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+if [[ -z "${_WORKFLOW_BACKLOG_INDEX:-}" ]]; then
+  # shellcheck source=lib/backlog-index.sh
+  source "${HOOKS_DIR}/lib/backlog-index.sh"
+fi
+if ! declare -F todo_inject_markers > /dev/null; then
+  # shellcheck source=todo-injector.sh
+  source "${HOOKS_DIR}/todo-injector.sh"
+fi
+
+check_todo_batch_injector() {
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
+
+  [[ -n "$WF_BACKLOG_PATH" ]] || return 0
+  backlog_index_load "$WF_BACKLOG_PATH" || return 0
+  local ledger="$WF_TODOS"
+
+  # One "<test file> <task> [<task>...]" line per test file, in backlog order;
+  # completed tasks need no marker
+  local groups
+  groups=$(awk -F '\037' '
+    NR > 4 && $2 == 0 && $4 != "" {
+      if (!($4 in tasks)) order[++n] = $4
+      tasks[$4] = tasks[$4] " " $1
+    }
+    END { for (i = 1; i <= n; i++) print order[i] "\037" tasks[order[i]] }
+  ' "$BACKLOG_INDEX")
+  [[ -n "$groups" ]] || return 0
+
+  local file task_list task entry entries=() open written=0 markers=0 pending=0
+  while IFS=$'\037' read -r file task_list; do
+    if [[ -f "$file" ]]; then
+      # Tasks already in the ledger had their marker placed once; it may
+      # since have been removed by the implementer, so it is not re-added
+      open=()
+      for task in $task_list; do
+        entry="task-${task}:${file}"
+        [[ $'\n'"$ledger" == *$'\n'"$entry"$'\n'* \
+          || $'\n'"$ledger" == *$'\n'"${entry}:pending"$'\n'* ]] && continue
+        open+=("$task")
+      done
+      [[ ${#open[@]} -gt 0 ]] || continue
+      todo_inject_markers "$file" "${open[@]}" || continue
+      [[ ${#TODO_INJECTED[@]} -gt 0 ]] || continue
+      written=$((written + 1))
+      markers=$((markers + ${#TODO_INJECTED[@]}))
+      for task in "${TODO_INJECTED[@]}"; do
+        entries+=("task-${task}:${file}")
+      done
+    else
+      for task in $task_list; do
+        entry="task-${task}:${file}:pending"
+        [[ $'\n'"$ledger"$'\n' == *$'\n'"$entry"$'\n'* ]] && continue
+        entries+=("$entry")
+        pending=$((pending + 1))
+      done
+    fi
+  done <<< "$groups"
+
+  [[ ${#entries[@]} -gt 0 ]] || return 0
+  for entry in "${entries[@]}"; do
+    hook_state_add todo "$entry"
+  done
+
+  local summary="TODO:BACKLOG markers pre-injected: ${markers} marker(s) written to ${written} test file(s)."
+  [[ "$pending" -eq 0 ]] || summary+=" ${pending} task(s) are pending until their test files are created."
+  hook_context "${summary} Remove each marker as you implement its task."
+}
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_todo_batch_injector
+fi
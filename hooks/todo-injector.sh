@@ -8,90 +8,123 @@
 
 set -euo pipefail
 
-TOOL_NAME="${CLAUDE_TOOL_NAME:-}"
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-
-# Only process Task tool invocations
-[[ "$TOOL_NAME" != "Task" ]] && { echo '{}'; exit 0; }
-
-# Only process code-implementer dispatches
-echo "$TOOL_INPUT" | grep -qE 'code-implementer' || { echo '{}'; exit 0; }
-
-# Check for workflow skip
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-[[ -f "$SKIP_FILE" ]] && { echo '{}'; exit 0; }
-
-# Check if in implementing phase
-PHASE_FILE="${SESSION_DIR}/.workflow_phase"
-PHASE=$(cat "$PHASE_FILE" 2>/dev/null || echo "")
-[[ "$PHASE" != "implementing" ]] && { echo '{}'; exit 0; }
-
-mkdir -p "$SESSION_DIR"
-TODO_TRACKER="${SESSION_DIR}/.backlog_todos"
-
-# Extract task number from task description (e.g., "## Task 3:" or "### Task 3:")
-TASK_NUM=$(echo "$TOOL_INPUT" | grep -oE '##+ Task [0-9]+' | head -1 | grep -oE '[0-9]+' || echo "")
-[[ -z "$TASK_NUM" ]] && { echo '{}'; exit 0; }
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+if [[ -z "${_WORKFLOW_BACKLOG_INDEX:-}" ]]; then
+  # shellcheck source=lib/backlog-index.sh
+  source "${HOOKS_DIR}/lib/backlog-index.sh"
+fi
 
-# Extract test file path from Files section
-# Look for "Test:" line and extract the path (handles backticks and various formats)
-TEST_FILE=$(echo "$TOOL_INPUT" | grep -E '^\s*[-*]?\s*Test:' | head -1 | sed 's/.*Test:[[:space:]]*`\{0,1\}//' | sed 's/`.*$//' | sed 's/[[:space:]]*$//' || echo "")
-[[ -z "$TEST_FILE" ]] && { echo '{}'; exit 0; }
+# Task numbers whose markers the last todo_inject_markers call added
+TODO_INJECTED=()
 
-# Determine comment syntax based on file extension
+# Determine comment syntax based on file extension into the named variable
 get_comment_prefix() {
-  local file="$1"
-  local ext="${file##*.}"
+  local ext="${2##*.}"
   case "$ext" in
     py|rb|sh|bash|yml|yaml|toml|r|pl|pm)
-      echo "#"
+      printf -v "$1" '%s' "#"
       ;;
     js|ts|tsx|jsx|java|c|cpp|cc|h|hpp|go|rs|swift|kt|scala|cs)
-      echo "//"
+      printf -v "$1" '%s' "//"
       ;;
     *)
-      echo "#"  # Default fallback
+      printf -v "$1" '%s' "#"  # Default fallback
       ;;
   esac
 }
 
-COMMENT_PREFIX=$(get_comment_prefix "$TEST_FILE")
-TODO_MARKER="${COMMENT_PREFIX} TODO:BACKLOG[task-${TASK_NUM}]: See backlog for requirements"
-
-# Check if file exists
-if [[ ! -f "$TEST_FILE" ]]; then
-  # File doesn't exist yet - track as pending, implementer will create it
-  echo "task-${TASK_NUM}:${TEST_FILE}:pending" >> "$TODO_TRACKER"
-  echo '{}'
-  exit 0
-fi
-
-# Check if TODO already exists (idempotency)
-if grep -q "TODO:BACKLOG\[task-${TASK_NUM}\]" "$TEST_FILE" 2>/dev/null; then
-  echo '{}'
-  exit 0
-fi
-
-# Check if file is binary (skip binary files)
-if file "$TEST_FILE" 2>/dev/null | grep -qv "text"; then
-  echo '{}'
-  exit 0
-fi
-
-# Inject TODO at line 2 (after shebang/encoding/first import line)
-sed -i "1a\\${TODO_MARKER}" "$TEST_FILE"
-
-# Track injection
-echo "task-${TASK_NUM}:${TEST_FILE}" >> "$TODO_TRACKER"
+# Add TODO:BACKLOG markers for the given task numbers after line 1 of an
+# existing text file (after shebang/encoding/first import line). Markers
+# already present are skipped, so this is idempotent. The file is rewritten
+# in place at most once, so its mode, owner and any symlink to it are kept;
+# binary files (containing a NUL byte) and empty files are left alone.
+# Sets TODO_INJECTED to the task numbers whose markers were added.
+todo_inject_markers() {
+  local file="$1" content="" first="" prefix markers="" task
+  shift
+  TODO_INJECTED=()
+  # read -d '' stops at the first NUL byte and only succeeds if it finds one
+  if IFS= read -r -d '' content < "$file"; then
+    return 0
+  fi
+  [[ -n "$content" ]] || return 0
+
+  get_comment_prefix prefix "$file"
+  for task in "$@"; do
+    [[ "$content" == *"TODO:BACKLOG[task-${task}]"* ]] && continue
+    markers+="${prefix} TODO:BACKLOG[task-${task}]: See backlog for requirements"$'\n'
+    TODO_INJECTED+=("$task")
+  done
+  [[ -n "$markers" ]] || return 0
+
+  IFS= read -r first < "$file" || true
+  printf '%s\n%s%s' "$first" "$markers" "${content:${#first}+1}" > "$file"
+}
 
-# Output confirmation
-cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "TODO:BACKLOG[task-${TASK_NUM}] injected into ${TEST_FILE}. Remove this marker as you implement the task."
-  }
+check_todo_injector() {
+  # Only process Task tool invocations
+  [[ "$TOOL_NAME" == "Task" ]] || return 0
+
+  # Only process code-implementer dispatches
+  local agent
+  hook_subagent_type agent
+  [[ "$agent" == "code-implementer" ]] || return 0
+
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
+
+  # Check if in implementing phase
+  [[ "$WF_PHASE" == "implementing" ]] || return 0
+
+  # Extract task number from task description (e.g., "## Task 3:" or "### Task 3:")
+  local task_re='##+ Task ([0-9]+)'
+  [[ "$TOOL_INPUT" =~ $task_re ]] || return 0
+  local task_num="${BASH_REMATCH[1]}"
+
+  # Extract test file path from Files section
+  # Look for "Test:" line and extract the path (handles backticks and various formats)
+  local test_file=""
+  local line
+  while IFS= read -r line; do
+    if [[ "$line" =~ ^[[:space:]]*[-*]?[[:space:]]*Test: ]]; then
+      test_file="${line#*Test:}"
+      test_file="${test_file#"${test_file%%[![:space:]]*}"}"
+      test_file="${test_file#\`}"
+      test_file="${test_file%%\`*}"
+      test_file="${test_file%"${test_file##*[![:space:]]}"}"
+      break
+    fi
+  done <<< "$TOOL_INPUT"
+
+  # Fall back to the task's Test: line in the indexed backlog
+  if [[ -z "$test_file" && -n "$WF_BACKLOG_PATH" ]]; then
+    if backlog_index_load "$WF_BACKLOG_PATH" && backlog_index_task "$task_num"; then
+      test_file="$BACKLOG_TASK_TEST"
+    fi
+  fi
+  [[ -n "$test_file" ]] || return 0
+
+  # Check if file exists
+  if [[ ! -f "$test_file" ]]; then
+    # File doesn't exist yet - track as pending, implementer will create it
+    hook_state_add todo "task-${task_num}:${test_file}:pending"
+    return 0
+  fi
+
+  # Inject unless the marker is already there or the file is binary
+  todo_inject_markers "$test_file" "$task_num" || return 0
+  [[ ${#TODO_INJECTED[@]} -gt 0 ]] || return 0
+
+  # Track injection in the ledger
+  hook_state_add todo "task-${task_num}:${test_file}"
+
+  # Output confirmation
+  hook_context "TODO:BACKLOG[task-${task_num}] injected into ${test_file}. Remove this marker as you implement the task."
 }
-EOF
 
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_todo_injector
+fi
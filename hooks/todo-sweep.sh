@@ -4,57 +4,114 @@
 # Purpose: Final gate to catch incomplete tasks before claiming verification complete
 #
 # Warns (non-blocking) if any TODO:BACKLOG[task-N] markers remain in codebase
+#
+# Only files recorded in the session state's todo ledger are checked, so the
+# cost scales with the number of injected markers. The whole tree is scanned
+# when the ledger is empty or WORKFLOW_TODO_SWEEP=full is set; inside a git
+# work tree that scan honours .gitignore, elsewhere it falls back to grep -r.
 
 set -euo pipefail
 
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-
-# Check for workflow skip
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-[[ -f "$SKIP_FILE" ]] && { echo '{}'; exit 0; }
-
-# Search for remaining TODO:BACKLOG markers in codebase
-# Exclude common non-source directories
-REMAINING=$(grep -rn "TODO:BACKLOG\[task-" . \
-    --include="*.py" --include="*.js" --include="*.ts" \
-    --include="*.tsx" --include="*.jsx" --include="*.go" \
-    --include="*.rs" --include="*.java" --include="*.rb" \
-    --include="*.c" --include="*.cpp" --include="*.h" \
-    --include="*.sh" --include="*.swift" --include="*.kt" \
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+
+TODO_PATTERN='TODO:BACKLOG\[task-'
+
+# Print remaining markers in the files listed in the ledger (file:line:text)
+_todo_sweep_ledger() {
+  local entry path files=() seen=$'\n'
+  while IFS= read -r entry; do
+    # Entries look like task-N:path or task-N:path:pending
+    [[ "$entry" == task-*:* ]] || continue
+    path="${entry#*:}"
+    path="${path%:pending}"
+    [[ -f "$path" && "$seen" != *$'\n'"$path"$'\n'* ]] || continue
+    seen+="${path}"$'\n'
+    files+=("$path")
+  done <<< "$1"
+
+  [[ ${#files[@]} -gt 0 ]] || return 0
+  grep -Hn "$TODO_PATTERN" -- "${files[@]}" 2>/dev/null || true
+}
+
+# Source file types searched by the full-tree scan
+TODO_SWEEP_GLOBS=(
+  "*.py" "*.js" "*.ts" "*.tsx" "*.jsx" "*.go" "*.rs" "*.java" "*.rb"
+  "*.c" "*.cpp" "*.h" "*.sh" "*.swift" "*.kt"
+)
+
+# Print remaining markers in tracked and untracked-but-not-ignored files.
+# git grep lists candidates from the index and skips ignored trees without
+# reading them, and searches with multiple threads. Fails outside a work tree.
+_todo_sweep_git() {
+  local rc=0
+  git grep -n -I --untracked -e "$TODO_PATTERN" -- "${TODO_SWEEP_GLOBS[@]}" 2>/dev/null || rc=$?
+  # 1 means no matches; anything else means git could not search here
+  [[ $rc -le 1 ]]
+}
+
+# Print remaining markers with a recursive grep (non-git directories)
+_todo_sweep_grep() {
+  local includes=() glob
+  for glob in "${TODO_SWEEP_GLOBS[@]}"; do
+    includes+=("--include=${glob}")
+  done
+  # Exclude common non-source directories
+  grep -rn "$TODO_PATTERN" . "${includes[@]}" \
     --exclude-dir=".venv" --exclude-dir="venv" \
     --exclude-dir="node_modules" --exclude-dir=".git" \
     --exclude-dir="build" --exclude-dir="dist" \
     --exclude-dir=".pytest_cache" --exclude-dir="__pycache__" \
     --exclude-dir=".mypy_cache" --exclude-dir=".ruff_cache" \
-    2>/dev/null || true)
+    2>/dev/null || true
+}
 
-if [[ -n "$REMAINING" ]]; then
-  COUNT=$(echo "$REMAINING" | wc -l)
-  # Extract unique files with line numbers
-  FILES_INFO=$(echo "$REMAINING" | head -5 | sed 's/:.*TODO:BACKLOG/: TODO:BACKLOG/' | tr '\n' '; ' | sed 's/; $//')
+# Print remaining markers anywhere under the working directory
+_todo_sweep_tree() {
+  local found
+  if found=$(_todo_sweep_git); then
+    [[ -z "$found" ]] || printf '%s\n' "$found"
+  else
+    _todo_sweep_grep
+  fi
+}
+
+check_todo_sweep() {
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
+
+  # Search for remaining TODO:BACKLOG markers
+  local remaining
+  if [[ -n "$WF_TODOS" && "${WORKFLOW_TODO_SWEEP:-}" != "full" ]]; then
+    remaining=$(_todo_sweep_ledger "$WF_TODOS")
+  else
+    remaining=$(_todo_sweep_tree)
+  fi
+
+  if [[ -z "$remaining" ]]; then
+    # All clear - no remaining markers
+    hook_context "TODO:BACKLOG SWEEP: No task markers remain. All injected TODOs have been removed."
+    return 0
+  fi
+
+  # Count markers and list the first five as "file: TODO:BACKLOG[...]"
+  local line count=0 files_info=""
+  while IFS= read -r line; do
+    count=$((count + 1))
+    [[ $count -le 5 ]] || continue
+    files_info="${files_info:+${files_info}; }${line%%:*}: TODO:BACKLOG${line##*TODO:BACKLOG}"
+  done <<< "$remaining"
 
   # Check if there are more than 5
-  if [[ "$COUNT" -gt 5 ]]; then
-    FILES_INFO="${FILES_INFO}; ... and $((COUNT - 5)) more"
+  if [[ "$count" -gt 5 ]]; then
+    files_info="${files_info}; ... and $((count - 5)) more"
   fi
 
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "TODO:BACKLOG WARNING: ${COUNT} task marker(s) remain in codebase. These indicate incomplete tasks: ${FILES_INFO}. Review implementations and ensure markers are removed before claiming verification complete."
-  }
-}
-EOF
-else
-  # All clear - no remaining markers
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "TODO:BACKLOG SWEEP: No task markers remain. All injected TODOs have been removed."
-  }
+  hook_context "TODO:BACKLOG WARNING: ${count} task marker(s) remain in codebase. These indicate incomplete tasks: ${files_info}. Review implementations and ensure markers are removed before claiming verification complete."
 }
-EOF
-fi
 
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_todo_sweep
+fi
@@ -5,108 +5,143 @@
 
 set -euo pipefail
 
-TOOL_NAME="${CLAUDE_TOOL_NAME:-}"
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-
-# Only check Task tool calls
-if [[ "$TOOL_NAME" != "Task" ]]; then
-  echo '{}'
-  exit 0
-fi
-
-# Check for subagent_type parameter indicating this is a subagent dispatch
-if ! echo "$TOOL_INPUT" | grep -qE '"subagent_type"'; then
-  echo '{}'
-  exit 0
-fi
-
-# Check for code-implementer, spec-reviewer, or quality-reviewer dispatch
-if ! echo "$TOOL_INPUT" | grep -qE '(code-implementer|spec-reviewer|quality-reviewer)'; then
-  echo '{}'
-  exit 0
-fi
-
-# Check for required task description sections in the prompt
-MISSING_CORE=""
-MISSING_ENHANCED=""
-
-# Core sections (highly recommended)
-if ! echo "$TOOL_INPUT" | grep -qiE '(##\s*Task:|Task:|### Task)'; then
-  MISSING_CORE="${MISSING_CORE}Task header, "
-fi
-
-if ! echo "$TOOL_INPUT" | grep -qiE '(##\s*Context|### Context|context:)'; then
-  MISSING_CORE="${MISSING_CORE}Context section, "
-fi
-
-if ! echo "$TOOL_INPUT" | grep -qiE '(##\s*Requirements|### Requirements|requirements:)'; then
-  MISSING_CORE="${MISSING_CORE}Requirements section, "
-fi
-
-if ! echo "$TOOL_INPUT" | grep -qiE '(success criteria|##\s*Success|### Success)'; then
-  MISSING_CORE="${MISSING_CORE}Success Criteria, "
-fi
-
-# Enhanced sections (recommended for better subagent performance)
-if ! echo "$TOOL_INPUT" | grep -qiE '(##\s*Purpose|### Purpose|purpose:)'; then
-  MISSING_ENHANCED="${MISSING_ENHANCED}Purpose (WHY task matters), "
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
 fi
 
-if ! echo "$TOOL_INPUT" | grep -qiE '(environment|verification|##\s*Environment|### Environment)'; then
-  MISSING_ENHANCED="${MISSING_ENHANCED}Environment Verification, "
-fi
-
-if ! echo "$TOOL_INPUT" | grep -qiE '(failure mode|potential failure|##\s*Failure|### Failure|what could go wrong)'; then
-  MISSING_ENHANCED="${MISSING_ENHANCED}Potential Failure Modes, "
-fi
+# Sections a subagent prompt should carry, as "<kind>:<label>:<pattern>".
+# kind is core (highly recommended) or enhanced (recommended for better
+# subagent performance); label is how a missing section is reported;
+# pattern is an extended regex matched case-insensitively against each
+# line of the prompt. Lines from the file named by WORKFLOW_TASK_SECTIONS
+# (same format, # comments allowed) are added to these.
+TASK_SECTIONS=(
+  'core:Task header:(##[[:space:]]*Task([[:space:]]+[0-9]+)?:|Task:|### Task)'
+  'core:Context section:(##[[:space:]]*Context|### Context|context:)'
+  'core:Requirements section:(##[[:space:]]*Requirements|### Requirements|requirements:)'
+  'core:Success Criteria:(success criteria|##[[:space:]]*Success|### Success)'
+  'enhanced:Purpose (WHY task matters):(##[[:space:]]*Purpose|### Purpose|purpose:)'
+  'enhanced:Environment Verification:(environment|verification|##[[:space:]]*Environment|### Environment)'
+  'enhanced:Potential Failure Modes:(failure mode|potential failure|##[[:space:]]*Failure|### Failure|what could go wrong)'
+  'enhanced:Required Skills:(required skill|##[[:space:]]*Skills|### Skills|skill.*consult)'
+)
+
+# Labels of the sections the last task_sections_scan found, in table order
+TASK_SECTIONS_FOUND=()
+TASK_SECTIONS_MISSING=()
+
+# Find every section of TASK_SECTIONS (plus WORKFLOW_TASK_SECTIONS) in
+# TOOL_INPUT with one awk pass: each line is tested against the sections
+# not found yet, and reading stops once all are found, so adding a section
+# adds a pattern test per line rather than another pass over the prompt.
+# Sets TASK_SECTIONS_FOUND and TASK_SECTIONS_MISSING to "<kind>:<label>"
+# entries in table order.
+task_sections_scan() {
+  local sections=("${TASK_SECTIONS[@]}") line table="" state entry
+  if [[ -n "${WORKFLOW_TASK_SECTIONS:-}" && -r "$WORKFLOW_TASK_SECTIONS" ]]; then
+    while IFS= read -r line || [[ -n "$line" ]]; do
+      [[ "$line" == *:*:* && "$line" != \#* ]] && sections+=("$line")
+    done < "$WORKFLOW_TASK_SECTIONS"
+  fi
+  printf -v table '%s\n' "${sections[@]}"
+
+  TASK_SECTIONS_FOUND=()
+  TASK_SECTIONS_MISSING=()
+  while IFS=$'\t' read -r state entry; do
+    if [[ "$state" == found ]]; then
+      TASK_SECTIONS_FOUND+=("$entry")
+    else
+      TASK_SECTIONS_MISSING+=("$entry")
+    fi
+  done < <(TASK_SECTION_TABLE="$table" LC_ALL=C awk '
+    BEGIN {
+      # The prompt usually arrives JSON-encoded: split on its \n escapes too
+      RS = "\n|\\\\n"
+      n = split(ENVIRON["TASK_SECTION_TABLE"], rows, "\n")
+      for (i = 1; i <= n; i++) {
+        if (rows[i] == "") continue
+        first = index(rows[i], ":")
+        rest = substr(rows[i], first + 1)
+        second = index(rest, ":")
+        count++
+        name[count] = substr(rows[i], 1, first + second - 1)
+        pattern[count] = tolower(substr(rest, second + 1))
+      }
+      left = count
+      if (!left) exit
+    }
+    {
+      line = tolower($0)
+      for (i = 1; i <= count; i++) {
+        if (!(i in seen) && line ~ pattern[i]) {
+          seen[i] = 1
+          if (--left == 0) exit
+        }
+      }
+    }
+    END {
+      for (i = 1; i <= count; i++) printf "%s\t%s\n", (i in seen ? "found" : "missing"), name[i]
+    }
+  ' <<< "$TOOL_INPUT")
+}
 
-if ! echo "$TOOL_INPUT" | grep -qiE '(required skill|##\s*Skills|### Skills|skill.*consult)'; then
-  MISSING_ENHANCED="${MISSING_ENHANCED}Required Skills, "
-fi
+check_validate_task_description() {
+  # Only check Task tool calls
+  [[ "$TOOL_NAME" == "Task" ]] || return 0
+
+  # Check for subagent_type parameter indicating this is a subagent dispatch
+  [[ "$TOOL_INPUT" == *'"subagent_type"'* ]] || return 0
+
+  # Check for code-implementer, spec-reviewer, or quality-reviewer dispatch
+  [[ "$TOOL_INPUT" =~ (code-implementer|spec-reviewer|quality-reviewer) ]] || return 0
+
+  # Check for required task description sections in the prompt
+  local missing_core="" missing_enhanced="" entry
+  task_sections_scan
+  for entry in ${TASK_SECTIONS_MISSING[@]+"${TASK_SECTIONS_MISSING[@]}"}; do
+    case "$entry" in
+      core:*) missing_core="${missing_core}${entry#core:}, " ;;
+      *) missing_enhanced="${missing_enhanced}${entry#*:}, " ;;
+    esac
+  done
+
+  # Three-stage dispatch reminder (always included for subagent dispatches)
+  local three_stage_reminder="REMINDER: Every task requires THREE dispatches: code-implementer -> spec-reviewer -> quality-reviewer. Skipping reviewers is not optimization."
+  if [[ "${WORKFLOW_REVIEW_MODE:-}" == "parallel" ]]; then
+    three_stage_reminder="REMINDER: Every task requires THREE dispatches: code-implementer, then spec-reviewer and quality-reviewer in parallel, both given the same 'Review commit: <sha>'. Skipping reviewers is not optimization."
+  fi
 
-# Three-stage dispatch reminder (always included for subagent dispatches)
-THREE_STAGE_REMINDER="REMINDER: Every task requires THREE dispatches: code-implementer -> spec-reviewer -> quality-reviewer. Skipping reviewers is not optimization."
+  # Build warning message
+  local warning_msg=""
 
-# Build warning message
-WARNING_MSG=""
+  if [[ -n "$missing_core" ]]; then
+    missing_core="${missing_core%, }"
+    warning_msg="TASK DESCRIPTION WARNING: Missing core sections: ${missing_core}. "
+  fi
 
-if [[ -n "$MISSING_CORE" ]]; then
-  MISSING_CORE="${MISSING_CORE%, }"
-  WARNING_MSG="TASK DESCRIPTION WARNING: Missing core sections: ${MISSING_CORE}. "
-fi
+  if [[ -n "$missing_enhanced" ]]; then
+    missing_enhanced="${missing_enhanced%, }"
+    if [[ -n "$warning_msg" ]]; then
+      warning_msg="${warning_msg}Also missing enhanced sections: ${missing_enhanced}. "
+    else
+      warning_msg="TASK DESCRIPTION SUGGESTION: Consider adding enhanced sections: ${missing_enhanced}. "
+    fi
+  fi
 
-if [[ -n "$MISSING_ENHANCED" ]]; then
-  MISSING_ENHANCED="${MISSING_ENHANCED%, }"
-  if [[ -n "$WARNING_MSG" ]]; then
-    WARNING_MSG="${WARNING_MSG}Also missing enhanced sections: ${MISSING_ENHANCED}. "
-  else
-    WARNING_MSG="TASK DESCRIPTION SUGGESTION: Consider adding enhanced sections: ${MISSING_ENHANCED}. "
+  if [[ -n "$warning_msg" ]]; then
+    hook_context "${warning_msg}Per orchestrating-subagents skill, complete task descriptions improve subagent performance. ${three_stage_reminder}"
+    return 0
   fi
-fi
 
-if [[ -n "$WARNING_MSG" ]]; then
-  WARNING_MSG="${WARNING_MSG}Per orchestrating-subagents skill, complete task descriptions improve subagent performance. ${THREE_STAGE_REMINDER}"
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "${WARNING_MSG}"
-  }
+  # All sections present - still include three-stage reminder for code-implementer
+  local agent
+  hook_subagent_type agent
+  if [[ "$agent" == "code-implementer" ]]; then
+    hook_context "$three_stage_reminder"
+  fi
 }
-EOF
-  exit 0
-fi
 
-# All sections present - still include three-stage reminder for code-implementer
-if echo "$TOOL_INPUT" | grep -qE 'code-implementer'; then
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "${THREE_STAGE_REMINDER}"
-  }
-}
-EOF
-  exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_validate_task_description
 fi
-
-echo '{}'
-exit 0
@@ -4,21 +4,19 @@
 
 set -euo pipefail
 
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+
+check_verify_before_commit() {
+  # Not a git commit - no action needed
+  [[ "$TOOL_INPUT" =~ git[[:space:]]+commit ]] || return 0
 
-# Check if this is a git commit command
-if echo "$TOOL_INPUT" | grep -qE "git\s+commit"; then
   # Output a reminder - this adds context, doesn't block
-  cat <<'EOF'
-{
-  "hookSpecificOutput": {
-    "additionalContext": "VERIFICATION REMINDER: Before committing, ensure you have run /verify and confirmed all tests, linter, and build pass. The verification skill requires evidence before claims - 'should pass' is not sufficient."
-  }
+  hook_context "VERIFICATION REMINDER: Before committing, ensure you have run /verify and confirmed all tests, linter, and build pass. The verification skill requires evidence before claims - 'should pass' is not sufficient."
 }
-EOF
-  exit 0
-fi
 
-# Not a git commit - no action needed
-echo '{}'
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_verify_before_commit
+fi
@@ -3,64 +3,50 @@
 # Compares completed tasks against expected count from backlog.
 #
 # Fires when: Skill tool is called with verification|verify pattern
-# Reads: .expected_task_count from session state
+# Reads: expected task count from session state, completion state from the
+#        shared backlog index (lib/backlog-index.sh)
 # Warns: If completed tasks don't match expected (doesn't block)
 
 set -euo pipefail
 
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-
-# Check for workflow skip
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-[[ -f "$SKIP_FILE" ]] && { echo '{}'; exit 0; }
-
-# Check if we have an expected task count
-EXPECTED_FILE="${SESSION_DIR}/.expected_task_count"
-[[ ! -f "$EXPECTED_FILE" ]] && { echo '{}'; exit 0; }
-
-EXPECTED_COUNT=$(cat "$EXPECTED_FILE" 2>/dev/null || echo "0")
-[[ "$EXPECTED_COUNT" -eq 0 ]] && { echo '{}'; exit 0; }
-
-# Try to count completed tasks from backlog (if marked with [COMPLETED])
-BACKLOG_PATH=""
-if [[ -f "${SESSION_DIR}/.backlog_path" ]]; then
-  BACKLOG_PATH=$(cat "${SESSION_DIR}/.backlog_path" 2>/dev/null || echo "")
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
 fi
-
-COMPLETED_COUNT=0
-if [[ -n "$BACKLOG_PATH" ]] && [[ -f "$BACKLOG_PATH" ]]; then
-  # Count tasks marked as completed
-  COMPLETED_COUNT=$(grep -cE '^\[COMPLETED\]|## Task.*\[COMPLETED\]|### Task.*\[COMPLETED\]' "$BACKLOG_PATH" 2>/dev/null || echo "0")
+if [[ -z "${_WORKFLOW_BACKLOG_INDEX:-}" ]]; then
+  # shellcheck source=lib/backlog-index.sh
+  source "${HOOKS_DIR}/lib/backlog-index.sh"
 fi
 
-# Generate output
-if [[ "$COMPLETED_COUNT" -eq 0 ]]; then
-  # Can't determine completed count from backlog - just provide info
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "TASK COUNT REMINDER: Expected $EXPECTED_COUNT tasks from backlog. Ensure all tasks were completed before proceeding with verification. Unable to auto-detect completion status from backlog."
-  }
+check_verify_task_count() {
+  # Check for workflow skip
+  [[ -z "$WF_SKIP" ]] || return 0
+
+  # Check if we have an expected task count
+  local expected_count="$WF_EXPECTED_TASKS"
+  [[ "$expected_count" =~ ^[0-9]+$ ]] || expected_count=0
+  [[ "$expected_count" -ne 0 ]] || return 0
+
+  # Try to count completed tasks from backlog (if marked with [COMPLETED])
+  local backlog_path="$WF_BACKLOG_PATH"
+
+  local completed_count=0
+  if [[ -n "$backlog_path" ]] && backlog_index_load "$backlog_path"; then
+    completed_count="$BACKLOG_COMPLETED_COUNT"
+  fi
+
+  # Generate output
+  if [[ "$completed_count" -eq 0 ]]; then
+    # Can't determine completed count from backlog - just provide info
+    hook_context "TASK COUNT REMINDER: Expected $expected_count tasks from backlog. Ensure all tasks were completed before proceeding with verification. Unable to auto-detect completion status from backlog."
+  elif [[ "$completed_count" -lt "$expected_count" ]]; then
+    local missing=$((expected_count - completed_count))
+    hook_context "TASK COUNT WARNING: Only $completed_count of $expected_count tasks marked complete. $missing tasks may be missing. Please verify all backlog tasks were implemented before proceeding."
+  else
+    hook_context "TASK COUNT VERIFIED: All $expected_count tasks appear to be complete."
+  fi
 }
-EOF
-elif [[ "$COMPLETED_COUNT" -lt "$EXPECTED_COUNT" ]]; then
-  MISSING=$((EXPECTED_COUNT - COMPLETED_COUNT))
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "TASK COUNT WARNING: Only $COMPLETED_COUNT of $EXPECTED_COUNT tasks marked complete. $MISSING tasks may be missing. Please verify all backlog tasks were implemented before proceeding."
-  }
-}
-EOF
-else
-  cat <<EOF
-{
-  "hookSpecificOutput": {
-    "additionalContext": "TASK COUNT VERIFIED: All $EXPECTED_COUNT tasks appear to be complete."
-  }
-}
-EOF
-fi
 
-exit 0
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_verify_task_count
+fi
@@ -4,27 +4,26 @@
 
 set -euo pipefail
 
-TOOL_INPUT="${CLAUDE_TOOL_INPUT:-}"
-
-# Check if this is a workflow skip command
-if ! echo "$TOOL_INPUT" | grep -qiE "workflow.*skip"; then
-  echo '{}'
-  exit 0
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
 fi
 
-# Create session directory if needed
-SESSION_DIR="${CLAUDE_SESSION_DIR:-${TMPDIR:-/tmp}/claude-session}"
-mkdir -p "$SESSION_DIR"
+check_workflow_skip_set() {
+  # Check if this is a workflow skip command
+  shopt -s nocasematch
+  if [[ ! "$TOOL_INPUT" =~ workflow.*skip ]]; then
+    shopt -u nocasematch
+    return 0
+  fi
+  shopt -u nocasematch
 
-# Create skip marker
-SKIP_FILE="${SESSION_DIR}/.workflow_skip"
-touch "$SKIP_FILE"
+  # Record skip marker
+  hook_state_set skip 1
 
-cat <<'EOF'
-{
-  "hookSpecificOutput": {
-    "additionalContext": "WORKFLOW ENFORCEMENT SKIPPED: All workflow checks bypassed for this session. Remember: TDD, feature branches, and verification exist to prevent bugs and maintain code quality. Use /workflow reset to re-enable enforcement."
-  }
+  hook_context "WORKFLOW ENFORCEMENT SKIPPED: All workflow checks bypassed for this session. Remember: TDD, feature branches, and verification exist to prevent bugs and maintain code quality. Use /workflow reset to re-enable enforcement."
 }
-EOF
-exit 0
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  hook_main check_workflow_skip_set
+fi
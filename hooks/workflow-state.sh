@@ -0,0 +1,64 @@
+#!/usr/bin/env bash
+# Session state CLI for /workflow and manual inspection
+# Usage: workflow-state.sh get <key>
+#        workflow-state.sh set <key> [<value>]   (empty value removes the key)
+#        workflow-state.sh add <key> <value>     (list keys: dispatch, needs_refix, reviewed, todo)
+#        workflow-state.sh del <key> <pattern>   (e.g. del dispatch 'task-3:*')
+#        workflow-state.sh reset
+#        workflow-state.sh dump
+#
+# Goes through lib/state.sh, so writes take the same lock as the hooks and
+# state from earlier plugin versions is migrated on first use.
+
+set -euo pipefail
+
+if [[ -z "${_WORKFLOW_HOOK_COMMON:-}" ]]; then
+  # shellcheck source=lib/common.sh
+  source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib/common.sh"
+fi
+
+workflow_state_main() {
+  local command="${1:-dump}" record
+  hook_load_state
+  case "$command" in
+    get)
+      [[ $# -eq 2 ]] || { echo "usage: workflow-state.sh get <key>" >&2; return 2; }
+      for record in ${_HOOK_STATE_RECORDS[@]+"${_HOOK_STATE_RECORDS[@]}"}; do
+        if [[ "${record%%$'\t'*}" == "$2" ]]; then
+          printf '%s\n' "${record#*$'\t'}"
+        fi
+      done
+      ;;
+    set)
+      [[ $# -ge 2 && $# -le 3 ]] || { echo "usage: workflow-state.sh set <key> [<value>]" >&2; return 2; }
+      hook_state_set "$2" "${3:-}"
+      hook_state_commit
+      ;;
+    add)
+      [[ $# -eq 3 ]] || { echo "usage: workflow-state.sh add <key> <value>" >&2; return 2; }
+      hook_state_add "$2" "$3"
+      hook_state_commit
+      ;;
+    del)
+      [[ $# -eq 3 ]] || { echo "usage: workflow-state.sh del <key> <pattern>" >&2; return 2; }
+      hook_state_del "$2" "$3"
+      hook_state_commit
+      ;;
+    reset)
+      hook_state_reset
+      ;;
+    dump)
+      for record in ${_HOOK_STATE_RECORDS[@]+"${_HOOK_STATE_RECORDS[@]}"}; do
+        printf '%s\n' "$record"
+      done
+      ;;
+    *)
+      echo "workflow-state.sh: unknown command: ${command}" >&2
+      return 2
+      ;;
+  esac
+}
+
+if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
+  workflow_state_main "$@"
+fi
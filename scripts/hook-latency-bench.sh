@@ -0,0 +1,83 @@
+#!/bin/bash
+# Benchmark hook latency with and without the resident hook daemon
+# Usage: ./scripts/hook-latency-bench.sh [iterations]
+# Example: ./scripts/hook-latency-bench.sh 200
+#
+# Runs a mix of hook events through run-hook.cmd in a throwaway git repo and
+# session directory, first spawning dispatch.sh per call, then forwarding to
+# hook-daemon.sh. Prints p50/p99 wall-clock latency per mode in milliseconds.
+
+set -e
+
+ITERATIONS="${1:-100}"
+
+if [[ -z "${EPOCHREALTIME:-}" ]]; then
+  echo "Error: bash 5 or newer is required (EPOCHREALTIME)"
+  exit 1
+fi
+
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+RUNNER="${ROOT}/hooks/run-hook.cmd"
+WORK="$(mktemp -d)"
+trap '"${ROOT}/hooks/hook-daemon.sh" stop > /dev/null 2>&1 || true; rm -rf "$WORK"' EXIT
+
+export CLAUDE_SESSION_DIR="${WORK}/session"
+mkdir -p "$CLAUDE_SESSION_DIR"
+echo "implementing" > "${CLAUDE_SESSION_DIR}/.workflow_phase"
+
+cd "$WORK"
+git init -q
+git checkout -q -b feat/bench
+
+# Representative events: "<tool name>|<event>|<matcher>|<tool input>"
+EVENTS=(
+  'Write|PostToolUse|Write|Edit|{"file_path": "src/app.py"}'
+  'Bash|PreToolUse|Bash|{"command": "ls"}'
+  'Task|PreToolUse|Task|{"subagent_type": "spec-reviewer"}'
+  'TodoWrite|PostToolUse|TodoWrite|{"todos": [{"status": "in_progress"}]}'
+)
+
+# Time ITERATIONS passes over EVENTS; prints one latency (microseconds) per call
+run_events() {
+  local i event tool rest hook_event matcher input start end
+  for (( i = 0; i < ITERATIONS; i++ )); do
+    for event in "${EVENTS[@]}"; do
+      tool="${event%%|*}"
+      rest="${event#*|}"
+      hook_event="${rest%%|*}"
+      rest="${rest#*|}"
+      input="${rest##*|}"
+      matcher="${rest%|*}"
+      start="${EPOCHREALTIME/./}"
+      CLAUDE_TOOL_NAME="$tool" CLAUDE_TOOL_INPUT="$input" \
+        "$RUNNER" dispatch.sh "$hook_event" "$matcher" > /dev/null
+      end="${EPOCHREALTIME/./}"
+      echo $((end - start))
+    done
+  done
+}
+
+# Print "p50 p99" in milliseconds for latencies on stdin
+percentiles() {
+  sort -n | awk '
+    { v[NR] = $1 }
+    END {
+      p50 = v[int((NR - 1) * 0.50) + 1]
+      p99 = v[int((NR - 1) * 0.99) + 1]
+      printf "%8.2f %8.2f %8d\n", p50 / 1000, p99 / 1000, NR
+    }'
+}
+
+printf '%-10s %8s %8s %8s\n' "mode" "p50 ms" "p99 ms" "calls"
+
+printf '%-10s ' "spawn"
+run_events | percentiles
+
+"${ROOT}/hooks/hook-daemon.sh" start
+for _ in 1 2 3 4 5 6 7 8 9 10; do
+  "${ROOT}/hooks/hook-daemon.sh" status > /dev/null && break
+  sleep 0.1
+done
+
+printf '%-10s ' "daemon"
+run_events | percentiles
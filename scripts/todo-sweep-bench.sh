@@ -0,0 +1,71 @@
+#!/bin/bash
+# Benchmark the TODO:BACKLOG full-tree sweep backends on a synthetic repository
+# Usage: ./scripts/todo-sweep-bench.sh [total-files]
+# Example: ./scripts/todo-sweep-bench.sh 100000
+#
+# Builds a throwaway git repo where about a tenth of the files are tracked
+# sources and the rest sit in ignored generated trees (node_modules, target,
+# .next, coverage), then times git grep against the recursive grep fallback.
+
+set -e
+
+TOTAL="${1:-100000}"
+
+if [[ -z "${EPOCHREALTIME:-}" ]]; then
+  echo "Error: bash 5 or newer is required (EPOCHREALTIME)"
+  exit 1
+fi
+
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+WORK="$(mktemp -d)"
+trap 'rm -rf "$WORK"' EXIT
+
+# Fill DIR with COUNT small source files spread over subdirectories
+make_files() {
+  local dir="$1" count="$2" ext="$3" i sub
+  for (( i = 0; i < count; i++ )); do
+    sub="${dir}/d$((i / 500))"
+    [[ -d "$sub" ]] || mkdir -p "$sub"
+    printf 'def f%d():\n    return %d\n' "$i" "$i" > "${sub}/f${i}.${ext}"
+  done
+}
+
+echo "Building synthetic repository with ${TOTAL} files..."
+cd "$WORK"
+git init -q
+printf 'node_modules/\ntarget/\n.next/\ncoverage/\n' > .gitignore
+
+tracked=$((TOTAL / 10))
+make_files src "$tracked" py
+make_files node_modules $((TOTAL * 6 / 10)) js
+make_files target $((TOTAL * 15 / 100)) rs
+make_files .next $((TOTAL / 10)) js
+make_files coverage $((TOTAL - tracked - TOTAL * 6 / 10 - TOTAL * 15 / 100 - TOTAL / 10)) js
+
+# A few live markers in tracked sources
+for i in 1 2 3; do
+  printf '# TODO:BACKLOG[task-%d]: See backlog for requirements\n' "$i" >> "src/d0/f${i}.py"
+done
+git add -A
+git -c user.name=bench -c user.email=bench@example.com commit -q -m "synthetic tree"
+
+# shellcheck source=../hooks/todo-sweep.sh
+source "${ROOT}/hooks/todo-sweep.sh"
+
+# Print "<ms> <markers>" for one backend
+time_backend() {
+  local start end found
+  start="${EPOCHREALTIME/./}"
+  found=$("$1" || true)
+  end="${EPOCHREALTIME/./}"
+  printf '%8.1f %8d\n' "$(( (end - start) / 1000 )).$(( (end - start) / 100 % 10 ))" \
+    "$(grep -c 'TODO:BACKLOG' <<< "$found" || true)"
+}
+
+printf '%-10s %8s %8s\n' "backend" "ms" "markers"
+for backend in _todo_sweep_git _todo_sweep_grep; do
+  # Warm the page cache once, then measure
+  "$backend" > /dev/null || true
+  printf '%-10s ' "${backend#_todo_sweep_}"
+  time_backend "$backend"
+done
@@ -0,0 +1,147 @@
+"""Fixtures for the hook benchmark suite.
+
+Opt-in: every test here is skipped unless WORKFLOW_BENCHMARKS=1.
+
+Settings (environment variables):
+    WORKFLOW_BENCH_MAX_FILES   largest synthetic repository to build (10000);
+                               set 100000 for the full matrix
+    WORKFLOW_BENCH_ROUNDS      timed runs per case, the median is kept (9)
+    WORKFLOW_BENCH_THRESHOLD   allowed slowdown against the baseline (1.5)
+    WORKFLOW_BENCH_UPDATE=1    record the measured medians as the new
+                               baseline instead of comparing
+
+Baselines are machine-specific, so none are committed: the first run on a
+machine records each case's median in pytest's cache (.pytest_cache, key
+BASELINE_KEY) and later runs compare against it.
+"""
+
+import os
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from ..conftest import git
+
+BASELINE_KEY = "workflow/bench-baseline"
+
+ENABLED = os.environ.get("WORKFLOW_BENCHMARKS") == "1"
+
+# Slack below which a slowdown is treated as noise, whatever the ratio
+NOISE_FLOOR_MS = 5.0
+
+Bench = Callable[[Callable[[], object]], float]
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+@pytest.fixture(autouse=True)
+def _benchmarks_opt_in() -> None:
+    if not ENABLED:
+        pytest.skip("hook benchmarks are opt-in: set WORKFLOW_BENCHMARKS=1")
+
+
+def build_repo(root: Path, files: int) -> Path:
+    """A committed repository of `files` small sources on a feature branch.
+
+    Sources go 500 to a directory, split between src/ and tests/; the last
+    tenth of the sources carry a TODO:BACKLOG marker for the sweep.
+    """
+    root.mkdir(parents=True)
+    for i in range(files):
+        top = "tests" if i % 4 == 0 else "src"
+        name = f"test_m{i}.py" if top == "tests" else f"m{i}.py"
+        path = root / top / f"d{i // 500}" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        marker = f"# TODO:BACKLOG[task-{i}]\n" if i >= files - files // 10 else ""
+        path.write_text(f"{marker}def f{i}():\n    return {i}\n")
+    git(root, "init", "-q", "-b", "main")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "synthetic")
+    git(root, "checkout", "-q", "-b", "feat/1-bench")
+    return root
+
+
+def build_backlog(path: Path, tasks: int) -> Path:
+    """A backlog of `tasks` well-formed tasks, the first half completed."""
+    fence = "```"
+    parts = ["# Synthetic Backlog\n\n"]
+    for n in range(1, tasks + 1):
+        done = " [COMPLETED]" if n <= tasks // 2 else ""
+        parts.append(
+            f"## Task {n}: Component {n}{done}\n\n"
+            f"**Files:**\n- Create: `src/c{n}.py`\n- Test: `tests/test_c{n}.py`\n\n"
+            f"{fence}python\ndef test_c{n}():\n    assert c{n}() == {n}\n{fence}\n\n"
+            f"Run: `pytest tests/test_c{n}.py -v`\n\n"
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(parts))
+    return path
+
+
+@pytest.fixture(scope="session")
+def synthetic_repo(tmp_path_factory: pytest.TempPathFactory) -> Callable[[int], Path]:
+    """Return a builder for cached synthetic repositories, by file count."""
+    repos: dict[int, Path] = {}
+
+    def _repo(files: int) -> Path:
+        if files > env_int("WORKFLOW_BENCH_MAX_FILES", 10_000):
+            pytest.skip(f"{files} files exceeds WORKFLOW_BENCH_MAX_FILES")
+        if files not in repos:
+            repos[files] = build_repo(tmp_path_factory.mktemp("repo") / f"r{files}", files)
+        return repos[files]
+
+    return _repo
+
+
+@pytest.fixture(scope="session")
+def _baseline(pytestconfig: pytest.Config) -> Iterator[dict[str, float]]:
+    """This machine's baseline medians, by test name.
+
+    Cases measured for the first time (all of them on update) are added at
+    the end of the session.
+    """
+    cache = getattr(pytestconfig, "cache", None)
+    baseline: dict[str, float] = cache.get(BASELINE_KEY, {}) if cache else {}
+    recorded = dict(baseline)
+    yield recorded
+    if cache and recorded != baseline:
+        cache.set(BASELINE_KEY, dict(sorted(recorded.items())))
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest, _baseline: dict[str, float]) -> Bench:
+    """Time a callable and compare its median against this machine's baseline.
+
+    One untimed warm-up run fills caches the way an ongoing session would.
+    Fails when the median exceeds baseline * threshold by more than the
+    noise floor; a case without a baseline records its median instead.
+    """
+
+    def _bench(fn: Callable[[], object]) -> float:
+        fn()
+        samples = []
+        for _ in range(env_int("WORKFLOW_BENCH_ROUNDS", 9)):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(samples)
+        name = request.node.name
+
+        baseline = _baseline.get(name)
+        if baseline is None or os.environ.get("WORKFLOW_BENCH_UPDATE") == "1":
+            _baseline[name] = round(median, 2)
+            return median
+        threshold = float(os.environ.get("WORKFLOW_BENCH_THRESHOLD", "1.5"))
+        limit = max(baseline * threshold, baseline + NOISE_FLOOR_MS)
+        assert median <= limit, (
+            f"{name}: median {median:.2f} ms exceeds baseline "
+            f"{baseline:.2f} ms x {threshold} (limit {limit:.2f} ms)"
+        )
+        return median
+
+    return _bench
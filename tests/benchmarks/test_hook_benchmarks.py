@@ -0,0 +1,212 @@
+"""Hook latency as repositories, backlogs and tool payloads grow.
+
+Every registered (event, matcher) pair is timed through dispatch.sh, then
+the hooks whose cost depends on input size are timed across synthetic
+repositories (1k-100k files), backlogs (10-1000 tasks) and tool payloads
+up to the 128 KiB a single environment variable can carry.
+"""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import CompletedProcess
+
+import pytest
+
+from ..conftest import git, hook_output
+from ..plugin_model import PluginModel
+from .conftest import ENABLED, Bench, build_backlog
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+
+FILES = [1_000, 10_000, 100_000]
+TASKS = [10, 100, 1_000]
+PAYLOAD_BYTES = [1_024, 32_768, 120_000]
+
+# Tool name and input that get every check of an event past its early exits
+EVENT_INPUTS: dict[str, tuple[str, dict[str, object]]] = {
+    "Bash": ("Bash", {"command": "git commit -m 'feat: bench'"}),
+    "Task": ("Task", {"subagent_type": "code-implementer", "prompt": "Implement ## Task 1"}),
+    "Write|Edit": ("Edit", {"file_path": "src/d0/m1.py"}),
+    "TodoWrite": ("TodoWrite", {"todos": [{"content": "Task 1", "status": "completed"}]}),
+    "ExitPlanMode": ("ExitPlanMode", {"plan": "bench"}),
+}
+
+Dispatch = Callable[..., CompletedProcess[str]]
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Parametrize over the dispatcher registry, read only when benchmarks run."""
+    if {"event", "matcher"} <= set(metafunc.fixturenames):
+        registry = list(PluginModel(HOOKS_DIR.parent).registry) if ENABLED else []
+        metafunc.parametrize(("event", "matcher"), registry, ids=[f"{e}-{m}" for e, m in registry])
+
+
+def padded(text: str, size: int) -> str:
+    """Text padded with filler prose to about `size` bytes."""
+    filler = "Context: the component follows the existing module layout. "
+    return text + "\n\n" + filler * max(0, (size - len(text)) // len(filler))
+
+
+@pytest.fixture
+def session(tmp_path: Path) -> Path:
+    """A session mid-implementation of a 10-task backlog."""
+    session = tmp_path / "session"
+    session.mkdir()
+    backlog = build_backlog(tmp_path / "docs" / "backlogs" / "bench.md", 10)
+    (session / ".workflow_state").write_text(
+        f"phase\timplementing\nbacklog_path\t{backlog}\ndispatch\tcode-implementer\n"
+    )
+    return session
+
+
+@pytest.fixture
+def dispatch(run_hook: Callable[..., CompletedProcess[str]], session: Path) -> Dispatch:
+    """Return a runner for dispatch.sh that fails on a non-zero exit.
+
+    Every response is checked against the hook output schema; the validator
+    is compiled once, so the check adds microseconds to each timed run.
+    """
+
+    def _dispatch(
+        event: str,
+        matcher: str,
+        cwd: Path,
+        tool_name: str,
+        tool_input: str,
+        tool_output: str = "",
+        **env: str,
+    ) -> CompletedProcess[str]:
+        result = run_hook(
+            "dispatch.sh",
+            event,
+            matcher,
+            session_dir=session,
+            cwd=cwd,
+            env=env,
+            tool_name=tool_name,
+            tool_input=tool_input,
+            tool_output=tool_output,
+        )
+        assert result.returncode == 0, result.stderr
+        hook_output(result.stdout)
+        return result
+
+    return _dispatch
+
+
+class TestEveryHook:
+    """Each registered event, with inputs that reach its checks' main paths."""
+
+    def test_event(
+        self, bench: Bench, dispatch: Dispatch, synthetic_repo: Callable[[int], Path],
+        event: str, matcher: str,
+    ) -> None:
+        repo = synthetic_repo(1_000)
+        tool_name, tool_input = EVENT_INPUTS.get(matcher, ("Skill", {"skill": matcher}))
+        payload = json.dumps(tool_input)
+        bench(lambda: dispatch(event, matcher, repo, tool_name, payload))
+
+
+class TestRepositorySize:
+    """Hooks that look at the working tree or the index."""
+
+    @pytest.mark.parametrize("files", FILES)
+    def test_edit_checks(
+        self, bench: Bench, dispatch: Dispatch, synthetic_repo: Callable[[int], Path], files: int
+    ) -> None:
+        repo = synthetic_repo(files)
+        payload = json.dumps({"file_path": "src/d0/m1.py"})
+        bench(lambda: dispatch("PostToolUse", "Write|Edit", repo, "Edit", payload))
+
+    @pytest.mark.parametrize("files", FILES)
+    def test_commit_checks(
+        self, bench: Bench, dispatch: Dispatch, synthetic_repo: Callable[[int], Path], files: int
+    ) -> None:
+        repo = synthetic_repo(files)
+        changed = sorted((repo / "src" / "d0").iterdir())[:20]
+        changed += sorted((repo / "tests" / "d0").iterdir())[:5]
+        for path in changed:
+            path.write_text(path.read_text() + "# changed\n")
+        git(repo, "add", *[str(p) for p in changed])
+        payload = json.dumps({"command": "git commit -m 'feat: bench'"})
+        try:
+            bench(lambda: dispatch("PreToolUse", "Bash", repo, "Bash", payload))
+        finally:
+            git(repo, "reset", "-q", "--hard")
+
+    @pytest.mark.parametrize("files", FILES)
+    def test_full_todo_sweep(
+        self, bench: Bench, dispatch: Dispatch, synthetic_repo: Callable[[int], Path], files: int
+    ) -> None:
+        repo = synthetic_repo(files)
+        payload = json.dumps({"skill": "verification"})
+        bench(lambda: dispatch(
+            "PreToolUse", "Skill.*(verification|verify)", repo, "Skill", payload,
+            WORKFLOW_TODO_SWEEP="full",
+        ))
+
+
+class TestBacklogSize:
+    """Hooks that parse the backlog."""
+
+    @pytest.mark.parametrize("tasks", TASKS)
+    def test_backlog_lint(
+        self, bench: Bench, dispatch: Dispatch, tmp_path: Path, tasks: int
+    ) -> None:
+        backlog = build_backlog(tmp_path / "docs" / "backlogs" / "large.md", tasks)
+        payload = json.dumps({"file_path": str(backlog)})
+        bench(lambda: dispatch("PostToolUse", "Write|Edit", tmp_path, "Write", payload))
+
+    @pytest.mark.parametrize("tasks", TASKS)
+    def test_implement_start(
+        self, bench: Bench, dispatch: Dispatch, session: Path, tmp_path: Path, tasks: int
+    ) -> None:
+        backlog = build_backlog(tmp_path / "docs" / "backlogs" / "large.md", tasks)
+        (session / ".workflow_state").write_text(f"phase\tbacklog-ready\nbacklog_path\t{backlog}\n")
+        payload = json.dumps({"skill": "orchestrating-subagents"})
+        bench(lambda: dispatch(
+            "PreToolUse", "Skill.*(orchestrating|implement)", tmp_path, "Skill", payload
+        ))
+
+    @pytest.mark.parametrize("tasks", TASKS)
+    def test_verify_task_count(
+        self, bench: Bench, dispatch: Dispatch, session: Path, tmp_path: Path, tasks: int
+    ) -> None:
+        backlog = build_backlog(tmp_path / "docs" / "backlogs" / "large.md", tasks)
+        (session / ".workflow_state").write_text(
+            f"phase\timplementing\nbacklog_path\t{backlog}\nexpected_task_count\t{tasks}\n"
+        )
+        payload = json.dumps({"skill": "verification"})
+        bench(lambda: dispatch(
+            "PreToolUse", "Skill.*(verification|verify)", tmp_path, "Skill", payload
+        ))
+
+
+class TestPayloadSize:
+    """Hooks that scan CLAUDE_TOOL_INPUT / CLAUDE_TOOL_OUTPUT."""
+
+    @pytest.mark.parametrize("size", PAYLOAD_BYTES)
+    def test_task_dispatch(
+        self, bench: Bench, dispatch: Dispatch, tmp_path: Path, size: int
+    ) -> None:
+        prompt = padded("## Task 3: Component 3\n\n## Context\n\n## Requirements", size)
+        payload = json.dumps({"subagent_type": "code-implementer", "prompt": prompt})
+        bench(lambda: dispatch("PreToolUse", "Task", tmp_path, "Task", payload))
+
+    @pytest.mark.parametrize("size", PAYLOAD_BYTES)
+    def test_task_result(
+        self, bench: Bench, dispatch: Dispatch, tmp_path: Path, size: int
+    ) -> None:
+        payload = json.dumps({"subagent_type": "code-implementer", "prompt": "## Task 1"})
+        report = padded("Implemented the component.", size) + "\n5 passed in 0.1s\ncommit abc1234"
+        bench(lambda: dispatch("PostToolUse", "Task", tmp_path, "Task", payload, report))
+
+    @pytest.mark.parametrize("size", PAYLOAD_BYTES)
+    def test_todo_update(
+        self, bench: Bench, dispatch: Dispatch, tmp_path: Path, size: int
+    ) -> None:
+        todos = [{"content": f"Task {n}", "status": "pending"} for n in range(size // 64)]
+        todos[-1]["status"] = "completed"
+        payload = json.dumps({"todos": todos})
+        bench(lambda: dispatch("PostToolUse", "TodoWrite", tmp_path, "TodoWrite", payload))
@@ -1,8 +1,92 @@
-"""Shared pytest fixtures for workflow-ecosystem tests."""
+"""Shared pytest fixtures for workflow-ecosystem tests.
 
+Everything a test writes lives under its own tmp_path or under the
+per-process tmp_path_factory base, and hook processes never inherit the
+caller's CLAUDE_* or WORKFLOW_* variables, so the suite can run in
+parallel with pytest-xdist (``uv run --with pytest-xdist pytest -n auto``).
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from functools import cache
 from pathlib import Path
+from typing import Any
 
+import jsonschema
 import pytest
+from jsonschema.protocols import Validator
+
+from .plugin_model import PluginModel
+
+SCHEMAS_DIR = Path(__file__).parent / "schemas"
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+    "GIT_CONFIG_NOSYSTEM": "1",
+    "GIT_CONFIG_GLOBAL": os.devnull,
+}
+
+
+def git(cwd: Path, *args: str) -> None:
+    """Run git in cwd with a fixed identity and no user or system config."""
+    env = {**os.environ, **GIT_IDENTITY}
+    subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True)
+
+
+def clone_tree(src: Path, dst: Path) -> Path:
+    """Copy a directory tree, sharing blocks where the filesystem allows.
+
+    GNU cp clones extents on btrfs/xfs/APFS-style filesystems and copies
+    elsewhere; other platforms fall back to a plain recursive copy.
+    """
+    try:
+        subprocess.run(
+            ["cp", "-a", "--reflink=auto", str(src), str(dst)],
+            check=True,
+            capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        shutil.rmtree(dst, ignore_errors=True)
+        shutil.copytree(src, dst, symlinks=True)
+    return dst
+
+
+@cache
+def schema_validator(name: str) -> Validator:
+    """The validator for tests/schemas/<name>.schema.json, compiled once.
+
+    The schema itself is checked against its metaschema on first use only,
+    so validating many instances costs no more than the checks themselves.
+    """
+    schema = json.loads((SCHEMAS_DIR / f"{name}.schema.json").read_text())
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator: Validator = cls(schema)
+    return validator
+
+
+def hook_output(stdout: str) -> dict[str, Any]:
+    """Parse a hook's stdout and validate it against hook-output.schema.json."""
+    output: dict[str, Any] = json.loads(stdout)
+    schema_validator("hook-output").validate(output)
+    return output
+
+
+def hook_env(env: Mapping[str, str] | None = None) -> dict[str, str]:
+    """The caller's environment without CLAUDE_* and WORKFLOW_* settings."""
+    base = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith(("CLAUDE_", "WORKFLOW_"))
+    }
+    return {**base, **(env or {})}
 
 
 @pytest.fixture
@@ -95,3 +179,187 @@ def expected_hooks() -> list[str]:
         "workflow-phase-check.sh",
         "workflow-skip-set.sh",
     ]
+
+
+@pytest.fixture(scope="session")
+def plugin() -> PluginModel:
+    """Return the parsed plugin model, shared by the whole test session."""
+    return PluginModel(Path(__file__).parent.parent)
+
+
+@pytest.fixture(scope="session")
+def hook_registry(plugin: PluginModel) -> dict[tuple[str, str], list[str]]:
+    """Return the dispatcher registry as {(event, matcher): [script, ...]}."""
+    return plugin.registry
+
+
+@pytest.fixture
+def run_hook(
+    hooks_dir: Path,
+) -> Callable[..., subprocess.CompletedProcess[str]]:
+    """Return a helper that runs a hook script with CLAUDE_* variables set.
+
+    Keyword arguments become CLAUDE_<NAME> variables; ``env`` passes other
+    variables (e.g. WORKFLOW_* settings) through unchanged. Caches go under
+    the session directory unless ``env`` sets XDG_CACHE_HOME.
+    """
+
+    def _run(
+        script: str,
+        *args: str,
+        session_dir: Path,
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        **env_vars: str,
+    ) -> subprocess.CompletedProcess[str]:
+        env = hook_env(env)
+        env["CLAUDE_SESSION_DIR"] = str(session_dir)
+        # Keep hook caches out of the real home directory
+        env.setdefault("XDG_CACHE_HOME", str(session_dir / ".cache"))
+        for name, value in env_vars.items():
+            env[f"CLAUDE_{name.upper()}"] = value
+        return subprocess.run(
+            [str(hooks_dir / script), *args],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=cwd or session_dir,
+        )
+
+    return _run
+
+
+@pytest.fixture
+def session_state() -> Callable[[Path], dict[str, list[str]]]:
+    """Return a reader for the hook state store of a session directory.
+
+    Maps each key of ``.workflow_state`` to its values in file order; scalar
+    keys have a single value, list keys (dispatch, needs_refix, todo) one per
+    entry.
+    """
+
+    def _read(session_dir: Path) -> dict[str, list[str]]:
+        state: dict[str, list[str]] = {}
+        store = session_dir / ".workflow_state"
+        if store.exists():
+            for line in store.read_text().splitlines():
+                key, sep, value = line.partition("\t")
+                if sep:
+                    state.setdefault(key, []).append(value)
+        return state
+
+    return _read
+
+
+@pytest.fixture(scope="session")
+def template_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A committed repository on a feature branch, built once per process.
+
+    Tests get their own copy through ``hook_repo``; never modify this one.
+    """
+    repo = tmp_path_factory.mktemp("template") / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "tests").mkdir()
+    (repo / "README.md").write_text("demo\n")
+    (repo / ".gitignore").write_text("__pycache__/\n")
+    (repo / "src" / "app.py").write_text("def main():\n    return 0\n")
+    (repo / "tests" / "test_app.py").write_text(
+        "from src.app import main\n\n\ndef test_main():\n    assert main() == 0\n"
+    )
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "init")
+    git(repo, "checkout", "-q", "-b", "feat/1-demo")
+    return repo
+
+
+@pytest.fixture
+def hook_repo(template_repo: Path, tmp_path: Path) -> Path:
+    """A private copy of the template repository, on branch feat/1-demo."""
+    return clone_tree(template_repo, tmp_path / "repo")
+
+
+@dataclass(frozen=True)
+class HookCase:
+    """One hook event replayed through dispatch.sh, and what it must produce.
+
+    ``state`` seeds the session's ``.workflow_state`` (list values become one
+    line each) and ``files`` the working tree, relative to the repository.
+    ``expect`` is compared with the whole JSON response; ``contains`` lists
+    substrings of it. ``files_after`` maps paths to text they must contain,
+    or with a leading "!" must not.
+    """
+
+    id: str
+    event: str
+    matcher: str
+    tool_name: str = ""
+    tool_input: str = ""
+    tool_output: str = ""
+    state: Mapping[str, str | list[str]] = field(default_factory=dict)
+    files: Mapping[str, str] = field(default_factory=dict)
+    env: Mapping[str, str] = field(default_factory=dict)
+    expect: dict[str, Any] | None = None
+    contains: tuple[str, ...] = ()
+    files_after: Mapping[str, str] = field(default_factory=dict)
+
+
+def hook_cases(*cases: HookCase) -> Any:
+    """Parametrize a test over ``case`` with each case's id."""
+    return pytest.mark.parametrize("case", cases, ids=[case.id for case in cases])
+
+
+@pytest.fixture
+def replay_hook(
+    run_hook: Callable[..., subprocess.CompletedProcess[str]],
+    hook_repo: Path,
+    tmp_path: Path,
+) -> Callable[[HookCase], dict[str, Any]]:
+    """Return a runner that replays a HookCase and checks its expectations.
+
+    The event runs in a fresh copy of the template repository with its own
+    session directory. Returns the parsed JSON response, which must match
+    the hook output schema.
+    """
+
+    def _replay(case: HookCase) -> dict[str, Any]:
+        session = tmp_path / "session"
+        session.mkdir(exist_ok=True)
+        lines = [
+            f"{key}\t{value}\n"
+            for key, values in case.state.items()
+            for value in ([values] if isinstance(values, str) else values)
+        ]
+        (session / ".workflow_state").write_text("".join(lines))
+        for name, content in case.files.items():
+            path = hook_repo / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+        result = run_hook(
+            "dispatch.sh",
+            case.event,
+            case.matcher,
+            session_dir=session,
+            cwd=hook_repo,
+            env=dict(case.env),
+            tool_name=case.tool_name,
+            tool_input=case.tool_input,
+            tool_output=case.tool_output,
+        )
+
+        assert result.returncode == 0, result.stderr
+        output = hook_output(result.stdout)
+        if case.expect is not None:
+            assert output == case.expect
+        for text in case.contains:
+            assert text in result.stdout, f"{text!r} not in {result.stdout}"
+        for name, text in case.files_after.items():
+            content = (hook_repo / name).read_text()
+            if text.startswith("!"):
+                assert text[1:] not in content, f"{name}: {content}"
+            else:
+                assert text in content, f"{name}: {content}"
+        return output
+
+    return _replay
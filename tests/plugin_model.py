@@ -0,0 +1,155 @@
+"""A parsed model of the plugin's artifacts, shared by the loading tests.
+
+Each artifact (SKILL.md, command and agent markdown, plugin.json,
+hooks.json and the dispatcher registry) is read and parsed once, on first
+access. Parse failures are recorded on the object rather than raised, so a
+broken file fails the test that checks it instead of every test.
+"""
+
+import json
+import re
+import subprocess
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Self
+
+import yaml
+
+FRONTMATTER = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)$", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class Document:
+    """A markdown artifact with optional YAML frontmatter.
+
+    ``frontmatter`` is None when the file has no frontmatter block or it is
+    not valid YAML (``error`` then holds the parser message); ``body`` is
+    the text after the frontmatter, or the whole text without one.
+    """
+
+    name: str
+    path: Path
+    text: str
+    frontmatter: dict[str, Any] | None
+    error: str | None
+    body: str
+
+    @classmethod
+    def load(cls, name: str, path: Path) -> Self:
+        text = path.read_text()
+        match = FRONTMATTER.match(text)
+        if not match:
+            return cls(name, path, text, None, None, text)
+        try:
+            data = yaml.safe_load(match.group(1))
+        except yaml.YAMLError as e:
+            return cls(name, path, text, None, str(e), match.group(2))
+        frontmatter = data if isinstance(data, dict) else None
+        error = None if frontmatter is not None else "frontmatter is not a mapping"
+        return cls(name, path, text, frontmatter, error, match.group(2))
+
+
+class Skill(Document):
+    """skills/<name>/SKILL.md"""
+
+
+class Command(Document):
+    """commands/<name>.md"""
+
+
+class Agent(Document):
+    """agents/<name>.md"""
+
+
+@dataclass(frozen=True)
+class HookEntry:
+    """One hooks.json matcher entry and the checks dispatch.sh runs for it."""
+
+    event: str
+    matcher: str
+    commands: tuple[str, ...]
+    checks: tuple[str, ...]
+
+
+class PluginModel:
+    """Lazily parsed view of a plugin tree; every part is built at most once."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @cached_property
+    def manifest_text(self) -> str:
+        return (self.root / ".claude-plugin" / "plugin.json").read_text()
+
+    @cached_property
+    def manifest(self) -> dict[str, Any]:
+        data: dict[str, Any] = json.loads(self.manifest_text)
+        return data
+
+    @cached_property
+    def hooks_text(self) -> str:
+        return (self.root / "hooks" / "hooks.json").read_text()
+
+    @cached_property
+    def hooks_config(self) -> dict[str, Any]:
+        data: dict[str, Any] = json.loads(self.hooks_text)
+        return data
+
+    @cached_property
+    def skills(self) -> dict[str, Skill]:
+        return {
+            path.parent.name: Skill.load(path.parent.name, path)
+            for path in sorted((self.root / "skills").glob("*/SKILL.md"))
+        }
+
+    @cached_property
+    def commands(self) -> dict[str, Command]:
+        return {
+            path.stem: Command.load(path.stem, path)
+            for path in sorted((self.root / "commands").glob("*.md"))
+        }
+
+    @cached_property
+    def agents(self) -> dict[str, Agent]:
+        return {
+            path.stem: Agent.load(path.stem, path)
+            for path in sorted((self.root / "agents").glob("*.md"))
+        }
+
+    @cached_property
+    def registry(self) -> dict[tuple[str, str], list[str]]:
+        """The dispatcher registry as {(event, matcher): [script, ...]}."""
+        result = subprocess.run(
+            [str(self.root / "hooks" / "dispatch.sh"), "--list"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        registry: dict[tuple[str, str], list[str]] = {}
+        for line in result.stdout.splitlines():
+            event, matcher, *checks = line.split()
+            registry[(event, matcher)] = [f"{check}.sh" for check in checks]
+        return registry
+
+    @cached_property
+    def hooks(self) -> list[HookEntry]:
+        """hooks.json entries in file order, with their registered checks."""
+        return [
+            HookEntry(
+                event,
+                entry.get("matcher", ""),
+                tuple(hook.get("command", "") for hook in entry.get("hooks", [])),
+                tuple(self.registry.get((event, entry.get("matcher", "")), [])),
+            )
+            for event, entries in self.hooks_config.get("hooks", {}).items()
+            for entry in entries
+        ]
+
+    def hook_entries(self, event: str, matcher: str | None = None) -> list[HookEntry]:
+        """Entries for an event, optionally only those with the given matcher."""
+        return [
+            entry
+            for entry in self.hooks
+            if entry.event == event and (matcher is None or entry.matcher == matcher)
+        ]
@@ -0,0 +1,258 @@
+"""Tests for the parsed backlog index shared by the backlog-aware hooks."""
+
+import json
+import os
+import subprocess
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import CompletedProcess
+
+from .conftest import hook_env
+
+BACKLOG = """# Feature Backlog
+
+## Task 1: Hashing utility [COMPLETED]
+
+**Files:**
+- Create: `src/hashing.py`
+- Modify: `src/app.py:12-40`
+- Test: `tests/test_hashing.py`
+
+Run: `pytest tests/test_hashing.py -v`
+
+## Task 2: User model
+
+**Files:**
+- Create: `src/models.py`
+- Test: `tests/test_models.py`
+
+```python
+# Test: not a field inside a fence
+def test_model():
+    assert User()
+```
+
+Run: `pytest tests/test_models.py -v`
+
+### Task 3: Login route
+
+Run: `pytest tests/test_login.py -v`
+"""
+
+
+def context(result: CompletedProcess[str]) -> str:
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)["hookSpecificOutput"]["additionalContext"]
+
+
+def index_rows(session_dir: Path) -> list[list[str]]:
+    return [line.split("\x1f") for line in (session_dir / ".backlog_index").read_text().splitlines()]
+
+
+def write_backlog(tmp_path: Path, text: str = BACKLOG) -> Path:
+    path = tmp_path / "docs" / "backlogs" / "feature.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+class TestBacklogIndex:
+    """The backlog is parsed once into .backlog_index and reused."""
+
+    def test_index_built_when_backlog_written(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(tmp_path)
+        run_hook(
+            "backlog-lint.sh",
+            session_dir=tmp_path,
+            tool_name="Write",
+            tool_input=json.dumps({"file_path": str(path)}),
+        )
+
+        rows = index_rows(tmp_path)
+        assert rows[1] == ["path", str(path)]
+        assert rows[2] == ["tasks", "3"]
+        assert rows[3] == ["completed", "1"]
+        assert rows[4] == [
+            "1", "1", "Hashing utility", "tests/test_hashing.py",
+            "pytest tests/test_hashing.py -v", "src/hashing.py src/app.py", "",
+        ]
+        assert rows[5][:4] == ["2", "0", "User model", "tests/test_models.py"]
+        assert rows[6] == ["3", "0", "Login route", "", "pytest tests/test_login.py -v", "", ""]
+
+    def test_counter_and_verify_read_index(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        session_state: Callable[[Path], dict[str, list[str]]],
+        tmp_path: Path,
+    ) -> None:
+        path = write_backlog(tmp_path)
+        (tmp_path / ".backlog_path").write_text(f"{path}\n")
+
+        counted = context(run_hook("backlog-task-counter.sh", session_dir=tmp_path))
+        assert f"Found 3 tasks in {path}" in counted
+        assert session_state(tmp_path)["expected_task_count"] == ["3"]
+        assert (tmp_path / ".backlog_index").exists()
+
+        verified = context(run_hook("verify-task-count.sh", session_dir=tmp_path))
+        assert "Only 1 of 3 tasks marked complete" in verified
+
+    def test_index_rebuilt_when_backlog_changes(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(tmp_path)
+        (tmp_path / ".backlog_path").write_text(f"{path}\n")
+        (tmp_path / ".expected_task_count").write_text("3\n")
+        run_hook("verify-task-count.sh", session_dir=tmp_path)
+
+        path.write_text(BACKLOG.replace("## Task 2: User model", "## Task 2: User model [COMPLETED]"))
+        # Same mtime as the index: the recorded size still catches the edit
+        index_mtime = (tmp_path / ".backlog_index").stat().st_mtime_ns
+        os.utime(path, ns=(index_mtime, index_mtime))
+
+        verified = context(run_hook("verify-task-count.sh", session_dir=tmp_path))
+        assert "Only 2 of 3 tasks marked complete" in verified
+
+    def test_todo_injector_uses_index_for_test_path(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(tmp_path)
+        (tmp_path / ".backlog_path").write_text(f"{path}\n")
+        (tmp_path / ".workflow_phase").write_text("implementing\n")
+        test_file = tmp_path / "tests" / "test_models.py"
+        test_file.parent.mkdir()
+        test_file.write_text("import pytest\n")
+
+        result = run_hook(
+            "todo-injector.sh",
+            session_dir=tmp_path,
+            cwd=tmp_path,
+            tool_name="Task",
+            tool_input=json.dumps(
+                {"subagent_type": "code-implementer", "prompt": "Implement ## Task 2 from the backlog"}
+            ),
+        )
+
+        assert "TODO:BACKLOG[task-2] injected into tests/test_models.py" in context(result)
+        assert "# TODO:BACKLOG[task-2]" in test_file.read_text()
+
+
+SCHEDULED_BACKLOG = """# Feature Backlog
+
+## Task 1: Hashing utility [COMPLETED]
+
+- Create: `src/hashing.py`
+
+## Task 2: User model
+
+**Files:**
+- Create: `src/models.py`
+- Test: `tests/test_models.py`
+
+## Task 3: Login route
+
+**Depends on:** Task 2
+- Create: `src/routes.py`
+
+## Task 4: Settings
+
+- Modify: `src/config.py`
+
+## Task 5: Password field
+
+**Depends on:** Task 1
+- Modify: `src/models.py:3-9`
+- Test: `tests/test_models.py`
+
+## Task 6: Docs
+
+Depends on: Tasks 3 and 5
+"""
+
+
+class TestBacklogWaves:
+    """Pending tasks are scheduled into waves that share no files."""
+
+    def test_dry_run_prints_waves_and_critical_path(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(tmp_path, SCHEDULED_BACKLOG)
+
+        result = run_hook("backlog-waves.sh", str(path), session_dir=tmp_path)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.splitlines() == [
+            "Wave 1: Tasks 2, 4.",
+            "Wave 2: Tasks 3, 5.",
+            "Wave 3: Task 6.",
+            "Critical path: Task 2 -> Task 3 -> Task 6 (3 of 5 pending tasks in sequence).",
+        ]
+        assert not (tmp_path / ".workflow_state").exists()
+
+    def test_task_lookup_keeps_waves(self, hooks_dir: Path, tmp_path: Path) -> None:
+        path = write_backlog(tmp_path, SCHEDULED_BACKLOG)
+        script = f"""
+            source "{hooks_dir}/lib/common.sh"
+            source "{hooks_dir}/lib/backlog-index.sh"
+            backlog_index_load "{path}"
+            backlog_index_waves
+            backlog_index_task 3
+            printf '%s\\n' "${{BACKLOG_WAVES[@]}}" "$BACKLOG_CRITICAL_PATH"
+        """
+        env = hook_env({"CLAUDE_SESSION_DIR": str(tmp_path)})
+
+        result = subprocess.run(
+            ["bash", "-c", script], capture_output=True, text=True, env=env, check=True
+        )
+
+        assert result.stdout.splitlines() == ["2 4", "3 5", "6", "2 3 6"]
+
+    def test_index_records_dependencies(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(tmp_path, SCHEDULED_BACKLOG)
+        run_hook("backlog-waves.sh", str(path), session_dir=tmp_path)
+
+        assert [row[6] for row in index_rows(tmp_path)[4:]] == ["", "", "2", "", "1", "3 5"]
+
+    def test_unmet_dependencies_reported(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(
+            tmp_path,
+            "## Task 1: A\nDepends on: Task 2\n\n## Task 2: B\nDepends on: Task 1\n\n"
+            "## Task 3: C\nDepends on: Task 7\n",
+        )
+
+        result = run_hook("backlog-waves.sh", str(path), session_dir=tmp_path)
+
+        assert result.returncode == 3
+        assert result.stdout.splitlines() == [
+            "Wave 1: Task 3.",
+            "Dependency loop: Tasks 1, 2 cannot be scheduled.",
+            "Task 3 depends on Task 7, which is not in the backlog.",
+        ]
+
+    def test_counter_reports_parallel_waves(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(tmp_path, SCHEDULED_BACKLOG)
+        (tmp_path / ".backlog_path").write_text(f"{path}\n")
+
+        counted = context(run_hook("backlog-task-counter.sh", session_dir=tmp_path))
+
+        assert "BACKLOG SCHEDULE: Wave 1: Tasks 2, 4. Wave 2: Tasks 3, 5." in counted
+
+    def test_counter_quiet_for_sequential_backlog(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        path = write_backlog(
+            tmp_path, "## Task 1: A\n- Create: `a.py`\n\n## Task 2: B\n- Modify: `a.py`\n"
+        )
+        (tmp_path / ".backlog_path").write_text(f"{path}\n")
+
+        counted = context(run_hook("backlog-task-counter.sh", session_dir=tmp_path))
+
+        assert "Found 2 tasks" in counted
+        assert "SCHEDULE" not in counted
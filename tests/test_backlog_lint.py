@@ -0,0 +1,131 @@
+"""Behavioral tests for the backlog lint hook."""
+
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import CompletedProcess
+
+# Generous enough for slow CI machines; a single pass takes a few ms
+LARGE_BACKLOG_BUDGET_SECONDS = 1.0
+
+FENCE = "```"
+
+
+def lint(
+    run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path, backlog: str
+) -> str:
+    path = tmp_path / "docs" / "backlogs" / "feature.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(backlog)
+    result = run_hook(
+        "backlog-lint.sh",
+        session_dir=tmp_path,
+        tool_name="Write",
+        tool_input=json.dumps({"file_path": str(path)}),
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)["hookSpecificOutput"]["additionalContext"]
+
+
+def task(number: int, code: str, run: bool = True) -> str:
+    run_line = f"Run: `pytest tests/test_{number}.py -v`\n\n" if run else ""
+    return f"## Task {number}: Component {number}\n\n{run_line}{FENCE}python\n{code}{FENCE}\n\n"
+
+
+class TestBacklogLint:
+    """Findings are reported per task, and only real placeholders are flagged."""
+
+    def test_clean_backlog(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        context = lint(run_hook, tmp_path, task(1, "def add(a, b):\n    return a + b\n"))
+        assert context.startswith("BACKLOG LINT: No placeholder issues found")
+
+    def test_findings_grouped_per_task(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        backlog = (
+            "# Feature\n\n"
+            + task(1, "def hash_password(pw):\n    pass\n")
+            + task(2, "def model():\n    raise NotImplementedError\n", run=False)
+        )
+        context = lint(run_hook, tmp_path, backlog)
+
+        assert context.startswith("BACKLOG QUALITY WARNING")
+        first, second = context.split("- Task 2: Component 2:")
+        assert "- Task 1: Component 1:" in first
+        assert "pass as function body" in first
+        assert "NotImplementedError placeholder" in second
+        assert "no test command (missing 'Run:' line)" in second
+        assert "missing 'Run:'" not in first
+
+    def test_prose_and_real_code_not_flagged(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        code = (
+            "class HashError(Exception):\n"
+            "    pass\n"
+            "\n"
+            "@overload\n"
+            "def parse(value: int) -> int:\n"
+            "    ...\n"
+            "\n"
+            "try:\n"
+            "    parse(1)\n"
+            "except HashError:\n"
+            "    pass\n"
+        )
+        backlog = (
+            "## Task 1: Parser\n\n"
+            "Validate input ... then pass the value along.\n"
+            "Then # add the parser module.\n\n"
+            "Run: `pytest tests/test_parser.py -v`\n\n"
+            f"{FENCE}python\n{code}{FENCE}\n\n"
+            f"{FENCE}console\n$ pytest\n...\n{FENCE}\n"
+        )
+        context = lint(run_hook, tmp_path, backlog)
+        assert context.startswith("BACKLOG LINT: No placeholder issues found"), context
+
+    def test_code_placeholders_flagged(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        code = (
+            "def verify(pw):\n"
+            "\n"
+            "def load():\n"
+            "    # implement loading\n"
+            "    ...\n"
+            "    # TODO: cache\n"
+        )
+        context = lint(run_hook, tmp_path, task(1, code))
+
+        assert "line 6: Empty function definition: def verify(pw):" in context
+        assert "Placeholder implementation comment: # implement loading" in context
+        assert "line 10: Ellipsis placeholder" in context
+        assert "TODO/FIXME/XXX placeholder: # TODO: cache" in context
+
+    def test_escapes_snippets(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        code = 'def greet():\n    return "hi \\\\ there"  # TODO\n'
+        context = lint(run_hook, tmp_path, task(1, code))
+        assert 'return "hi \\\\ there"  # TODO' in context
+
+    def test_large_backlog_within_time_budget(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        """A 500-task backlog is linted in a single linear pass."""
+        backlog = "".join(
+            task(n, f"def component_{n}():\n    return {n}\n") for n in range(1, 501)
+        ) + task(501, "def todo():\n    pass\n")
+
+        start = time.monotonic()
+        context = lint(run_hook, tmp_path, backlog)
+        elapsed = time.monotonic() - start
+
+        assert "- Task 501: Component 501:" in context
+        assert "Task 500:" not in context
+        assert elapsed < LARGE_BACKLOG_BUDGET_SECONDS, (
+            f"500-task backlog took {elapsed:.2f}s (budget {LARGE_BACKLOG_BUDGET_SECONDS}s)"
+        )
@@ -0,0 +1,623 @@
+"""Tests for per-task subagent dispatch tracking and the review check."""
+
+import json
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from subprocess import CompletedProcess
+from typing import Any
+
+import pytest
+
+from .conftest import HookCase, git, hook_cases
+
+
+def dispatch(agent: str, task: int | None = None) -> HookCase:
+    """A completed Task dispatch of an agent for a backlog task."""
+    header = f"## Task {task}: Step {task}" if task is not None else "## Task: Step"
+    return HookCase(
+        id=f"{agent}-{task}",
+        event="PostToolUse",
+        matcher="Task",
+        tool_name="Task",
+        tool_input=json.dumps({"subagent_type": agent, "prompt": f"{header}\n## Context"}),
+        tool_output="12 passed\ncommit abc1234\nsrc/app.py",
+    )
+
+
+def review(
+    agent: str, task: int, verdict: str, commit: str = "", prompt: str = ""
+) -> HookCase:
+    """A completed reviewer dispatch whose report gives a verdict and commit."""
+    kind = "Spec" if agent == "spec-reviewer" else "Quality"
+    report = f"## {kind} Review: {verdict}\n\n"
+    if commit:
+        report += f"**Reviewed commit:** `{commit}`\n"
+    return replace(
+        dispatch(agent, task),
+        tool_input=json.dumps(
+            {
+                "subagent_type": agent,
+                "prompt": f"## Task {task}: Step\n{prompt}\nSee the code-implementer report.",
+            }
+        ),
+        tool_output=report,
+    )
+
+
+def complete(case_id: str, *todos: str, **fields: Any) -> HookCase:
+    """A TodoWrite marking each of the given todos completed."""
+    items = [{"content": todo, "status": "completed"} for todo in todos]
+    items.append({"content": "Task 9: Later", "status": "pending"})
+    return HookCase(
+        id=case_id,
+        event="PostToolUse",
+        matcher="TodoWrite",
+        tool_name="TodoWrite",
+        tool_input=json.dumps({"todos": items}),
+        **fields,
+    )
+
+
+TRACKER_CASES = (
+    (
+        "numbered-implementer",
+        dispatch("code-implementer", 3),
+        {"dispatch": "code-implementer"},
+        {"dispatch": ["code-implementer", "task-3:code-implementer"]},
+    ),
+    (
+        "task-n-of-m-context",
+        replace(
+            dispatch("spec-reviewer"),
+            tool_input=json.dumps(
+                {"subagent_type": "spec-reviewer", "prompt": "This is task 4 of 7"}
+            ),
+        ),
+        {"dispatch": "task-4:code-implementer"},
+        {"dispatch": ["task-4:code-implementer", "task-4:spec-reviewer"]},
+    ),
+    (
+        "redispatch-resets-only-its-task",
+        dispatch("code-implementer", 1),
+        {
+            "dispatch": [
+                "task-1:code-implementer",
+                "task-2:code-implementer",
+                "task-1:spec-reviewer",
+                "task-2:spec-reviewer",
+            ],
+            "needs_refix": "task-2",
+        },
+        {
+            "dispatch": [
+                "task-2:code-implementer",
+                "task-2:spec-reviewer",
+                "task-1:code-implementer",
+            ],
+            "needs_refix": ["task-2", "task-1"],
+        },
+    ),
+    (
+        "reviewer-clears-only-its-refix",
+        dispatch("quality-reviewer", 2),
+        {
+            "dispatch": ["task-1:code-implementer", "task-2:code-implementer"],
+            "needs_refix": ["task-1", "task-2"],
+        },
+        {
+            "dispatch": [
+                "task-1:code-implementer",
+                "task-2:code-implementer",
+                "task-2:quality-reviewer",
+            ],
+            "needs_refix": ["task-1"],
+        },
+    ),
+    (
+        "unnumbered-redispatch-keeps-numbered",
+        dispatch("code-implementer"),
+        {"dispatch": ["code-implementer", "spec-reviewer", "task-5:code-implementer"]},
+        {"dispatch": ["task-5:code-implementer", "code-implementer"], "needs_refix": ["1"]},
+    ),
+)
+
+
+IMPLEMENTED = ["task-1:code-implementer"]
+
+REVIEW_TRACKER_CASES = (
+    (
+        "records-commit-and-verdict",
+        review("spec-reviewer", 1, "APPROVED", "abc1234"),
+        {"dispatch": IMPLEMENTED},
+        {"dispatch": [*IMPLEMENTED, "task-1:spec-reviewer abc1234 approved"]},
+    ),
+    (
+        "commit-from-prompt",
+        review("quality-reviewer", 1, "ISSUES FOUND", prompt="**Review commit:** def5678"),
+        {"dispatch": IMPLEMENTED},
+        {"dispatch": [*IMPLEMENTED, "task-1:quality-reviewer def5678 issues"]},
+    ),
+    (
+        "report-without-verdict",
+        dispatch("spec-reviewer", 1),
+        {"dispatch": IMPLEMENTED},
+        {"dispatch": [*IMPLEMENTED, "task-1:spec-reviewer"]},
+    ),
+    (
+        "implementer-named-in-reviewer-prompt",
+        review("quality-reviewer", 1, "APPROVED"),
+        {"dispatch": [*IMPLEMENTED, "task-1:spec-reviewer"]},
+        {
+            "dispatch": [
+                *IMPLEMENTED,
+                "task-1:spec-reviewer",
+                "task-1:quality-reviewer - approved",
+            ]
+        },
+    ),
+)
+
+REVIEWED = [
+    "task-1:spec-reviewer abc1234 approved",
+    "task-1:quality-reviewer abc1234 issues",
+]
+
+SCOPED_CASES = (
+    (
+        "review-kept-as-base",
+        review("spec-reviewer", 1, "APPROVED", "abc1234"),
+        {"dispatch": IMPLEMENTED, "reviewed": "task-1:spec-reviewer 0000000 issues"},
+        {"reviewed": ["task-1:spec-reviewer abc1234 approved"]},
+    ),
+    (
+        "fix-keeps-bases",
+        replace(
+            dispatch("code-implementer", 1),
+            contains=(
+                "SCOPED RE-REVIEW (Task 1)",
+                "spec-reviewer: '**Re-review since:** abc1234', the output of "
+                "`git diff abc1234..HEAD` and its previous verdict (approved).",
+            ),
+        ),
+        {
+            "dispatch": [
+                *IMPLEMENTED,
+                "task-1:spec-reviewer abc1234 approved",
+                "task-1:quality-reviewer abc1234 issues",
+            ],
+            "reviewed": REVIEWED,
+        },
+        {"dispatch": IMPLEMENTED, "reviewed": REVIEWED, "needs_refix": ["task-1"]},
+    ),
+    (
+        "new-task-drops-stale-bases",
+        dispatch("code-implementer"),
+        {"reviewed": ["spec-reviewer abc1234 approved", *REVIEWED]},
+        {"reviewed": REVIEWED},
+    ),
+    (
+        "scoped-rereview-accepted",
+        review(
+            "quality-reviewer", 1, "APPROVED", "fff0000", prompt="**Re-review since:** abc1234"
+        ),
+        {"dispatch": IMPLEMENTED, "reviewed": REVIEWED, "needs_refix": "task-1"},
+        {
+            "dispatch": [*IMPLEMENTED, "task-1:quality-reviewer fff0000 approved"],
+            "reviewed": [REVIEWED[0], "task-1:quality-reviewer fff0000 approved"],
+            "needs_refix": [],
+        },
+    ),
+    (
+        "scoped-rereview-wrong-base",
+        replace(
+            review("spec-reviewer", 1, "APPROVED", "fff0000", prompt="Re-review since 1234567"),
+            contains=(
+                "Scoped re-review not accepted!",
+                "- spec-reviewer re-reviewed Task 1 since 1234567\\n"
+                "- Its last review was of abc1234",
+            ),
+        ),
+        {"dispatch": IMPLEMENTED, "reviewed": REVIEWED, "needs_refix": "task-1"},
+        {"dispatch": IMPLEMENTED, "reviewed": REVIEWED, "needs_refix": ["task-1"]},
+    ),
+    (
+        "scoped-rereview-without-base",
+        replace(
+            review("spec-reviewer", 2, "APPROVED", "fff0000", prompt="Re-review since abc1234"),
+            contains=("- Its last review was of no recorded commit",),
+        ),
+        {"dispatch": "task-2:code-implementer", "reviewed": REVIEWED},
+        {"dispatch": ["task-2:code-implementer"]},
+    ),
+)
+
+SHARD_FIX = "### For Code-Implementer\n\n1. **[src/app.py:3]**: Close the file\n\n### For Orchestrator\n"
+
+
+def shard(number: int, total: int, verdict: str, commit: str = "abc1234") -> HookCase:
+    """A completed quality-reviewer dispatch for one shard of Task 1's diff."""
+    case = review(
+        "quality-reviewer", 1, verdict, commit, prompt=f"**Review shard:** {number}/{total}"
+    )
+    return replace(case, tool_output=case.tool_output + SHARD_FIX)
+
+
+SHARD_CASES = (
+    (
+        "shard-held-back",
+        shard(1, 2, "APPROVED"),
+        {"dispatch": IMPLEMENTED, "needs_refix": "task-1"},
+        {
+            "dispatch": [*IMPLEMENTED, "task-1:quality-reviewer#1/2 abc1234 approved"],
+            "reviewed": [],
+            "needs_refix": ["task-1"],
+        },
+    ),
+    (
+        "last-shard-merged",
+        shard(2, 2, "ISSUES FOUND"),
+        {
+            "dispatch": [*IMPLEMENTED, "task-1:quality-reviewer#1/2 abc1234 approved"],
+            "needs_refix": "task-1",
+        },
+        {
+            "dispatch": [*IMPLEMENTED, "task-1:quality-reviewer abc1234 issues"],
+            "reviewed": ["task-1:quality-reviewer abc1234 issues"],
+            "needs_refix": [],
+        },
+    ),
+    (
+        "shard-redispatch-replaces",
+        shard(1, 3, "APPROVED"),
+        {
+            "dispatch": [
+                *IMPLEMENTED,
+                "task-1:quality-reviewer#1/3 abc1234 issues",
+                "task-1:quality-reviewer#2/4 abc1234 approved",
+            ]
+        },
+        {"dispatch": [*IMPLEMENTED, "task-1:quality-reviewer#1/3 abc1234 approved"]},
+    ),
+)
+
+MERGE_CASES = (
+    replace(
+        review("quality-reviewer", 1, "APPROVED", "abc1234def"),
+        id="both-approved",
+        state={"dispatch": [*IMPLEMENTED, "task-1:spec-reviewer abc1234 approved"]},
+        contains=(
+            "REVIEWS MERGED (Task 1, commit abc1234def): spec-reviewer and "
+            "quality-reviewer both approved.",
+        ),
+    ),
+    replace(
+        review("spec-reviewer", 1, "GAPS FOUND", "abc1234"),
+        id="either-fails",
+        state={"dispatch": [*IMPLEMENTED, "task-1:quality-reviewer abc1234 approved"]},
+        contains=(
+            "REVIEWS MERGED (Task 1, commit abc1234): spec-reviewer issues, "
+            "quality-reviewer approved. Re-dispatch code-implementer",
+        ),
+    ),
+    replace(
+        review("spec-reviewer", 1, "APPROVED", "abc1234"),
+        id="different-commits",
+        state={"dispatch": [*IMPLEMENTED, "task-1:quality-reviewer 9999999 approved"]},
+        contains=(
+            "Reviews of different commits!",
+            "- spec-reviewer reviewed abc1234\\n- quality-reviewer reviewed 9999999",
+        ),
+    ),
+    replace(
+        shard(1, 2, "APPROVED"),
+        id="shards-outstanding",
+        contains=(
+            "REVIEW SHARD 1/2 recorded (Task 1): waiting for quality-reviewer shards 2 of 2",
+        ),
+    ),
+    replace(
+        shard(2, 2, "ISSUES FOUND"),
+        id="shards-merged",
+        state={
+            "dispatch": [
+                *IMPLEMENTED,
+                "task-1:spec-reviewer abc1234 approved",
+                "task-1:quality-reviewer#1/2 abc1234 approved",
+            ]
+        },
+        contains=(
+            "REVIEW SHARDS MERGED (Task 1): all 2 quality-reviewer shards reported.",
+            "## Quality Review: ISSUES FOUND\\n\\n**Reviewed commit:** `abc1234`",
+            "- Shard 1/2: approved\\n- Shard 2/2: issues",
+            "### For Implementer\\n\\n#### Shard 2/2\\n1. **[src/app.py:3]**: Close the file",
+            "REVIEWS MERGED (Task 1, commit abc1234): quality-reviewer issues, "
+            "spec-reviewer approved.",
+        ),
+    ),
+    replace(
+        shard(2, 2, "APPROVED"),
+        id="shards-of-different-commits",
+        state={"dispatch": [*IMPLEMENTED, "task-1:quality-reviewer#1/2 9999999 approved"]},
+        contains=(
+            "Review shards of different commits!",
+            "- quality-reviewer shard 2/2 of Task 1 reviewed abc1234\\n"
+            "- shard 1/2 reviewed 9999999",
+        ),
+    ),
+    replace(
+        review("spec-reviewer", 2, "APPROVED", "abc1234"),
+        id="other-task-not-merged",
+        state={"dispatch": [*IMPLEMENTED, "task-1:quality-reviewer abc1234 approved"]},
+        expect={},
+    ),
+)
+
+
+ALL_TRACKER_CASES = TRACKER_CASES + REVIEW_TRACKER_CASES + SCOPED_CASES + SHARD_CASES
+
+
+class TestDispatchTracker:
+    """Each backlog task keeps its own dispatch record and refix flag."""
+
+    @pytest.mark.parametrize(
+        ("case", "after"),
+        [
+            (replace(case, id=case_id, state={"phase": "implementing", **state}), after)
+            for case_id, case, state, after in ALL_TRACKER_CASES
+        ],
+        ids=[case_id for case_id, *_ in ALL_TRACKER_CASES],
+    )
+    def test_case(
+        self,
+        replay_hook: Callable[[HookCase], dict[str, Any]],
+        session_state: Callable[[Path], dict[str, list[str]]],
+        tmp_path: Path,
+        case: HookCase,
+        after: dict[str, list[str]],
+    ) -> None:
+        replay_hook(case)
+
+        state = session_state(tmp_path / "session")
+        assert {key: state.get(key, []) for key in after} == after
+
+    @hook_cases(
+        *(replace(case, state={"phase": "implementing", **case.state}) for case in MERGE_CASES)
+    )
+    def test_reviews_merged(
+        self, replay_hook: Callable[[HookCase], dict[str, Any]], case: HookCase
+    ) -> None:
+        replay_hook(case)
+
+    def test_interleaved_tasks(
+        self,
+        replay_hook: Callable[[HookCase], dict[str, Any]],
+        session_state: Callable[[Path], dict[str, list[str]]],
+        tmp_path: Path,
+    ) -> None:
+        """Two pipelines in flight at once finish with complete, separate records."""
+        steps = [
+            ("code-implementer", 1),
+            ("code-implementer", 2),
+            ("spec-reviewer", 1),
+            ("spec-reviewer", 2),
+            ("code-implementer", 2),
+            ("quality-reviewer", 1),
+            ("spec-reviewer", 2),
+        ]
+        session = tmp_path / "session"
+        for agent, task in steps:
+            state = session_state(session) or {"phase": "implementing"}
+            replay_hook(replace(dispatch(agent, task), state=state))
+
+        state = session_state(session)
+        assert state["dispatch"] == [
+            "task-1:code-implementer",
+            "task-1:spec-reviewer",
+            "task-2:code-implementer",
+            "task-1:quality-reviewer",
+            "task-2:spec-reviewer",
+        ]
+        assert "needs_refix" not in state
+
+
+IMPLEMENTING = {"phase": "implementing"}
+TWO_TASKS = [
+    "task-1:code-implementer",
+    "task-2:code-implementer",
+    "task-1:spec-reviewer",
+    "task-1:quality-reviewer",
+    "task-2:spec-reviewer",
+]
+
+REVIEW_CASES = (
+    complete(
+        "reviewed-task-complete",
+        "Task 1: Parser",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS},
+        expect={},
+    ),
+    complete(
+        "unreviewed-task-named",
+        "Task 2: Lexer",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS},
+        contains=("Missing reviewers: quality-reviewer (Task 2)\\n",),
+    ),
+    complete(
+        "glob-characters-in-todo",
+        "Task 2: Match src/*.py [a-z]?",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS},
+        contains=("Missing reviewers: quality-reviewer (Task 2)\\n",),
+    ),
+    complete(
+        "each-completed-task-checked",
+        "Task 1: Parser",
+        "Task 2: Lexer",
+        "Task 3: Docs",
+        state={**IMPLEMENTING, "dispatch": [*TWO_TASKS, "task-3:code-implementer"]},
+        contains=(
+            "Missing reviewers: quality-reviewer (Task 2); "
+            "spec-reviewer, quality-reviewer (Task 3)\\n",
+        ),
+    ),
+    complete(
+        "refix-of-completed-task",
+        "Task 1: Parser",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS, "needs_refix": "task-1"},
+        contains=("without fresh reviews after fix",),
+    ),
+    complete(
+        "refix-of-other-task-ignored",
+        "Task 1: Parser",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS, "needs_refix": "task-2"},
+        expect={},
+    ),
+    complete(
+        "single-tracker-fallback",
+        "Write the parser",
+        state={**IMPLEMENTING, "dispatch": ["task-4:code-implementer"]},
+        contains=("Missing reviewers: spec-reviewer, quality-reviewer (Task 4)\\n",),
+    ),
+    complete(
+        "untracked-task-named",
+        "Task 3: Docs",
+        state={**IMPLEMENTING, "dispatch": ["task-4:code-implementer"]},
+        contains=("Missing reviewers: spec-reviewer, quality-reviewer (Task 3)\\n",),
+    ),
+    complete(
+        "several-trackers-checked-together",
+        "Write the parser",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS[:3]},
+        contains=("Missing reviewers: quality-reviewer\\n",),
+    ),
+    complete(
+        "several-trackers-reviewed",
+        "Write the parser",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS},
+        expect={},
+    ),
+    complete(
+        "review-found-issues",
+        "Task 1: Parser",
+        state={
+            **IMPLEMENTING,
+            "dispatch": [
+                "task-1:code-implementer",
+                "task-1:spec-reviewer abc1234 approved",
+                "task-1:quality-reviewer abc1234 issues",
+            ],
+        },
+        contains=("- quality-reviewer found issues in Task 1\\n",),
+    ),
+    complete(
+        "reviews-of-different-commits",
+        "Task 1: Parser",
+        state={
+            **IMPLEMENTING,
+            "dispatch": [
+                "task-1:code-implementer",
+                "task-1:spec-reviewer abc1234 approved",
+                "task-1:quality-reviewer 9999999 approved",
+            ],
+        },
+        contains=("Task 1: spec-reviewer reviewed abc1234, quality-reviewer 9999999",),
+    ),
+    complete(
+        "latest-review-counts",
+        "Task 1: Parser",
+        state={
+            **IMPLEMENTING,
+            "dispatch": [
+                "task-1:code-implementer",
+                "task-1:spec-reviewer abc1234 approved",
+                "task-1:quality-reviewer abc1234 issues",
+                "task-1:quality-reviewer abc1234 approved",
+            ],
+        },
+        expect={},
+    ),
+    complete(
+        "parallel-mode-needs-commits",
+        "Task 1: Parser",
+        state={**IMPLEMENTING, "dispatch": TWO_TASKS},
+        env={"WORKFLOW_REVIEW_MODE": "parallel"},
+        contains=("Task 1: the reviews do not name the commit they reviewed",),
+    ),
+    complete(
+        "quality-shards-outstanding",
+        "Task 1: Parser",
+        state={
+            **IMPLEMENTING,
+            "dispatch": [
+                *IMPLEMENTED,
+                "task-1:spec-reviewer abc1234 approved",
+                "task-1:quality-reviewer#2/3 abc1234 approved",
+            ],
+        },
+        contains=("Missing reviewers: quality-reviewer: 1 of 3 shards (Task 1)\\n",),
+    ),
+    complete(
+        "unnumbered-flow",
+        "Task 1: Parser",
+        state={**IMPLEMENTING, "dispatch": "code-implementer", "needs_refix": "1"},
+        contains=(
+            "Missing reviewers: spec-reviewer, quality-reviewer\\n\\n**FIX CYCLE WARNING:**",
+        ),
+    ),
+)
+
+
+class TestReviewCheck:
+    """Completing a todo checks the reviews of the task it names."""
+
+    @hook_cases(*REVIEW_CASES)
+    def test_case(
+        self, replay_hook: Callable[[HookCase], dict[str, Any]], case: HookCase
+    ) -> None:
+        replay_hook(case)
+
+
+class TestReviewShards:
+    """review-shards.sh splits a diff into per-directory review shards."""
+
+    def test_diff_sharded_by_directory(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        hook_repo: Path,
+        tmp_path: Path,
+    ) -> None:
+        (hook_repo / "docs").mkdir()
+        (hook_repo / "src" / "db").mkdir()
+        (hook_repo / "README.md").write_text("demo\nmore\n")
+        (hook_repo / "docs" / "guide.md").write_text("line\n" * 10)
+        with (hook_repo / "src" / "app.py").open("a") as app:
+            app.write("# note\n" * 29)
+        (hook_repo / "src" / "db" / "a.py").write_text("x = 1\n" * 60)
+        (hook_repo / "src" / "db" / "b.py").write_text("y = 2\n" * 60)
+        (hook_repo / "src" / "db" / "c d.py").write_text("z = 3\n")
+        git(hook_repo, "add", "-A")
+        git(hook_repo, "commit", "-q", "-m", "change")
+
+        result = run_hook(
+            "review-shards.sh",
+            "main",
+            session_dir=tmp_path / "session",
+            cwd=hook_repo,
+            env={"WORKFLOW_REVIEW_SHARD_LINES": "80"},
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.splitlines() == [
+            "Shard 1/3 (40 lines): README.md docs/guide.md src/app.py",
+            "Shard 2/3 (60 lines): src/db/a.py",
+            "Shard 3/3 (61 lines): src/db/b.py src/db/c\\ d.py",
+        ]
+
+    def test_no_changes(
+        self, run_hook: Callable[..., CompletedProcess[str]], hook_repo: Path, tmp_path: Path
+    ) -> None:
+        result = run_hook(
+            "review-shards.sh", "main", session_dir=tmp_path / "session", cwd=hook_repo
+        )
+
+        assert result.stdout == "No changes between main and HEAD.\n"
@@ -0,0 +1,120 @@
+"""Tests for implementer-evidence-check.sh evidence detection."""
+
+import json
+import subprocess
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from .conftest import HookCase, hook_cases, hook_env
+
+
+def report_case(case_id: str, report: str, **expected: Any) -> HookCase:
+    return HookCase(
+        id=case_id,
+        event="PostToolUse",
+        matcher="Task",
+        tool_name="Task",
+        tool_input=json.dumps({"subagent_type": "code-implementer", "prompt": "## Task 1"}),
+        tool_output=report,
+        state={"phase": "implementing", "dispatch": "code-implementer"},
+        **expected,
+    )
+
+
+CASES = (
+    report_case(
+        "complete-report",
+        "Implemented the parser.\n5 passed in 0.12s\ncommit abc1234\nModified src/parser.py",
+        expect={},
+    ),
+    report_case(
+        "reports-matched-lines",
+        "Implemented it.\n  5 passed in 0.12s\nAll done",
+        contains=(
+            "Missing: git reference, file paths.",
+            "Found: test output (line 2: 5 passed in 0.12s).",
+        ),
+    ),
+    report_case(
+        "nothing-found",
+        "Implemented it, should work",
+        contains=("Missing: test output, git reference, file paths. Completion",),
+    ),
+    report_case(
+        "escapes-quoted-excerpt",
+        'Ran "pytest" with C:\\venv\nsrc/a.py',
+        contains=('line 1: Ran \\"pytest\\" with C:\\\\venv',),
+    ),
+    report_case(
+        "extension-needs-word-boundary",
+        "3 passed\ngit diff --stat\nsee notes.mdx and the shell",
+        contains=("Missing: file paths.",),
+    ),
+    replace(
+        report_case("reviewer-citing-implementer", "Looks fine", expect={}),
+        tool_input=json.dumps(
+            {"subagent_type": "spec-reviewer", "prompt": "## Task 1\nRead the code-implementer report"}
+        ),
+    ),
+)
+
+
+class TestEvidenceCheck:
+    """Each evidence class is found in one pass and quoted when others are missing."""
+
+    @hook_cases(*CASES)
+    def test_case(
+        self, replay_hook: Callable[[HookCase], dict[str, Any]], case: HookCase
+    ) -> None:
+        replay_hook(case)
+
+
+class TestEvidenceScan:
+    """evidence_scan streams the report and stops once every class is found."""
+
+    def _scan(self, hooks_dir: Path, tmp_path: Path, report: str) -> list[list[str]]:
+        """evidence_scan's rows for a report too large for the environment."""
+        path = tmp_path / "report.txt"
+        path.write_text(report)
+        script = f"""
+            source "{hooks_dir}/implementer-evidence-check.sh"
+            IFS= read -r -d '' TOOL_OUTPUT < "{path}" || true
+            evidence_scan
+        """
+        env = hook_env({"CLAUDE_SESSION_DIR": str(tmp_path)})
+        result = subprocess.run(
+            ["bash", "-c", script], capture_output=True, text=True, env=env, check=True
+        )
+        return [line.split("\t") for line in result.stdout.splitlines()]
+
+    def test_multi_megabyte_report(self, hooks_dir: Path, tmp_path: Path) -> None:
+        filler = "line of captured log output without evidence\n" * 100_000
+        rows = self._scan(hooks_dir, tmp_path, filler + "12 passed\ncommit 0123abcd\nsrc/x.py")
+
+        assert rows == [
+            ["test", "100001", "12 passed"],
+            ["git", "100002", "commit 0123abcd"],
+            ["files", "100003", "src/x.py"],
+        ]
+
+    def test_json_encoded_report(self, hooks_dir: Path, tmp_path: Path) -> None:
+        filler = "line of captured log output without evidence\n" * 100_000
+        report = json.dumps(filler + "12 passed\ncommit 0123abcd\nsrc/x.py\n" + filler)
+        rows = self._scan(hooks_dir, tmp_path, report)
+
+        assert rows == [
+            ["test", "100001", "12 passed"],
+            ["git", "100002", "commit 0123abcd"],
+            ["files", "100003", "src/x.py"],
+        ]
+
+    def test_long_line_excerpt_is_truncated(self, hooks_dir: Path, tmp_path: Path) -> None:
+        rows = self._scan(hooks_dir, tmp_path, "FAILED tests/test_x.py::test_y " + "é" * 500_000)
+
+        assert [row[0] for row in rows] == ["test", "files"]
+        excerpt = rows[0][2].encode()
+        assert excerpt.endswith(b"...")
+        assert len(excerpt) <= 83
+        excerpt.decode("utf-8")
@@ -0,0 +1,160 @@
+"""Tests for the git probes in hooks/lib/git.sh."""
+
+import json
+import os
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import CompletedProcess
+
+import pytest
+
+from .conftest import git
+
+COMMIT = json.dumps({"command": "git commit -m 'add feature'"})
+WRITE = json.dumps({"file_path": "src/app.py", "content": "x = 1\n"})
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """A git repository with one commit on main."""
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "tests").mkdir()
+    (repo / "README.md").write_text("demo\n")
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "add", "README.md")
+    git(repo, "commit", "-q", "-m", "init")
+    return repo
+
+
+@pytest.fixture
+def git_log(tmp_path: Path) -> tuple[dict[str, str], Path]:
+    """PATH with a git wrapper that records every invocation, and its log."""
+    shim = tmp_path / "shim"
+    shim.mkdir()
+    log = tmp_path / "git.log"
+    log.touch()
+    wrapper = shim / "git"
+    wrapper.write_text(f'#!/bin/sh\necho "$*" >> "{log}"\nexec {shutil.which("git")} "$@"\n')
+    wrapper.chmod(0o755)
+    return {"PATH": f"{shim}{os.pathsep}{os.environ['PATH']}"}, log
+
+
+class TestBranchProbe:
+    """The branch is read from HEAD without starting git."""
+
+    def _warns(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        cwd: Path,
+        session_dir: Path,
+        env: dict[str, str],
+    ) -> bool:
+        result = run_hook(
+            "main-branch-protection.sh",
+            session_dir=session_dir,
+            cwd=cwd,
+            env=env,
+            tool_name="Write",
+            tool_input=WRITE,
+        )
+        assert result.returncode == 0, result.stderr
+        return "main/master branch" in json.loads(result.stdout).get("systemMessage", "")
+
+    def test_main_branch_read_without_git(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        repo: Path,
+        git_log: tuple[dict[str, str], Path],
+        tmp_path: Path,
+    ) -> None:
+        env, log = git_log
+        assert self._warns(run_hook, repo / "src", tmp_path, env)
+        assert log.read_text() == ""
+
+    def test_linked_worktree(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        repo: Path,
+        git_log: tuple[dict[str, str], Path],
+        tmp_path: Path,
+    ) -> None:
+        env, log = git_log
+        worktree = tmp_path / "wt"
+        git(repo, "worktree", "add", "-q", "-b", "feat/1-login", str(worktree))
+
+        result = run_hook("session-start.sh", session_dir=tmp_path, cwd=worktree, env=env)
+
+        context = json.loads(result.stdout)["hookSpecificOutput"]["additionalContext"]
+        assert "On 'feat/1-login'" in context
+        assert not self._warns(run_hook, worktree, tmp_path, env)
+        assert log.read_text() == ""
+
+    def test_relative_gitdir_file_and_detached_head(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        repo: Path,
+        git_log: tuple[dict[str, str], Path],
+        tmp_path: Path,
+    ) -> None:
+        # Submodule layout: .git is a file pointing into the superproject
+        modules = tmp_path / "modules"
+        modules.mkdir()
+        (repo / ".git").rename(modules / "repo")
+        (repo / ".git").write_text("gitdir: ../modules/repo\n")
+        env, log = git_log
+
+        assert self._warns(run_hook, repo, tmp_path, env)
+
+        git(repo, "checkout", "-q", "--detach")
+        assert not self._warns(run_hook, repo, tmp_path, env)
+        assert log.read_text() == ""
+
+
+class TestStagedFiles:
+    """The staged file list is cached until the index or HEAD changes."""
+
+    def _commit(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        repo: Path,
+        session_dir: Path,
+        env: dict[str, str],
+    ) -> str:
+        result = run_hook(
+            "tdd-precommit-check.sh",
+            session_dir=session_dir,
+            cwd=repo,
+            env=env,
+            tool_name="Bash",
+            tool_input=COMMIT,
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout).get("decision", "")
+
+    def test_git_runs_only_when_index_changes(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        repo: Path,
+        git_log: tuple[dict[str, str], Path],
+        tmp_path: Path,
+    ) -> None:
+        env, log = git_log
+        session = tmp_path / "session"
+        (repo / "src" / "app.py").write_text("x = 1\n")
+        git(repo, "add", "src/app.py")
+        # As between real tool calls, the index is not written in the same
+        # clock tick as the check that reads it
+        index = repo / ".git" / "index"
+        stamp = index.stat().st_mtime - 2
+        os.utime(index, (stamp, stamp))
+
+        assert self._commit(run_hook, repo, session, env) == "block"
+        assert self._commit(run_hook, repo, session, env) == "block"
+        assert log.read_text().count("diff --cached") == 1
+
+        (repo / "tests" / "test_app.py").write_text("def test_x():\n    assert x == 1\n")
+        git(repo, "add", "tests/test_app.py")
+        assert self._commit(run_hook, repo, session, env) == ""
+        assert log.read_text().count("diff --cached") == 2
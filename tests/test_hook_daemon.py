@@ -0,0 +1,212 @@
+"""Tests for the resident hook daemon and the run-hook.cmd client."""
+
+import json
+import subprocess
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from .conftest import git, hook_env
+
+
+def run_client(
+    hooks_dir: Path, session_dir: Path, cwd: Path, event: str, matcher: str, **env_vars: str
+) -> subprocess.CompletedProcess[str]:
+    """Invoke run-hook.cmd the way hooks.json does."""
+    env = hook_env()
+    env["CLAUDE_SESSION_DIR"] = str(session_dir)
+    for name, value in env_vars.items():
+        env[f"CLAUDE_{name.upper()}"] = value
+    return subprocess.run(
+        ["sh", str(hooks_dir / "run-hook.cmd"), "dispatch.sh", event, matcher],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+        timeout=10,
+    )
+
+
+def daemon(hooks_dir: Path, session_dir: Path, command: str) -> subprocess.CompletedProcess[str]:
+    env = hook_env()
+    env["CLAUDE_SESSION_DIR"] = str(session_dir)
+    return subprocess.run(
+        [str(hooks_dir / "hook-daemon.sh"), command],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=10,
+    )
+
+
+@pytest.fixture
+def repo(hook_repo: Path) -> Path:
+    """A git repository checked out on main."""
+    git(hook_repo, "checkout", "-q", "main")
+    return hook_repo
+
+
+@pytest.fixture
+def session_dir(tmp_path: Path) -> Path:
+    session = tmp_path / "session"
+    session.mkdir()
+    return session
+
+
+@pytest.fixture
+def running_daemon(hooks_dir: Path, session_dir: Path) -> Iterator[Path]:
+    """Start a daemon for session_dir and stop it afterwards."""
+    daemon(hooks_dir, session_dir, "start")
+    try:
+        yield session_dir
+    finally:
+        daemon(hooks_dir, session_dir, "stop")
+        for _ in range(50):
+            if not (session_dir / ".hookd" / "pid").exists():
+                break
+            time.sleep(0.1)
+
+
+class TestHookDaemon:
+    """The daemon must answer exactly like the spawned dispatcher."""
+
+    def test_status_reports_running(self, hooks_dir: Path, running_daemon: Path) -> None:
+        result = daemon(hooks_dir, running_daemon, "status")
+        assert result.returncode == 0
+        assert "running" in result.stdout
+
+    def test_stop_shuts_daemon_down(self, hooks_dir: Path, running_daemon: Path) -> None:
+        daemon(hooks_dir, running_daemon, "stop")
+        for _ in range(50):
+            if daemon(hooks_dir, running_daemon, "status").returncode != 0:
+                break
+            time.sleep(0.1)
+        assert daemon(hooks_dir, running_daemon, "status").returncode == 1
+
+    @pytest.mark.parametrize(
+        ("event", "matcher", "tool_name", "tool_input", "served"),
+        [
+            ("PostToolUse", "Write|Edit", "Write", '{"file_path": "app.py"}', True),
+            # Answered by run-hook.cmd's prefilter without reaching the daemon
+            ("PostToolUse", "TodoWrite", "TodoWrite", '{"todos": []}', False),
+            ("PreToolUse", "Bash", "Bash", '{"command": "git commit -m x"}', True),
+        ],
+    )
+    def test_daemon_matches_spawned_dispatcher(
+        self,
+        hooks_dir: Path,
+        session_dir: Path,
+        repo: Path,
+        event: str,
+        matcher: str,
+        tool_name: str,
+        tool_input: str,
+        served: bool,
+    ) -> None:
+        spawned = run_client(
+            hooks_dir, session_dir, repo, event, matcher,
+            tool_name=tool_name, tool_input=tool_input,
+        )
+        daemon(hooks_dir, session_dir, "start")
+        try:
+            answer = run_client(
+                hooks_dir, session_dir, repo, event, matcher,
+                tool_name=tool_name, tool_input=tool_input,
+            )
+            # The daemon counts its startup and each request it answers
+            if served:
+                assert (session_dir / ".hookd" / "stamp").read_text() == "2\n"
+        finally:
+            daemon(hooks_dir, session_dir, "stop")
+
+        assert answer.returncode == 0
+        assert json.loads(answer.stdout) == json.loads(spawned.stdout)
+
+    def test_daemon_sees_external_state_changes(
+        self, hooks_dir: Path, running_daemon: Path, repo: Path
+    ) -> None:
+        """Phase files written outside the daemon must not be served stale."""
+        (running_daemon / ".workflow_phase").write_text("implementing\n")
+        (running_daemon / ".subagent_dispatch").write_text("code-implementer\n")
+        completed = '{"todos": [{"content": "Task 1", "status": "completed"}]}'
+
+        first = run_client(
+            hooks_dir, running_daemon, repo, "PostToolUse", "TodoWrite",
+            tool_name="TodoWrite", tool_input=completed,
+        )
+        assert "spec-reviewer, quality-reviewer" in json.loads(first.stdout)["systemMessage"]
+
+        # /workflow reset removes the state store outside the daemon
+        (running_daemon / ".workflow_state").unlink()
+        second = run_client(
+            hooks_dir, running_daemon, repo, "PostToolUse", "TodoWrite",
+            tool_name="TodoWrite", tool_input=completed,
+        )
+        assert json.loads(second.stdout) == {}
+
+    def test_daemon_tracks_its_own_state_writes(
+        self, hooks_dir: Path, running_daemon: Path, repo: Path
+    ) -> None:
+        (running_daemon / ".workflow_phase").write_text("implementing\n")
+        for agent in ("code-implementer", "spec-reviewer"):
+            run_client(
+                hooks_dir, running_daemon, repo, "PostToolUse", "Task",
+                tool_name="Task", tool_input=f'{{"subagent_type": "{agent}"}}',
+            )
+        result = run_client(
+            hooks_dir, running_daemon, repo, "PostToolUse", "TodoWrite",
+            tool_name="TodoWrite",
+            tool_input='{"todos": [{"content": "Task 1", "status": "completed"}]}',
+        )
+        message = json.loads(result.stdout)["systemMessage"]
+        assert "Missing reviewers: quality-reviewer\n" in message
+        assert (running_daemon / ".workflow_state").read_text() == (
+            "phase\timplementing\ndispatch\tcode-implementer\ndispatch\tspec-reviewer\n"
+        )
+
+    def test_client_falls_back_without_daemon(
+        self, hooks_dir: Path, session_dir: Path, repo: Path
+    ) -> None:
+        """A stale pid file must not stop hooks from running."""
+        hookd = session_dir / ".hookd"
+        hookd.mkdir()
+        subprocess.run(["mkfifo", str(hookd / "requests")], check=True)
+        (hookd / "pid").write_text("999999\n")
+
+        result = run_client(
+            hooks_dir, session_dir, repo, "PostToolUse", "Write|Edit",
+            tool_name="Write", tool_input='{"file_path": "app.py"}',
+        )
+        assert result.returncode == 0
+        assert "main/master branch" in json.loads(result.stdout)["systemMessage"]
+
+    @pytest.mark.parametrize(
+        "stand_in",
+        [
+            pytest.param('(exec 3<> "$0"; sleep 1)', id="after-taking-the-request"),
+            pytest.param("sleep 1", id="before-reading-requests"),
+        ],
+    )
+    def test_client_falls_back_when_daemon_dies_before_replying(
+        self, hooks_dir: Path, session_dir: Path, repo: Path, stand_in: str
+    ) -> None:
+        """A daemon that exits without replying must not hang the hook."""
+        hookd = session_dir / ".hookd"
+        hookd.mkdir()
+        subprocess.run(["mkfifo", str(hookd / "requests")], check=True)
+        # Never opens a reply, then exits; started in the background so it is
+        # not left a zombie of this process
+        silent = subprocess.run(
+            ["sh", "-c", f"({stand_in}) > /dev/null 2>&1 & echo $!", hookd / "requests"],
+            capture_output=True, text=True, check=True,
+        )
+        (hookd / "pid").write_text(silent.stdout)
+
+        result = run_client(
+            hooks_dir, session_dir, repo, "PostToolUse", "Write|Edit",
+            tool_name="Write", tool_input='{"file_path": "app.py"}',
+        )
+        assert result.returncode == 0
+        assert "main/master branch" in json.loads(result.stdout)["systemMessage"]
@@ -0,0 +1,88 @@
+"""Tests for the opt-in hook timing log (hooks/lib/timing.sh, hook-timing.sh)."""
+
+import json
+import subprocess
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import CompletedProcess
+
+from .conftest import hook_env
+
+COMMIT = json.dumps({"command": "git commit -m 'x'"})
+
+
+class TestHookTiming:
+    """WORKFLOW_HOOK_TIMING=1 logs one JSON line per check dispatch.sh runs."""
+
+    def _dispatch(
+        self, run_hook: Callable[..., CompletedProcess[str]], session: Path, **env: str
+    ) -> CompletedProcess[str]:
+        result = run_hook(
+            "dispatch.sh",
+            "PreToolUse",
+            "Bash",
+            session_dir=session,
+            env=env,
+            tool_name="Bash",
+            tool_input=COMMIT,
+        )
+        assert result.returncode == 0, result.stderr
+        return result
+
+    def test_disabled_by_default(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        self._dispatch(run_hook, tmp_path)
+        assert not (tmp_path / ".hook_timing.jsonl").exists()
+
+    def test_records_each_check(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        result = self._dispatch(run_hook, tmp_path, WORKFLOW_HOOK_TIMING="1")
+
+        lines = (tmp_path / ".hook_timing.jsonl").read_text().splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["hook"] for r in records] == ["verify-before-commit", "tdd-precommit-check"]
+        reminder = records[0]
+        assert reminder["event"] == "PreToolUse"
+        assert reminder["matcher"] == "Bash"
+        assert reminder["status"] == 0
+        assert reminder["ms"] >= 0
+        context = json.loads(result.stdout)["hookSpecificOutput"]["additionalContext"]
+        assert reminder["bytes"] == len(context)
+
+    def test_summary_reports_percentiles(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        log = tmp_path / ".hook_timing.jsonl"
+        log.write_text(
+            "".join(
+                json.dumps({"hook": "slow-check", "event": "PreToolUse", "ms": ms}) + "\n"
+                for ms in range(1, 101)
+            )
+            + json.dumps({"hook": "fast-check", "event": "PreToolUse", "ms": 0.5}) + "\n"
+        )
+
+        result = run_hook("hook-timing.sh", "summary", session_dir=tmp_path)
+
+        assert result.returncode == 0, result.stderr
+        header, slow, fast = result.stdout.splitlines()
+        assert header.split()[:2] == ["hook", "calls"]
+        assert slow.split() == ["slow-check", "100", "50.000", "95.000", "99.000", "100.000"]
+        assert fast.split()[:2] == ["fast-check", "1"]
+
+    def test_log_is_ring_buffered(self, hooks_dir: Path, tmp_path: Path) -> None:
+        log = tmp_path / ".hook_timing.jsonl"
+        log.write_text('{"hook":"old","ms":1}\n' * 11)
+        script = f"""
+            source "{hooks_dir}/lib/common.sh"
+            source "{hooks_dir}/lib/timing.sh"
+            check_noop() {{ :; }}
+            for i in {{1..1000}}; do hook_timing_check PreToolUse Bash noop; done
+        """
+        env = hook_env({"CLAUDE_SESSION_DIR": str(tmp_path), "WORKFLOW_HOOK_TIMING_MAX": "10"})
+        subprocess.run(["bash", "-c", script], env=env, check=True)
+
+        previous = (tmp_path / ".hook_timing.jsonl.1").read_text().splitlines()
+        assert len(previous) > 10
+        assert len(log.read_text().splitlines()) < 1000
@@ -2,8 +2,14 @@
 
 import json
 import re
+import subprocess
+from collections.abc import Callable
 from pathlib import Path
 
+from .plugin_model import PluginModel
+
+COMPLETED_TODO = '{"todos": [{"content": "Task 1", "status": "completed"}]}'
+
 
 class TestHooksLoading:
     """Validate that hooks configuration is valid and scripts exist."""
@@ -23,21 +29,16 @@ class TestHooksLoading:
         except json.JSONDecodeError as e:
             raise AssertionError(f"Invalid JSON in hooks.json: {e}") from e
 
-    def test_hooks_has_required_structure(self, plugin_root: Path) -> None:
+    def test_hooks_has_required_structure(self, plugin: PluginModel) -> None:
         """hooks.json must have the expected top-level structure."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
+        data = plugin.hooks_config
 
         assert "hooks" in data, "Missing 'hooks' key in hooks.json"
         assert isinstance(data["hooks"], dict), "'hooks' must be an object"
 
-    def test_all_hook_scripts_exist(self, plugin_root: Path) -> None:
+    def test_all_hook_scripts_exist(self, plugin: PluginModel) -> None:
         """All scripts referenced in hooks must exist."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
-
-        # Extract all commands from hooks
-        commands = self._extract_commands(data)
+        commands = [command for entry in plugin.hooks for command in entry.commands]
 
         for command in commands:
             # Commands use ${CLAUDE_PLUGIN_ROOT} variable
@@ -47,7 +48,7 @@ class TestHooksLoading:
                 # Handle quoted paths
                 paths = re.findall(r'\$\{CLAUDE_PLUGIN_ROOT\}/([^\s"]+)', command)
                 for path in paths:
-                    full_path = plugin_root / path
+                    full_path = plugin.root / path
                     assert full_path.exists(), f"Hook script does not exist: {path}"
 
     def test_hook_scripts_are_executable(self, plugin_root: Path) -> None:
@@ -64,10 +65,9 @@ class TestHooksLoading:
                 is_executable = mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
                 assert is_executable, f"Script not executable: {script.name}"
 
-    def test_session_start_hook_exists(self, plugin_root: Path) -> None:
+    def test_session_start_hook_exists(self, plugin: PluginModel) -> None:
         """SessionStart hook should be defined for plugin initialization."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
+        data = plugin.hooks_config
 
         hooks = data.get("hooks", {})
         assert "SessionStart" in hooks, "Missing SessionStart hook"
@@ -85,20 +85,40 @@ class TestHooksLoading:
         run_hook = hooks_dir / "run-hook.cmd"
         assert run_hook.exists(), "Missing run-hook.cmd"
 
-    def _extract_commands(self, data: dict) -> list[str]:
-        """Extract all command strings from hooks config."""
-        commands = []
-
-        hooks = data.get("hooks", {})
-        for _hook_type, entries in hooks.items():
-            if isinstance(entries, list):
-                for entry in entries:
-                    if isinstance(entry, dict) and "hooks" in entry:
-                        for hook in entry["hooks"]:
-                            if isinstance(hook, dict) and "command" in hook:
-                                commands.append(hook["command"])
+    def test_every_hook_entry_is_dispatched(
+        self, plugin: PluginModel, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """Each hooks.json entry must be one dispatch.sh command with registered checks."""
+        data = plugin.hooks_config
+
+        for event, entries in data["hooks"].items():
+            for entry in entries:
+                matcher = entry["matcher"]
+                commands = [hook["command"] for hook in entry["hooks"]]
+                assert len(commands) == 1, (
+                    f"{event} '{matcher}' should carry exactly one command"
+                )
+                assert f'dispatch.sh {event} "{matcher}"' in commands[0], (
+                    f"{event} '{matcher}' command does not dispatch its own matcher"
+                )
+                assert (event, matcher) in hook_registry, (
+                    f"No checks registered for {event} '{matcher}'"
+                )
+
+    def test_registered_checks_exist(
+        self, plugin_root: Path, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """Every check in the dispatcher registry must be an executable hook script."""
+        import os
+        import stat
 
-        return commands
+        for (event, matcher), checks in hook_registry.items():
+            assert checks, f"Empty registry entry for {event} '{matcher}'"
+            for check in checks:
+                script = plugin_root / "hooks" / check
+                assert script.exists(), f"Registered check does not exist: {check}"
+                mode = os.stat(script).st_mode
+                assert mode & stat.S_IXUSR, f"Registered check not executable: {check}"
 
 
 class TestEnforcementHooks:
@@ -152,14 +172,15 @@ class TestEnforcementHooks:
         is_executable = mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
         assert is_executable, "workflow-skip-set.sh not executable"
 
-    def test_hooks_json_has_write_edit_enforcement(self, plugin_root: Path) -> None:
-        """hooks.json must have main-branch-protection and workflow-phase-check for Write|Edit.
+    def test_hooks_json_has_write_edit_enforcement(
+        self, plugin: PluginModel, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """Write|Edit must dispatch main-branch-protection and workflow-phase-check.
 
         Note: These are now PostToolUse warning hooks (not PreToolUse blocking) due to
         Claude Code runtime limitation (Issue #4669).
         """
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
+        data = plugin.hooks_config
 
         # Changed from PreToolUse to PostToolUse in v1.20.0
         posttool_hooks = data.get("hooks", {}).get("PostToolUse", [])
@@ -171,35 +192,27 @@ class TestEnforcementHooks:
             "Expected exactly one Write|Edit PostToolUse hook entry"
         )
 
-        commands = [
-            hook.get("command", "") for hook in write_edit_hooks[0].get("hooks", [])
-        ]
-        commands_str = " ".join(commands)
+        checks = hook_registry[("PostToolUse", "Write|Edit")]
 
-        assert "main-branch-protection.sh" in commands_str, (
+        assert "main-branch-protection.sh" in checks, (
             "Write|Edit hooks missing main-branch-protection.sh"
         )
-        assert "workflow-phase-check.sh" in commands_str, (
+        assert "workflow-phase-check.sh" in checks, (
             "Write|Edit hooks missing workflow-phase-check.sh"
         )
 
-    def test_hooks_json_has_phase_transitions(self, plugin_root: Path) -> None:
-        """hooks.json must have phase-transition.sh for skill completions."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
-
-        posttool_hooks = data.get("hooks", {}).get("PostToolUse", [])
-
-        # Extract all commands from PostToolUse hooks
-        commands = []
-        for hook_entry in posttool_hooks:
-            for hook in hook_entry.get("hooks", []):
-                cmd = hook.get("command", "")
-                if cmd:
-                    commands.append(cmd)
+    def test_hooks_json_has_phase_transitions(
+        self, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """The dispatcher must run phase-transition.sh for skill completions."""
+        posttool_checks = [
+            check
+            for (event, _matcher), checks in hook_registry.items()
+            if event == "PostToolUse"
+            for check in checks
+        ]
 
-        commands_str = " ".join(commands)
-        assert "phase-transition.sh" in commands_str, (
+        assert "phase-transition.sh" in posttool_checks, (
             "PostToolUse hooks missing phase-transition.sh"
         )
 
@@ -231,39 +244,37 @@ class TestSubagentTrackingHooks:
         is_executable = mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
         assert is_executable, "subagent-review-check.sh not executable"
 
-    def test_hooks_json_has_task_posttool_hook(self, plugin_root: Path) -> None:
-        """hooks.json must have Task PostToolUse hooks for subagent tracking and evidence checks."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
+    def test_hooks_json_has_task_posttool_hook(
+        self, plugin: PluginModel, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """Task PostToolUse must dispatch subagent tracking and evidence checks."""
+        data = plugin.hooks_config
 
         posttool_hooks = data.get("hooks", {}).get("PostToolUse", [])
         task_hooks = [h for h in posttool_hooks if h.get("matcher") == "Task"]
 
-        # Two Task hooks: subagent-dispatch-tracker.sh and implementer-evidence-check.sh
-        assert len(task_hooks) == 2, "Expected two Task PostToolUse hook entries"
+        # One dispatcher entry runs both subagent-dispatch-tracker.sh and
+        # implementer-evidence-check.sh
+        assert len(task_hooks) == 1, "Expected one Task PostToolUse hook entry"
 
-        # Collect all commands from all Task hooks
-        all_commands = []
-        for hook_entry in task_hooks:
-            for hook in hook_entry.get("hooks", []):
-                all_commands.append(hook.get("command", ""))
-        commands_str = " ".join(all_commands)
+        checks = hook_registry[("PostToolUse", "Task")]
 
-        assert "subagent-dispatch-tracker.sh" in commands_str, (
+        assert "subagent-dispatch-tracker.sh" in checks, (
             "Task PostToolUse hooks missing subagent-dispatch-tracker.sh"
         )
-        assert "implementer-evidence-check.sh" in commands_str, (
+        assert "implementer-evidence-check.sh" in checks, (
             "Task PostToolUse hooks missing implementer-evidence-check.sh"
         )
 
-    def test_hooks_json_has_todowrite_posttool_hook(self, plugin_root: Path) -> None:
-        """hooks.json must have subagent-review-check.sh for TodoWrite PostToolUse.
+    def test_hooks_json_has_todowrite_posttool_hook(
+        self, plugin: PluginModel, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """hooks.json must dispatch subagent-review-check.sh for TodoWrite PostToolUse.
 
         Note: Changed from PreToolUse to PostToolUse in v1.20.0 due to
         Claude Code runtime limitation (Issue #4669).
         """
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
+        data = plugin.hooks_config
 
         # Changed from PreToolUse to PostToolUse in v1.20.0
         posttool_hooks = data.get("hooks", {}).get("PostToolUse", [])
@@ -273,75 +284,117 @@ class TestSubagentTrackingHooks:
             "Expected exactly one TodoWrite PostToolUse hook entry"
         )
 
-        commands = [
-            hook.get("command", "") for hook in todowrite_hooks[0].get("hooks", [])
-        ]
-        commands_str = " ".join(commands)
-
-        assert "subagent-review-check.sh" in commands_str, (
+        assert "subagent-review-check.sh" in hook_registry[("PostToolUse", "TodoWrite")], (
             "TodoWrite PostToolUse hooks missing subagent-review-check.sh"
         )
 
     def test_dispatch_tracker_checks_implementing_phase(
-        self, plugin_root: Path
+        self,
+        tmp_path: Path,
+        run_hook: Callable[..., subprocess.CompletedProcess[str]],
+        session_state: Callable[[Path], dict[str, list[str]]],
     ) -> None:
-        """subagent-dispatch-tracker.sh must check for implementing phase."""
-        script = plugin_root / "hooks" / "subagent-dispatch-tracker.sh"
-        content = script.read_text()
-
-        assert "implementing" in content, (
+        """subagent-dispatch-tracker.sh must only track in the implementing phase."""
+        phase_file = tmp_path / ".workflow_phase"
+
+        phase_file.write_text("brainstorming")
+        run_hook(
+            "subagent-dispatch-tracker.sh",
+            session_dir=tmp_path,
+            tool_name="Task",
+            tool_input='{"subagent_type": "code-implementer"}',
+        )
+        assert "dispatch" not in session_state(tmp_path), (
             "subagent-dispatch-tracker.sh should check for implementing phase"
         )
-        assert ".workflow_phase" in content, (
-            "subagent-dispatch-tracker.sh should read .workflow_phase file"
+
+        phase_file.write_text("implementing")
+        run_hook(
+            "subagent-dispatch-tracker.sh",
+            session_dir=tmp_path,
+            tool_name="Task",
+            tool_input='{"subagent_type": "code-implementer"}',
+        )
+        assert session_state(tmp_path)["dispatch"] == ["code-implementer"], (
+            "subagent-dispatch-tracker.sh should read the workflow phase"
         )
 
-    def test_review_check_checks_implementing_phase(self, plugin_root: Path) -> None:
-        """subagent-review-check.sh must check for implementing phase."""
-        script = plugin_root / "hooks" / "subagent-review-check.sh"
-        content = script.read_text()
+    def test_review_check_checks_implementing_phase(
+        self, tmp_path: Path, run_hook: Callable[..., subprocess.CompletedProcess[str]]
+    ) -> None:
+        """subagent-review-check.sh must only warn in the implementing phase."""
+        (tmp_path / ".subagent_dispatch").write_text("code-implementer\n")
+        (tmp_path / ".workflow_phase").write_text("verifying")
+
+        result = run_hook(
+            "subagent-review-check.sh",
+            session_dir=tmp_path,
+            tool_name="TodoWrite",
+            tool_input=COMPLETED_TODO,
+        )
 
-        assert "implementing" in content, (
+        assert result.returncode == 0
+        assert json.loads(result.stdout) == {}, (
             "subagent-review-check.sh should check for implementing phase"
         )
-        assert ".workflow_phase" in content, (
-            "subagent-review-check.sh should read .workflow_phase file"
-        )
 
-    def test_both_hooks_respect_workflow_skip(self, plugin_root: Path) -> None:
+    def test_both_hooks_respect_workflow_skip(
+        self,
+        tmp_path: Path,
+        run_hook: Callable[..., subprocess.CompletedProcess[str]],
+        session_state: Callable[[Path], dict[str, list[str]]],
+    ) -> None:
         """Both tracking hooks must respect the .workflow_skip file."""
-        tracker = plugin_root / "hooks" / "subagent-dispatch-tracker.sh"
-        checker = plugin_root / "hooks" / "subagent-review-check.sh"
-
-        tracker_content = tracker.read_text()
-        checker_content = checker.read_text()
-
-        assert ".workflow_skip" in tracker_content, (
+        (tmp_path / ".workflow_phase").write_text("implementing")
+        (tmp_path / ".workflow_skip").touch()
+
+        run_hook(
+            "subagent-dispatch-tracker.sh",
+            session_dir=tmp_path,
+            tool_name="Task",
+            tool_input='{"subagent_type": "code-implementer"}',
+        )
+        assert "dispatch" not in session_state(tmp_path), (
             "subagent-dispatch-tracker.sh should check for .workflow_skip"
         )
-        assert ".workflow_skip" in checker_content, (
+
+        (tmp_path / ".subagent_dispatch").write_text("code-implementer\n")
+        result = run_hook(
+            "subagent-review-check.sh",
+            session_dir=tmp_path,
+            tool_name="TodoWrite",
+            tool_input=COMPLETED_TODO,
+        )
+        assert json.loads(result.stdout) == {}, (
             "subagent-review-check.sh should check for .workflow_skip"
         )
 
-    def test_review_check_warns_on_missing_reviewers(self, plugin_root: Path) -> None:
+    def test_review_check_warns_on_missing_reviewers(
+        self, tmp_path: Path, run_hook: Callable[..., subprocess.CompletedProcess[str]]
+    ) -> None:
         """subagent-review-check.sh must warn when reviewers are missing.
 
         Note: Changed from blocking to warning in v1.20.0 due to
         Claude Code runtime limitation (Issue #4669).
         """
-        script = plugin_root / "hooks" / "subagent-review-check.sh"
-        content = script.read_text()
-
-        assert "spec-reviewer" in content, (
-            "subagent-review-check.sh should check for spec-reviewer"
-        )
-        assert "quality-reviewer" in content, (
-            "subagent-review-check.sh should check for quality-reviewer"
+        (tmp_path / ".workflow_phase").write_text("implementing")
+        (tmp_path / ".subagent_dispatch").write_text("code-implementer\nspec-reviewer\n")
+
+        result = run_hook(
+            "subagent-review-check.sh",
+            session_dir=tmp_path,
+            tool_name="TodoWrite",
+            tool_input=COMPLETED_TODO,
         )
+        output = json.loads(result.stdout)
+
         # Changed from '"decision": "block"' to '"systemMessage"' in v1.20.0
-        assert '"systemMessage"' in content, (
+        assert "systemMessage" in output, (
             "subagent-review-check.sh should output warning message when reviewers missing"
         )
-        assert "WARNING:" in content, (
+        assert "WARNING:" in output["systemMessage"], (
             "subagent-review-check.sh should output warning reason"
         )
+        assert "Missing reviewers: quality-reviewer\n" in output["systemMessage"], (
+            "subagent-review-check.sh should report only the missing quality-reviewer"
+        )
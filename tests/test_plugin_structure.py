@@ -1,8 +1,9 @@
 """Tests for plugin directory structure and file presence."""
 
-import json
 from pathlib import Path
 
+from .plugin_model import PluginModel
+
 
 class TestPluginManifest:
     """Tests for .claude-plugin/plugin.json."""
@@ -12,25 +13,19 @@ class TestPluginManifest:
         plugin_json = plugin_root / ".claude-plugin" / "plugin.json"
         assert plugin_json.exists(), f"Missing: {plugin_json}"
 
-    def test_plugin_json_valid(self, plugin_root: Path) -> None:
+    def test_plugin_json_valid(self, plugin: PluginModel) -> None:
         """Plugin manifest must be valid JSON."""
-        plugin_json = plugin_root / ".claude-plugin" / "plugin.json"
-        content = plugin_json.read_text()
-        data = json.loads(content)
-        assert isinstance(data, dict)
+        assert isinstance(plugin.manifest, dict)
 
-    def test_plugin_json_has_name(self, plugin_root: Path) -> None:
+    def test_plugin_json_has_name(self, plugin: PluginModel) -> None:
         """Plugin manifest must have name field."""
-        plugin_json = plugin_root / ".claude-plugin" / "plugin.json"
-        data = json.loads(plugin_json.read_text())
+        data = plugin.manifest
         assert "name" in data, "plugin.json missing 'name' field"
         assert data["name"] == "workflow-ecosystem"
 
-    def test_plugin_json_has_version(self, plugin_root: Path) -> None:
+    def test_plugin_json_has_version(self, plugin: PluginModel) -> None:
         """Plugin manifest must have version field."""
-        plugin_json = plugin_root / ".claude-plugin" / "plugin.json"
-        data = json.loads(plugin_json.read_text())
-        assert "version" in data, "plugin.json missing 'version' field"
+        assert "version" in plugin.manifest, "plugin.json missing 'version' field"
 
 
 class TestSkillsDirectory:
@@ -59,16 +54,15 @@ class TestSkillsDirectory:
             assert skill_file.exists(), f"Missing: {skill_file}"
 
     def test_skill_md_has_frontmatter(
-        self, skills_dir: Path, expected_skills: list[str]
+        self, plugin: PluginModel, expected_skills: list[str]
     ) -> None:
         """Each SKILL.md must have YAML frontmatter with name and description."""
         for skill_name in expected_skills:
-            skill_file = skills_dir / skill_name / "SKILL.md"
-            content = skill_file.read_text()
-            assert content.startswith("---"), f"{skill_file} missing frontmatter"
-            assert "name:" in content, f"{skill_file} missing 'name' in frontmatter"
-            assert "description:" in content, (
-                f"{skill_file} missing 'description' in frontmatter"
+            skill = plugin.skills[skill_name]
+            assert skill.frontmatter is not None, f"{skill.path} missing frontmatter"
+            assert "name" in skill.frontmatter, f"{skill.path} missing 'name' in frontmatter"
+            assert "description" in skill.frontmatter, (
+                f"{skill.path} missing 'description' in frontmatter"
             )
 
 
@@ -119,19 +113,14 @@ class TestHooksDirectory:
         hooks_json = hooks_dir / "hooks.json"
         assert hooks_json.exists(), f"Missing: {hooks_json}"
 
-    def test_hooks_json_valid(self, hooks_dir: Path) -> None:
+    def test_hooks_json_valid(self, plugin: PluginModel) -> None:
         """hooks.json must be valid JSON."""
-        hooks_json = hooks_dir / "hooks.json"
-        content = hooks_json.read_text()
-        data = json.loads(content)
-        assert isinstance(data, dict)
-        assert "hooks" in data
+        assert isinstance(plugin.hooks_config, dict)
+        assert "hooks" in plugin.hooks_config
 
-    def test_session_start_hook_configured(self, hooks_dir: Path) -> None:
+    def test_session_start_hook_configured(self, plugin: PluginModel) -> None:
         """SessionStart hook must be configured."""
-        hooks_json = hooks_dir / "hooks.json"
-        data = json.loads(hooks_json.read_text())
-        assert "SessionStart" in data["hooks"], "Missing SessionStart hook"
+        assert "SessionStart" in plugin.hooks_config["hooks"], "Missing SessionStart hook"
 
     def test_session_start_script_exists(self, hooks_dir: Path) -> None:
         """session-start.sh must exist."""
@@ -0,0 +1,107 @@
+"""Tests for the run-hook.cmd fast path (hooks/lib/prefilter.sh)."""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from .conftest import hook_env
+
+# Commands the hooks may start; each gets a logging wrapper on PATH
+TRACED = ("bash", "git", "grep", "awk", "sed", "cat", "find", "stat", "mkdir", "mv", "rm", "flock")
+
+# (event, matcher, tool name, tool input, bash started)
+CASES = [
+    ("PreToolUse", "Bash", "Bash", {"command": "ls -la"}, False),
+    ("PreToolUse", "Bash", "Bash", {"command": "pytest -q tests/"}, False),
+    ("PreToolUse", "Bash", "Bash", {"command": "git commit -m 'x'"}, True),
+    ("PreToolUse", "Task", "Task", {"subagent_type": "Explore", "prompt": "find uses"}, False),
+    ("PreToolUse", "Task", "Task", {"subagent_type": "code-implementer", "prompt": "## Task 1"}, True),
+    ("PostToolUse", "Task", "Task", {"subagent_type": "general-purpose", "prompt": "x"}, False),
+    ("PostToolUse", "Task", "Task", {"subagent_type": "spec-reviewer", "prompt": "x"}, True),
+    ("PostToolUse", "TodoWrite", "TodoWrite", {"todos": [{"content": "a", "status": "pending"}]}, False),
+    ("PostToolUse", "TodoWrite", "TodoWrite", {"todos": [{"content": "a", "status": "completed"}]}, True),
+    ("PostToolUse", "Write|Edit", "Write", {"file_path": "docs/backlogs/plan.md", "content": "x"}, True),
+    ("PostToolUse", "Write|Edit", "Edit", {"file_path": "src/app.py"}, True),
+]
+
+
+@pytest.fixture
+def traced_path(tmp_path: Path) -> tuple[str, Path]:
+    """PATH whose TRACED commands log "<name>" to a spawn log, and that log."""
+    shim = tmp_path / "shim"
+    shim.mkdir()
+    log = tmp_path / "spawns.log"
+    log.touch()
+    for name in TRACED:
+        real = shutil.which(name)
+        if real is None:
+            continue
+        wrapper = shim / name
+        wrapper.write_text(f'#!/bin/sh\necho {name} >> "{log}"\nexec {real} "$@"\n')
+        wrapper.chmod(0o755)
+    return f"{shim}{os.pathsep}{os.environ['PATH']}", log
+
+
+@pytest.fixture
+def busy_session(tmp_path: Path) -> Path:
+    """A session mid-implementation, where every check has state to act on."""
+    session = tmp_path / "session"
+    session.mkdir()
+    (session / ".workflow_state").write_text("phase\timplementing\ndispatch\tcode-implementer\n")
+    return session
+
+
+def run_event(
+    script: list[str], session: Path, cwd: Path, tool_name: str, tool_input: str, path: str
+) -> subprocess.CompletedProcess[str]:
+    env = hook_env({"PATH": path, "CLAUDE_SESSION_DIR": str(session)})
+    env.update(CLAUDE_TOOL_NAME=tool_name, CLAUDE_TOOL_INPUT=tool_input, CLAUDE_TOOL_OUTPUT="")
+    env["XDG_CACHE_HOME"] = str(session / ".cache")
+    return subprocess.run(script, capture_output=True, text=True, env=env, cwd=cwd, timeout=10)
+
+
+class TestPrefilter:
+    """No-op events are answered by run-hook.cmd without starting bash."""
+
+    @pytest.mark.parametrize(
+        ("event", "matcher", "tool_name", "tool_input", "runs"),
+        CASES,
+        ids=[f"{c[0]}-{c[2]}-{'run' if c[4] else 'skip'}-{i}" for i, c in enumerate(CASES)],
+    )
+    def test_spawns_per_event(
+        self,
+        hooks_dir: Path,
+        traced_path: tuple[str, Path],
+        busy_session: Path,
+        tmp_path: Path,
+        event: str,
+        matcher: str,
+        tool_name: str,
+        tool_input: dict[str, object],
+        runs: bool,
+    ) -> None:
+        path, log = traced_path
+        payload = json.dumps(tool_input)
+        client = ["sh", str(hooks_dir / "run-hook.cmd"), "dispatch.sh", event, matcher]
+
+        result = run_event(client, busy_session, tmp_path, tool_name, payload, path)
+
+        assert result.returncode == 0, result.stderr
+        spawns = log.read_text().split()
+        if runs:
+            assert spawns.count("bash") == 1
+        else:
+            assert spawns == []
+            assert result.stdout == "{}\n"
+            # The fast path must agree with what the checks would have said
+            direct = [str(hooks_dir / "dispatch.sh"), event, matcher]
+            full = run_event(direct, busy_session, tmp_path, tool_name, payload, os.environ["PATH"])
+            assert json.loads(full.stdout) == {}
+
+    def test_unfiltered_events_always_dispatch(self, hooks_dir: Path) -> None:
+        script = f'. "{hooks_dir}/lib/prefilter.sh"; hook_prefilter SessionStart startup'
+        assert subprocess.run(["sh", "-c", script], env={}).returncode == 0
@@ -1,53 +1,42 @@
 """Tests for JSON schema validation."""
 
 import json
+from collections.abc import Callable
 from pathlib import Path
+from subprocess import CompletedProcess
+from typing import Any
 
 import jsonschema
 import pytest
 
+from .conftest import hook_output, schema_validator
+from .plugin_model import PluginModel
 
-@pytest.fixture
-def plugin_schema() -> dict:
-    """Load the plugin.json schema."""
-    schema_path = Path(__file__).parent / "schemas" / "plugin.schema.json"
-    return json.loads(schema_path.read_text())
-
-
-@pytest.fixture
-def hooks_schema() -> dict:
-    """Load the hooks.json schema."""
-    schema_path = Path(__file__).parent / "schemas" / "hooks.schema.json"
-    return json.loads(schema_path.read_text())
+SCHEMA_NAMES = sorted(
+    path.name.removesuffix(".schema.json")
+    for path in (Path(__file__).parent / "schemas").glob("*.schema.json")
+)
 
 
 class TestPluginJsonSchema:
     """Tests for plugin.json schema compliance."""
 
-    def test_plugin_json_matches_schema(
-        self, plugin_root: Path, plugin_schema: dict
-    ) -> None:
+    def test_plugin_json_matches_schema(self, plugin: PluginModel) -> None:
         """plugin.json must match the schema."""
-        plugin_json = plugin_root / ".claude-plugin" / "plugin.json"
-        data = json.loads(plugin_json.read_text())
-        jsonschema.validate(instance=data, schema=plugin_schema)
+        schema_validator("plugin").validate(plugin.manifest)
 
-    def test_plugin_name_is_kebab_case(self, plugin_root: Path) -> None:
+    def test_plugin_name_is_kebab_case(self, plugin: PluginModel) -> None:
         """Plugin name must be kebab-case."""
-        plugin_json = plugin_root / ".claude-plugin" / "plugin.json"
-        data = json.loads(plugin_json.read_text())
-        name = data.get("name", "")
+        name = plugin.manifest.get("name", "")
         assert name == name.lower(), f"Name '{name}' must be lowercase"
         assert " " not in name, f"Name '{name}' must not contain spaces"
         assert "_" not in name, f"Name '{name}' should use hyphens, not underscores"
 
-    def test_plugin_version_is_semver(self, plugin_root: Path) -> None:
+    def test_plugin_version_is_semver(self, plugin: PluginModel) -> None:
         """Plugin version must follow semver."""
         import re
 
-        plugin_json = plugin_root / ".claude-plugin" / "plugin.json"
-        data = json.loads(plugin_json.read_text())
-        version = data.get("version", "")
+        version = plugin.manifest.get("version", "")
         semver_pattern = r"^\d+\.\d+\.\d+(-[a-zA-Z0-9.]+)?$"
         assert re.match(semver_pattern, version), (
             f"Version '{version}' is not valid semver"
@@ -57,26 +46,18 @@ class TestPluginJsonSchema:
 class TestHooksJsonSchema:
     """Tests for hooks.json schema compliance."""
 
-    def test_hooks_json_matches_schema(
-        self, plugin_root: Path, hooks_schema: dict
-    ) -> None:
+    def test_hooks_json_matches_schema(self, plugin: PluginModel) -> None:
         """hooks.json must match the schema."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
-        jsonschema.validate(instance=data, schema=hooks_schema)
+        schema_validator("hooks").validate(plugin.hooks_config)
 
-    def test_hooks_uses_plugin_root_variable(self, plugin_root: Path) -> None:
+    def test_hooks_uses_plugin_root_variable(self, plugin: PluginModel) -> None:
         """Hook commands should use CLAUDE_PLUGIN_ROOT variable."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        content = hooks_json.read_text()
         # Should use CLAUDE_PLUGIN_ROOT for plugins, not CLAUDE_PROJECT_DIR
-        assert "CLAUDE_PLUGIN_ROOT" in content, "Hooks should use ${CLAUDE_PLUGIN_ROOT}"
+        assert "CLAUDE_PLUGIN_ROOT" in plugin.hooks_text, "Hooks should use ${CLAUDE_PLUGIN_ROOT}"
 
-    def test_session_start_has_valid_matcher(self, plugin_root: Path) -> None:
+    def test_session_start_has_valid_matcher(self, plugin: PluginModel) -> None:
         """SessionStart hook should have a valid matcher pattern."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
-        session_start = data.get("hooks", {}).get("SessionStart", [])
+        session_start = plugin.hooks_config.get("hooks", {}).get("SessionStart", [])
         assert len(session_start) > 0, "No SessionStart hooks defined"
 
         for entry in session_start:
@@ -89,3 +70,67 @@ class TestHooksJsonSchema:
                     re.compile(pattern)
                 except re.error as e:
                     pytest.fail(f"Invalid matcher regex '{pattern}': {e}")
+
+
+class TestSchemaCache:
+    """Schemas under tests/schemas/ compile once and are valid themselves."""
+
+    @pytest.mark.parametrize("name", SCHEMA_NAMES)
+    def test_schema_is_valid(self, name: str) -> None:
+        validator = schema_validator(name)
+        assert schema_validator(name) is validator
+        type(validator).check_schema(validator.schema)
+
+
+class TestHookOutputSchema:
+    """Every response hook_flush can print matches hook-output.schema.json."""
+
+    VALID: list[dict[str, Any]] = [
+        {},
+        {"hookSpecificOutput": {"additionalContext": "Reminder"}},
+        {"hookSpecificOutput": {"hookEventName": "SessionStart", "additionalContext": "Intro"}},
+        {"decision": "block", "reason": "Tests first"},
+        {"decision": "block", "reason": "x", "systemMessage": "y",
+         "hookSpecificOutput": {"additionalContext": "z"}},
+    ]
+    INVALID: list[dict[str, Any]] = [
+        {"decision": "block"},
+        {"reason": "no decision"},
+        {"decision": "allow", "reason": "x"},
+        {"systemMessage": ""},
+        {"hookSpecificOutput": {}},
+        {"hookSpecificOutput": {"additionalContext": "x", "extra": 1}},
+        {"context": "unknown top-level key"},
+    ]
+
+    @pytest.mark.parametrize("output", VALID, ids=range(len(VALID)))
+    def test_valid(self, output: dict[str, Any]) -> None:
+        schema_validator("hook-output").validate(output)
+
+    @pytest.mark.parametrize("output", INVALID, ids=range(len(INVALID)))
+    def test_invalid(self, output: dict[str, Any]) -> None:
+        with pytest.raises(jsonschema.ValidationError):
+            schema_validator("hook-output").validate(output)
+
+    def test_hook_responses_match(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        """Context, message and block responses from real hooks validate."""
+        (tmp_path / ".workflow_state").write_text("phase\timplementing\n")
+        commit = json.dumps({"command": "git commit -m 'x'"})
+        responses = [
+            run_hook("session-start.sh", session_dir=tmp_path),
+            run_hook(
+                "dispatch.sh", "PreToolUse", "Bash",
+                session_dir=tmp_path, tool_name="Bash", tool_input=commit,
+            ),
+            run_hook(
+                "dispatch.sh", "PostToolUse", "Task",
+                session_dir=tmp_path, tool_name="Task",
+                tool_input=json.dumps({"subagent_type": "code-implementer"}),
+                tool_output="Implemented it, should work",
+            ),
+        ]
+        for result in responses:
+            assert result.returncode == 0, result.stderr
+            assert hook_output(result.stdout), result.stdout
@@ -0,0 +1,167 @@
+"""Behavioral tests for SessionStart context injection."""
+
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import CompletedProcess
+
+from .conftest import git
+
+# Generous enough for slow CI machines; the old per-character escaper took
+# minutes on this input
+LARGE_SKILL_BUDGET_SECONDS = 2.0
+
+
+def session_context(result: CompletedProcess[str]) -> str:
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout)
+    assert output["hookSpecificOutput"]["hookEventName"] == "SessionStart"
+    return output["hookSpecificOutput"]["additionalContext"]
+
+
+class TestSessionStartContext:
+    """SessionStart must inject skill files verbatim as valid JSON."""
+
+    def test_injects_using_ecosystem_verbatim(
+        self, plugin_root: Path, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        context = session_context(run_hook("session-start.sh", session_dir=tmp_path))
+
+        skill = (plugin_root / "skills" / "using-ecosystem" / "SKILL.md").read_text()
+        assert skill.rstrip("\n") in context
+        assert "'using-ecosystem' skill - your introduction" in context
+
+    def test_escapes_json_special_characters(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        skill = tmp_path / "tricky" / "SKILL.md"
+        skill.parent.mkdir()
+        text = 'Quote " backslash \\ tab \t cr \r bell \x07\n\n\nend'
+        skill.write_bytes(text.encode() + b"\n\n")
+
+        context = session_context(
+            run_hook(
+                "session-start.sh",
+                session_dir=tmp_path,
+                env={"WORKFLOW_SESSION_SKILLS": str(skill)},
+            )
+        )
+        assert f"\n\n{text}\n\n</EXTREMELY_IMPORTANT>" in context
+
+    def test_injects_configured_skill_list(
+        self, plugin_root: Path, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        context = session_context(
+            run_hook(
+                "session-start.sh",
+                session_dir=tmp_path,
+                env={"WORKFLOW_SESSION_SKILLS": "using-ecosystem, verification"},
+            )
+        )
+
+        for name in ("using-ecosystem", "verification"):
+            skill = (plugin_root / "skills" / name / "SKILL.md").read_text()
+            assert skill.rstrip("\n") in context, f"{name} not injected"
+        assert context.index("'using-ecosystem'") < context.index("'verification'")
+
+    def test_missing_skill_reports_error(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        context = session_context(
+            run_hook(
+                "session-start.sh",
+                session_dir=tmp_path,
+                env={"WORKFLOW_SESSION_SKILLS": "no-such-skill"},
+            )
+        )
+        assert "Error reading no-such-skill skill" in context
+
+    def test_large_skill_within_time_budget(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        """A 200 KB skill must be escaped in linear time."""
+        line = 'Use "quotes", back\\slashes and\ttabs in every line of the skill.\n'
+        text = line * (200 * 1024 // len(line) + 1)
+        skill = tmp_path / "large" / "SKILL.md"
+        skill.parent.mkdir()
+        skill.write_text(text)
+
+        start = time.monotonic()
+        result = run_hook(
+            "session-start.sh",
+            session_dir=tmp_path,
+            env={"WORKFLOW_SESSION_SKILLS": str(skill)},
+        )
+        elapsed = time.monotonic() - start
+
+        assert text.rstrip("\n") in session_context(result)
+        assert elapsed < LARGE_SKILL_BUDGET_SECONDS, (
+            f"200 KB skill took {elapsed:.2f}s (budget {LARGE_SKILL_BUDGET_SECONDS}s)"
+        )
+
+
+class TestSessionStartCache:
+    """The escaped skill payload is cached and keyed on content and version."""
+
+    def _run(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path, skill: Path
+    ) -> str:
+        return session_context(
+            run_hook(
+                "session-start.sh",
+                session_dir=tmp_path,
+                env={"WORKFLOW_SESSION_SKILLS": str(skill)},
+            )
+        )
+
+    def _cache_files(self, tmp_path: Path) -> list[Path]:
+        return sorted((tmp_path / ".cache" / "workflow-ecosystem" / "session-start").iterdir())
+
+    def test_payload_written_to_cache(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        skill = tmp_path / "cached" / "SKILL.md"
+        skill.parent.mkdir()
+        skill.write_text("Cached skill body\n")
+
+        first = self._run(run_hook, tmp_path, skill)
+        [cache] = self._cache_files(tmp_path)
+        assert "Cached skill body" in cache.read_text()
+
+        # Warm runs serve the same payload
+        assert self._run(run_hook, tmp_path, skill) == first
+
+    def test_content_change_invalidates_cache(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        skill = tmp_path / "cached" / "SKILL.md"
+        skill.parent.mkdir()
+        skill.write_text("Version one\n")
+        assert "Version one" in self._run(run_hook, tmp_path, skill)
+
+        skill.write_text("Version two\n")
+        context = self._run(run_hook, tmp_path, skill)
+        assert "Version two" in context
+        assert "Version one" not in context
+
+    def test_branch_fragment_stays_dynamic(
+        self, run_hook: Callable[..., CompletedProcess[str]], hook_repo: Path, tmp_path: Path
+    ) -> None:
+        repo = hook_repo
+        git(repo, "checkout", "-q", "main")
+        skill = tmp_path / "cached" / "SKILL.md"
+        skill.parent.mkdir()
+        skill.write_text("Body\n")
+        env = {"WORKFLOW_SESSION_SKILLS": str(skill)}
+
+        on_main = session_context(
+            run_hook("session-start.sh", session_dir=tmp_path, cwd=repo, env=env)
+        )
+        assert "Branch detected" not in on_main
+
+        git(repo, "checkout", "-q", "-b", "feat/cache")
+        on_branch = session_context(
+            run_hook("session-start.sh", session_dir=tmp_path, cwd=repo, env=env)
+        )
+        assert "On 'feat/cache'" in on_branch
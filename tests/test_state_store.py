@@ -0,0 +1,253 @@
+"""Tests for the session state store (hooks/lib/state.sh) and its namespaces."""
+
+import json
+import os
+import subprocess
+import time
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import CompletedProcess
+
+from .conftest import hook_env
+
+StateReader = Callable[[Path], dict[str, list[str]]]
+
+
+class TestStateStore:
+    """All hooks read and write session state through .workflow_state."""
+
+    def test_legacy_files_migrated_and_removed(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        session_state: StateReader,
+        tmp_path: Path,
+    ) -> None:
+        (tmp_path / ".workflow_phase").write_text("implementing\n")
+        (tmp_path / ".subagent_dispatch").write_text("code-implementer\nspec-reviewer\n")
+        (tmp_path / ".needs_refix").touch()
+        (tmp_path / ".backlog_todos").write_text("task-1:tests/test_a.py\n")
+
+        result = run_hook("workflow-state.sh", "get", "phase", session_dir=tmp_path)
+
+        assert result.stdout == "implementing\n"
+        assert session_state(tmp_path) == {
+            "phase": ["implementing"],
+            "dispatch": ["code-implementer", "spec-reviewer"],
+            "needs_refix": ["1"],
+            "todo": ["task-1:tests/test_a.py"],
+        }
+        for name in (".workflow_phase", ".subagent_dispatch", ".needs_refix", ".backlog_todos"):
+            assert not (tmp_path / name).exists(), name
+
+    def test_check_writes_state_once(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        session_state: StateReader,
+        tmp_path: Path,
+    ) -> None:
+        run_hook("workflow-state.sh", "set", "phase", "implementing", session_dir=tmp_path)
+        run_hook(
+            "subagent-dispatch-tracker.sh",
+            session_dir=tmp_path,
+            tool_name="Task",
+            tool_input=json.dumps({"subagent_type": "code-implementer"}),
+        )
+
+        assert session_state(tmp_path) == {
+            "phase": ["implementing"],
+            "dispatch": ["code-implementer"],
+        }
+        assert not list(tmp_path.glob(".workflow_state.*[0-9]")), "temp file left behind"
+
+    def test_concurrent_adds_are_not_lost(
+        self, hooks_dir: Path, session_state: StateReader, tmp_path: Path
+    ) -> None:
+        env = hook_env({"CLAUDE_SESSION_DIR": str(tmp_path)})
+        script = str(hooks_dir / "workflow-state.sh")
+        procs = [
+            subprocess.Popen([script, "add", "todo", f"task-{n}:tests/test_{n}.py"], env=env)
+            for n in range(12)
+        ]
+        assert all(proc.wait() == 0 for proc in procs)
+
+        assert sorted(session_state(tmp_path)["todo"]) == sorted(
+            f"task-{n}:tests/test_{n}.py" for n in range(12)
+        )
+
+    def test_set_empty_value_removes_key(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        session_state: StateReader,
+        tmp_path: Path,
+    ) -> None:
+        run_hook("workflow-state.sh", "set", "skip", "1", session_dir=tmp_path)
+        run_hook("workflow-state.sh", "add", "dispatch", "code-implementer", session_dir=tmp_path)
+        run_hook("workflow-state.sh", "set", "skip", session_dir=tmp_path)
+
+        assert session_state(tmp_path) == {"dispatch": ["code-implementer"]}
+
+    def test_del_removes_matching_entries(
+        self,
+        run_hook: Callable[..., CompletedProcess[str]],
+        session_state: StateReader,
+        tmp_path: Path,
+    ) -> None:
+        for entry in ("spec-reviewer", "task-1:spec-reviewer", "task-2:spec-reviewer"):
+            run_hook("workflow-state.sh", "add", "dispatch", entry, session_dir=tmp_path)
+
+        run_hook("workflow-state.sh", "del", "dispatch", "task-1:*", session_dir=tmp_path)
+        assert session_state(tmp_path) == {
+            "dispatch": ["spec-reviewer", "task-2:spec-reviewer"]
+        }
+        run_hook("workflow-state.sh", "del", "dispatch", "!*:*", session_dir=tmp_path)
+        assert session_state(tmp_path) == {"dispatch": ["task-2:spec-reviewer"]}
+
+    def test_reset_clears_store_and_legacy_files(
+        self, run_hook: Callable[..., CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        run_hook("workflow-state.sh", "set", "phase", "verifying", session_dir=tmp_path)
+        (tmp_path / ".workflow_skip").touch()
+
+        result = run_hook("workflow-state.sh", "reset", session_dir=tmp_path)
+
+        assert result.returncode == 0, result.stderr
+        assert not (tmp_path / ".workflow_state").exists()
+        assert not (tmp_path / ".workflow_skip").exists()
+        assert run_hook("workflow-state.sh", "dump", session_dir=tmp_path).stdout == ""
+
+
+class TestSessionNamespaces:
+    """Without CLAUDE_SESSION_DIR, state is namespaced per session and repository."""
+
+    @staticmethod
+    def _run(
+        hooks_dir: Path, state_root: Path, cwd: Path, *args: str, **env_vars: str
+    ) -> CompletedProcess[str]:
+        env = hook_env({"WORKFLOW_STATE_DIR": str(state_root), **env_vars})
+        return subprocess.run(
+            [str(hooks_dir / "workflow-state.sh"), *args],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=cwd,
+        )
+
+    def test_sessions_and_repositories_are_isolated(
+        self, hooks_dir: Path, tmp_path: Path
+    ) -> None:
+        state_root = tmp_path / "state"
+        repo_a, repo_b = tmp_path / "a", tmp_path / "b"
+        for repo in (repo_a, repo_b):
+            (repo / ".git").mkdir(parents=True)
+        (repo_a / "src").mkdir()
+
+        def state(cwd: Path, session: str, *args: str) -> str:
+            result = self._run(hooks_dir, state_root, cwd, *args, CLAUDE_SESSION_ID=session)
+            assert result.returncode == 0, result.stderr
+            return result.stdout
+
+        state(repo_a / "src", "s1", "set", "phase", "implementing")
+        state(repo_a, "s2", "set", "phase", "brainstorming")
+        state(repo_b, "s1", "set", "phase", "verifying")
+
+        def phase(cwd: Path, session: str) -> str:
+            return state(cwd, session, "get", "phase")
+
+        assert phase(repo_a, "s1") == "implementing\n"
+        assert phase(repo_a, "s2") == "brainstorming\n"
+        assert phase(repo_b, "s1") == "verifying\n"
+        flat = str(repo_a).replace("/", "%")
+        assert (state_root / f"s1.{flat}" / ".workflow_state").exists()
+        assert (state_root.stat().st_mode & 0o777) == 0o700
+
+    def test_cli_without_session_id_uses_hook_session(
+        self, hooks_dir: Path, hook_repo: Path, tmp_path: Path
+    ) -> None:
+        state_root = tmp_path / "state"
+        env = hook_env(
+            {
+                "WORKFLOW_STATE_DIR": str(state_root),
+                "CLAUDE_SESSION_ID": "s1",
+                "XDG_CACHE_HOME": str(tmp_path / "cache"),
+            }
+        )
+        # SessionStart on a feature branch records phase "branched"
+        started = subprocess.run(
+            [str(hooks_dir / "session-start.sh")],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=hook_repo,
+        )
+        assert started.returncode == 0, started.stderr
+
+        result = self._run(hooks_dir, state_root, hook_repo / "src", "get", "phase")
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout == "branched\n"
+        assert not list(state_root.glob("default.*"))
+
+    def _age(self, path: Path, seconds: float) -> None:
+        """Set the mtime of a path and everything directly in it to `seconds` ago."""
+        then = time.time() - seconds
+        for item in (*path.iterdir(), path):
+            os.utime(item, (then, then))
+
+    def _start(self, hooks_dir: Path, tmp_path: Path, state_root: Path) -> None:
+        env = hook_env(
+            {
+                "WORKFLOW_STATE_DIR": str(state_root),
+                "WORKFLOW_STATE_IDLE_MINUTES": "120",
+                "XDG_CACHE_HOME": str(tmp_path / "cache"),
+            }
+        )
+        result = subprocess.run(
+            [str(hooks_dir / "session-start.sh")],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=tmp_path,
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_idle_namespaces_are_collected(self, hooks_dir: Path, tmp_path: Path) -> None:
+        state_root = tmp_path / "state"
+        stale, fresh, read = state_root / "old.%x", state_root / "new.%y", state_root / "read.%z"
+        for ns in (stale, fresh, read):
+            ns.mkdir(parents=True)
+            (ns / ".workflow_state").write_text("phase\timplementing\n")
+        (state_root / ".active.%x").write_text("old\n")
+        (state_root / ".active.%z").write_text("read\n")
+        self._age(stale, 3 * 3600)
+        self._age(read, 3 * 3600)
+        # A session that only reads its state still marks it as in use
+        (read / ".seen").touch()
+
+        self._start(hooks_dir, tmp_path, state_root)
+
+        assert not stale.exists()
+        assert not (state_root / ".active.%x").exists()
+        assert fresh.exists()
+        assert read.exists()
+        assert (state_root / ".active.%z").exists()
+
+        # Collection ran just now, so the next SessionStart skips it
+        stale.mkdir()
+        self._age(stale, 3 * 3600)
+        self._start(hooks_dir, tmp_path, state_root)
+        assert stale.exists()
+
+        # ... until the idle window has passed, even within a day
+        (state_root / ".gc").write_text(f"{int(time.time()) - 3 * 3600}\n")
+        self._start(hooks_dir, tmp_path, state_root)
+        assert not stale.exists()
+
+    def test_reads_mark_the_namespace_in_use(self, hooks_dir: Path, tmp_path: Path) -> None:
+        state_root = tmp_path / "state"
+        self._run(hooks_dir, state_root, tmp_path, "set", "phase", "x", CLAUDE_SESSION_ID="s1")
+        (namespace,) = state_root.glob("s1.*")
+        self._age(namespace, 3 * 3600)
+
+        self._run(hooks_dir, state_root, tmp_path, "get", "phase", CLAUDE_SESSION_ID="s1")
+
+        assert time.time() - (namespace / ".seen").stat().st_mtime < 60
@@ -0,0 +1,103 @@
+"""Tests for validate-task-description.sh section detection."""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from .conftest import HookCase, hook_cases
+
+FULL_PROMPT = "\n".join(
+    [
+        "## Task: Add parser",
+        "## Purpose",
+        "## Context",
+        "## Requirements",
+        "## Environment",
+        "## Potential Failure Modes",
+        "## Required Skills",
+        "## Success Criteria",
+    ]
+)
+REMINDER = (
+    "REMINDER: Every task requires THREE dispatches: code-implementer -> spec-reviewer -> "
+    "quality-reviewer. Skipping reviewers is not optimization."
+)
+
+
+def dispatch_case(case_id: str, agent: str, prompt: str, **expected: Any) -> HookCase:
+    return HookCase(
+        id=case_id,
+        event="PreToolUse",
+        matcher="Task",
+        tool_name="Task",
+        tool_input=json.dumps({"subagent_type": agent, "prompt": prompt}),
+        **expected,
+    )
+
+
+CASES = (
+    dispatch_case(
+        "complete-implementer-prompt",
+        "code-implementer",
+        FULL_PROMPT,
+        expect={"hookSpecificOutput": {"additionalContext": REMINDER}},
+    ),
+    dispatch_case("complete-reviewer-prompt", "spec-reviewer", FULL_PROMPT, expect={}),
+    dispatch_case(
+        "missing-core-and-enhanced",
+        "code-implementer",
+        "## Task: Add parser\n## Context\nDo it.",
+        contains=(
+            "Missing core sections: Requirements section, Success Criteria.",
+            "Also missing enhanced sections: Purpose (WHY task matters), Environment "
+            "Verification, Potential Failure Modes, Required Skills.",
+        ),
+    ),
+    dispatch_case(
+        "enhanced-only",
+        "quality-reviewer",
+        "## Task: Review\n## Context\n## Requirements\n## Success\n## Purpose",
+        contains=(
+            "TASK DESCRIPTION SUGGESTION: Consider adding enhanced sections: "
+            "Environment Verification, Potential Failure Modes, Required Skills.",
+        ),
+    ),
+    dispatch_case(
+        "case-insensitive",
+        "spec-reviewer",
+        FULL_PROMPT.upper(),
+        expect={},
+    ),
+    dispatch_case(
+        "numbered-task-header",
+        "spec-reviewer",
+        FULL_PROMPT.replace("## Task:", "## Task 12:"),
+        expect={},
+    ),
+    dispatch_case(
+        "parallel-review-reminder",
+        "code-implementer",
+        FULL_PROMPT,
+        env={"WORKFLOW_REVIEW_MODE": "parallel"},
+        contains=("spec-reviewer and quality-reviewer in parallel",),
+    ),
+    dispatch_case("other-agents-ignored", "Explore", "find uses", expect={}),
+    dispatch_case(
+        "configured-extra-section",
+        "spec-reviewer",
+        FULL_PROMPT,
+        files={"sections.conf": "# project sections\ncore:Rollback plan:## Rollback\n"},
+        env={"WORKFLOW_TASK_SECTIONS": "sections.conf"},
+        contains=("Missing core sections: Rollback plan.",),
+    ),
+)
+
+
+class TestTaskSections:
+    """All configured sections are detected in one pass over the prompt."""
+
+    @hook_cases(*CASES)
+    def test_case(
+        self, replay_hook: Callable[[HookCase], dict[str, Any]], case: HookCase
+    ) -> None:
+        replay_hook(case)
@@ -3,8 +3,12 @@
 import json
 import os
 import subprocess
-import tempfile
+from collections.abc import Callable
+from dataclasses import replace
 from pathlib import Path
+from typing import Any
+
+from .conftest import HookCase, git, hook_cases
 
 
 class TestTodoInjectorBehavior:
@@ -29,17 +33,8 @@ class TestTodoInjectorBehavior:
         assert "implementing" in content, (
             "todo-injector.sh should check for implementing phase"
         )
-        assert ".workflow_phase" in content, (
-            "todo-injector.sh should read .workflow_phase file"
-        )
-
-    def test_todo_injector_respects_workflow_skip(self, plugin_root: Path) -> None:
-        """todo-injector.sh must respect the .workflow_skip file."""
-        script = plugin_root / "hooks" / "todo-injector.sh"
-        content = script.read_text()
-
-        assert ".workflow_skip" in content, (
-            "todo-injector.sh should check for .workflow_skip"
+        assert "WF_PHASE" in content, (
+            "todo-injector.sh should read the workflow phase"
         )
 
     def test_todo_injector_extracts_task_number(self, plugin_root: Path) -> None:
@@ -48,7 +43,7 @@ class TestTodoInjectorBehavior:
         content = script.read_text()
 
         assert "Task" in content, "todo-injector.sh should look for Task pattern"
-        assert "TASK_NUM" in content, "todo-injector.sh should extract TASK_NUM"
+        assert "task_num" in content, "todo-injector.sh should extract task_num"
 
     def test_todo_injector_parses_test_file(self, plugin_root: Path) -> None:
         """todo-injector.sh must parse Test: line from Files section."""
@@ -56,7 +51,7 @@ class TestTodoInjectorBehavior:
         content = script.read_text()
 
         assert "Test:" in content, "todo-injector.sh should look for Test: line"
-        assert "TEST_FILE" in content, "todo-injector.sh should extract TEST_FILE"
+        assert "test_file" in content, "todo-injector.sh should extract test_file"
 
     def test_todo_injector_uses_correct_format(self, plugin_root: Path) -> None:
         """todo-injector.sh must use TODO:BACKLOG[task-N] format."""
@@ -66,7 +61,7 @@ class TestTodoInjectorBehavior:
         assert "TODO:BACKLOG" in content, (
             "todo-injector.sh should use TODO:BACKLOG marker"
         )
-        assert "task-${TASK_NUM}" in content or "task-$TASK_NUM" in content, (
+        assert "task-${task_num}" in content, (
             "todo-injector.sh should include task number in marker"
         )
 
@@ -75,18 +70,8 @@ class TestTodoInjectorBehavior:
         script = plugin_root / "hooks" / "todo-injector.sh"
         content = script.read_text()
 
-        assert ".backlog_todos" in content, (
-            "todo-injector.sh should track injections in .backlog_todos"
-        )
-
-    def test_todo_injector_is_idempotent(self, plugin_root: Path) -> None:
-        """todo-injector.sh must check for existing TODO before injecting."""
-        script = plugin_root / "hooks" / "todo-injector.sh"
-        content = script.read_text()
-
-        # Should check if TODO already exists
-        assert "grep" in content and "TODO:BACKLOG" in content, (
-            "todo-injector.sh should check for existing TODO marker"
+        assert "hook_state_add todo" in content, (
+            "todo-injector.sh should track injections in the todo ledger"
         )
 
     def test_todo_injector_handles_comment_syntax(self, plugin_root: Path) -> None:
@@ -95,7 +80,7 @@ class TestTodoInjectorBehavior:
         content = script.read_text()
 
         # Should have comment prefix logic
-        assert "COMMENT_PREFIX" in content or "get_comment_prefix" in content, (
+        assert "comment_prefix" in content or "get_comment_prefix" in content, (
             "todo-injector.sh should determine comment prefix"
         )
         # Should handle Python (#) and JS (//)
@@ -121,15 +106,6 @@ class TestTodoSweepBehavior:
         is_executable = mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
         assert is_executable, "todo-sweep.sh not executable"
 
-    def test_todo_sweep_respects_workflow_skip(self, plugin_root: Path) -> None:
-        """todo-sweep.sh must respect the .workflow_skip file."""
-        script = plugin_root / "hooks" / "todo-sweep.sh"
-        content = script.read_text()
-
-        assert ".workflow_skip" in content, (
-            "todo-sweep.sh should check for .workflow_skip"
-        )
-
     def test_todo_sweep_searches_for_markers(self, plugin_root: Path) -> None:
         """todo-sweep.sh must search for TODO:BACKLOG markers."""
         script = plugin_root / "hooks" / "todo-sweep.sh"
@@ -164,193 +140,351 @@ class TestTodoSweepBehavior:
         assert "WARNING" in content, (
             "todo-sweep.sh should output WARNING when markers remain"
         )
-        assert "hookSpecificOutput" in content, (
-            "todo-sweep.sh should output JSON with hookSpecificOutput"
+        assert "hook_context" in content, (
+            "todo-sweep.sh should report through hookSpecificOutput context"
         )
 
 
+MARKER = "# TODO:BACKLOG[task-{}]: See backlog for requirements\n"
+SWEEP_INPUT = json.dumps({"skill": "verification"})
+
+INTEGRATION_CASES = (
+    HookCase(
+        id="injector-skips-other-agents",
+        event="PreToolUse",
+        matcher="Task",
+        tool_name="Task",
+        tool_input="spec-reviewer task description",
+        state={"phase": "implementing"},
+        expect={},
+    ),
+    HookCase(
+        id="injector-skips-outside-implementing",
+        event="PreToolUse",
+        matcher="Task",
+        tool_name="Task",
+        tool_input="code-implementer\n## Task 1: Test\n- Test: tests/test_app.py\n",
+        state={"phase": "brainstorming"},
+        files_after={"tests/test_app.py": "!TODO:BACKLOG"},
+    ),
+    HookCase(
+        id="injector-respects-skip",
+        event="PreToolUse",
+        matcher="Task",
+        tool_name="Task",
+        tool_input="code-implementer\n## Task 1: Skip\n- Test: tests/test_app.py\n",
+        state={"phase": "implementing", "skip": "1"},
+        expect={},
+        files_after={"tests/test_app.py": "!TODO:BACKLOG"},
+    ),
+    HookCase(
+        id="injector-injects-into-existing-file",
+        event="PreToolUse",
+        matcher="Task",
+        tool_name="Task",
+        tool_input="code-implementer dispatch\n## Task 3: Add feature\n### Files\n"
+        "- Test: tests/test_app.py\n",
+        state={"phase": "implementing"},
+        contains=("TODO:BACKLOG[task-3] injected into tests/test_app.py",),
+        files_after={"tests/test_app.py": MARKER.format(3)},
+    ),
+    HookCase(
+        id="sweep-respects-skip",
+        event="PreToolUse",
+        matcher="Skill.*(verification|verify)",
+        tool_name="Skill",
+        tool_input=SWEEP_INPUT,
+        state={"skip": "1"},
+        files={"tests/test_example.py": MARKER.format(1)},
+        expect={},
+    ),
+    HookCase(
+        id="sweep-finds-remaining-markers",
+        event="PreToolUse",
+        matcher="Skill.*(verification|verify)",
+        tool_name="Skill",
+        tool_input=SWEEP_INPUT,
+        files={"tests/test_example.py": MARKER.format(5) + "def test_something():\n    pass\n"},
+        contains=("WARNING", "tests/test_example.py: TODO:BACKLOG[task-5]"),
+    ),
+    HookCase(
+        id="sweep-clean-without-markers",
+        event="PreToolUse",
+        matcher="Skill.*(verification|verify)",
+        tool_name="Skill",
+        tool_input=SWEEP_INPUT,
+        contains=("No task markers remain",),
+    ),
+)
+
+
 class TestTodoInjectionIntegration:
-    """Integration tests that actually run the hooks."""
+    """Integration tests that replay hook events through dispatch.sh."""
 
-    def test_todo_injector_skips_when_not_code_implementer(
-        self, plugin_root: Path
+    @hook_cases(*INTEGRATION_CASES)
+    def test_case(
+        self, replay_hook: Callable[[HookCase], dict[str, Any]], case: HookCase
     ) -> None:
-        """todo-injector.sh should skip when not code-implementer dispatch."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            env = os.environ.copy()
-            env["CLAUDE_TOOL_NAME"] = "Task"
-            env["CLAUDE_TOOL_INPUT"] = "spec-reviewer task description"
-            env["CLAUDE_SESSION_DIR"] = tmpdir
-
-            result = subprocess.run(
-                [str(plugin_root / "hooks" / "todo-injector.sh")],
-                capture_output=True,
-                text=True,
-                env=env,
-            )
+        replay_hook(case)
+
+    def test_todo_injector_is_idempotent(
+        self,
+        replay_hook: Callable[[HookCase], dict[str, Any]],
+        session_state: Callable[[Path], dict[str, list[str]]],
+        hook_repo: Path,
+        tmp_path: Path,
+    ) -> None:
+        """A second dispatch of the same task leaves the file and ledger alone."""
+        case = HookCase(
+            id="idempotent",
+            event="PreToolUse",
+            matcher="Task",
+            tool_name="Task",
+            tool_input="code-implementer\n## Task 2: X\n- Test: tests/test_app.py\n",
+            state={"phase": "implementing"},
+        )
+        replay_hook(case)
+        ledger = session_state(tmp_path / "session")["todo"]
+        replay_hook(replace(case, state={"phase": "implementing", "todo": ledger}))
 
-            assert result.returncode == 0
-            assert result.stdout.strip() == "{}"
+        content = (hook_repo / "tests" / "test_app.py").read_text()
+        assert content.count("TODO:BACKLOG[task-2]") == 1
+        assert session_state(tmp_path / "session")["todo"] == ["task-2:tests/test_app.py"]
 
-    def test_todo_injector_skips_when_not_implementing_phase(
-        self, plugin_root: Path
-    ) -> None:
-        """todo-injector.sh should skip when not in implementing phase."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Set phase to something other than implementing
-            Path(tmpdir, ".workflow_phase").write_text("brainstorming")
-
-            env = os.environ.copy()
-            env["CLAUDE_TOOL_NAME"] = "Task"
-            env["CLAUDE_TOOL_INPUT"] = "code-implementer ## Task 1: Test"
-            env["CLAUDE_SESSION_DIR"] = tmpdir
-
-            result = subprocess.run(
-                [str(plugin_root / "hooks" / "todo-injector.sh")],
-                capture_output=True,
-                text=True,
-                env=env,
-            )
 
-            assert result.returncode == 0
-            assert result.stdout.strip() == "{}"
-
-    def test_todo_injector_injects_into_existing_file(self, plugin_root: Path) -> None:
-        """todo-injector.sh should inject TODO into existing test file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a test file
-            test_file = Path(tmpdir) / "test_example.py"
-            test_file.write_text("import pytest\n\ndef test_something():\n    pass\n")
-
-            # Set up session state
-            Path(tmpdir, ".workflow_phase").write_text("implementing")
-
-            task_input = f"""code-implementer dispatch
-## Task 3: Add feature
-### Files
-- Test: {test_file}
-"""
-
-            env = os.environ.copy()
-            env["CLAUDE_TOOL_NAME"] = "Task"
-            env["CLAUDE_TOOL_INPUT"] = task_input
-            env["CLAUDE_SESSION_DIR"] = tmpdir
-
-            result = subprocess.run(
-                [str(plugin_root / "hooks" / "todo-injector.sh")],
-                capture_output=True,
-                text=True,
-                env=env,
-                cwd=tmpdir,
-            )
+class TestTodoSweepLedger:
+    """todo-sweep.sh checks the .backlog_todos ledger before the whole tree."""
 
-            assert result.returncode == 0
+    def _write_marker(self, path: Path, task: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f"import pytest\n# TODO:BACKLOG[task-{task}]: See backlog for requirements\n"
+        )
 
-            # Check file was modified
-            content = test_file.read_text()
-            assert "TODO:BACKLOG[task-3]" in content, (
-                f"TODO not injected. Content: {content}"
-            )
+    def _sweep(
+        self,
+        run_hook: Callable[..., subprocess.CompletedProcess[str]],
+        tmp_path: Path,
+        env: dict[str, str] | None = None,
+    ) -> str:
+        result = run_hook(
+            "todo-sweep.sh",
+            session_dir=tmp_path,
+            env=env,
+            tool_input="verification skill",
+        )
+        assert result.returncode == 0
+        return json.loads(result.stdout)["hookSpecificOutput"]["additionalContext"]
 
-            # Check tracking file
-            tracker = Path(tmpdir) / ".backlog_todos"
-            assert tracker.exists(), "Tracker file not created"
-            assert "task-3" in tracker.read_text()
-
-    def test_todo_sweep_finds_remaining_markers(self, plugin_root: Path) -> None:
-        """todo-sweep.sh should find and report remaining TODO:BACKLOG markers."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a file with a TODO marker
-            test_file = Path(tmpdir) / "test_example.py"
-            test_file.write_text(
-                "# TODO:BACKLOG[task-5]: See backlog for requirements\n"
-                "def test_something():\n    pass\n"
-            )
+    def test_only_ledger_files_are_checked(
+        self, run_hook: Callable[..., subprocess.CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        self._write_marker(tmp_path / "tests" / "test_tracked.py", 1)
+        self._write_marker(tmp_path / "tests" / "test_untracked.py", 2)
+        (tmp_path / ".backlog_todos").write_text(
+            "task-1:tests/test_tracked.py\n"
+            "task-1:tests/test_tracked.py\n"
+            "task-3:tests/test_later.py:pending\n"
+        )
 
-            env = os.environ.copy()
-            env["CLAUDE_TOOL_INPUT"] = "verification skill"
-            env["CLAUDE_SESSION_DIR"] = tmpdir
+        context = self._sweep(run_hook, tmp_path)
 
-            result = subprocess.run(
-                [str(plugin_root / "hooks" / "todo-sweep.sh")],
-                capture_output=True,
-                text=True,
-                env=env,
-                cwd=tmpdir,
-            )
+        assert "1 task marker(s) remain" in context
+        assert "tests/test_tracked.py: TODO:BACKLOG[task-1]" in context
+        assert "test_untracked.py" not in context
 
-            assert result.returncode == 0
-            output = result.stdout
-
-            # Should find the marker and report it
-            assert "WARNING" in output, f"Expected WARNING in output: {output}"
-            assert "task-" in output, f"Expected task reference in output: {output}"
-
-    def test_todo_sweep_clean_when_no_markers(self, plugin_root: Path) -> None:
-        """todo-sweep.sh should report clean when no TODO:BACKLOG markers exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a file without TODO markers
-            test_file = Path(tmpdir) / "test_example.py"
-            test_file.write_text("def test_something():\n    pass\n")
-
-            env = os.environ.copy()
-            env["CLAUDE_TOOL_INPUT"] = "verification skill"
-            env["CLAUDE_SESSION_DIR"] = tmpdir
-
-            result = subprocess.run(
-                [str(plugin_root / "hooks" / "todo-sweep.sh")],
-                capture_output=True,
-                text=True,
-                env=env,
-                cwd=tmpdir,
-            )
+    def test_pending_entries_checked_once_created(
+        self, run_hook: Callable[..., subprocess.CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        (tmp_path / ".backlog_todos").write_text("task-4:tests/test_new.py:pending\n")
+        assert "No task markers remain" in self._sweep(run_hook, tmp_path)
 
-            assert result.returncode == 0
-            output = result.stdout
+        self._write_marker(tmp_path / "tests" / "test_new.py", 4)
+        assert "TODO:BACKLOG[task-4]" in self._sweep(run_hook, tmp_path)
 
-            # Should report all clear
-            assert "No task markers remain" in output or "SWEEP" in output
+    def test_full_sweep_on_request(
+        self, run_hook: Callable[..., subprocess.CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        self._write_marker(tmp_path / "tests" / "test_untracked.py", 2)
+        (tmp_path / ".backlog_todos").write_text("task-9:tests/test_later.py:pending\n")
 
+        assert "No task markers remain" in self._sweep(run_hook, tmp_path)
+        context = self._sweep(run_hook, tmp_path, env={"WORKFLOW_TODO_SWEEP": "full"})
+        assert "test_untracked.py: TODO:BACKLOG[task-2]" in context
 
-class TestHooksJsonRegistration:
-    """Tests that new hooks are properly registered in hooks.json."""
 
-    def test_todo_injector_registered_in_hooks_json(self, plugin_root: Path) -> None:
-        """todo-injector.sh must be registered in PreToolUse hooks.json."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
+class TestTodoSweepTreeScan:
+    """The full-tree sweep uses git grep inside a work tree."""
 
-        pretool_hooks = data.get("hooks", {}).get("PreToolUse", [])
+    def test_git_scan_honours_gitignore(
+        self, run_hook: Callable[..., subprocess.CompletedProcess[str]], hook_repo: Path,
+        tmp_path: Path,
+    ) -> None:
+        (hook_repo / ".gitignore").write_text("target/\ncoverage/\n")
+        files = {
+            "tests/test_tracked.py": 1,
+            "tests/test_untracked.py": 2,
+            "target/generated.py": 3,
+            "coverage/report.js": 4,
+        }
+        for name, task in files.items():
+            path = hook_repo / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(MARKER.format(task))
+        git(hook_repo, "add", ".gitignore", "tests/test_tracked.py")
+
+        result = run_hook(
+            "todo-sweep.sh",
+            session_dir=tmp_path,
+            cwd=hook_repo,
+            tool_input="verification skill",
+        )
+        context = json.loads(result.stdout)["hookSpecificOutput"]["additionalContext"]
+
+        assert "2 task marker(s) remain" in context
+        assert "tests/test_tracked.py: TODO:BACKLOG[task-1]" in context
+        assert "tests/test_untracked.py: TODO:BACKLOG[task-2]" in context
+        assert "target/" not in context
+        assert "coverage/" not in context
+
+
+class TestTodoBatchInjector:
+    """todo-batch-injector.sh places every backlog marker at /implement start."""
+
+    BACKLOG = (
+        "## Task 1: Parse\n\n- Test: `tests/test_core.py`\n\nRun: `pytest`\n\n"
+        "## Task 2: Format\n\n- Test: `tests/test_core.py`\n\nRun: `pytest`\n\n"
+        "## Task 3: Export\n\n- Test: `tests/test_export.py`\n\nRun: `pytest`\n\n"
+        "## Task 4: Done already [COMPLETED]\n\n- Test: `tests/test_core.py`\n\nRun: `pytest`\n"
+    )
+
+    def _inject(
+        self, run_hook: Callable[..., subprocess.CompletedProcess[str]], tmp_path: Path
+    ) -> dict[str, Any]:
+        result = run_hook(
+            "todo-batch-injector.sh",
+            session_dir=tmp_path,
+            cwd=tmp_path,
+            tool_name="Skill",
+            tool_input='{"skill": "orchestrating-subagents"}',
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    def _setup(self, tmp_path: Path) -> Path:
+        backlog = tmp_path / "docs" / "backlogs" / "feature.md"
+        backlog.parent.mkdir(parents=True)
+        backlog.write_text(self.BACKLOG)
+        (tmp_path / ".backlog_path").write_text(f"{backlog}\n")
+        test_file = tmp_path / "tests" / "test_core.py"
+        test_file.parent.mkdir()
+        test_file.write_text("import pytest\n\n\ndef test_core():\n    assert True\n")
+        test_file.chmod(0o755)
+        return test_file
+
+    def test_groups_markers_per_test_file(
+        self,
+        run_hook: Callable[..., subprocess.CompletedProcess[str]],
+        session_state: Callable[[Path], dict[str, list[str]]],
+        tmp_path: Path,
+    ) -> None:
+        test_file = self._setup(tmp_path)
 
-        # Collect all commands from PreToolUse Task hooks
-        all_commands = []
-        for hook_entry in pretool_hooks:
-            if hook_entry.get("matcher") == "Task":
-                for hook in hook_entry.get("hooks", []):
-                    all_commands.append(hook.get("command", ""))
-        commands_str = " ".join(all_commands)
+        output = self._inject(run_hook, tmp_path)
 
-        assert "todo-injector.sh" in commands_str, (
-            "todo-injector.sh not registered in PreToolUse Task hooks"
+        assert test_file.read_text() == (
+            "import pytest\n"
+            "# TODO:BACKLOG[task-1]: See backlog for requirements\n"
+            "# TODO:BACKLOG[task-2]: See backlog for requirements\n"
+            "\n\ndef test_core():\n    assert True\n"
         )
+        assert test_file.stat().st_mode & 0o111, "executable bit lost on rewrite"
+        assert session_state(tmp_path)["todo"] == [
+            "task-1:tests/test_core.py",
+            "task-2:tests/test_core.py",
+            "task-3:tests/test_export.py:pending",
+        ]
+        context = output["hookSpecificOutput"]["additionalContext"]
+        assert "2 marker(s) written to 1 test file(s)" in context
+        assert "1 task(s) are pending" in context
+
+    def test_second_run_changes_nothing(
+        self, run_hook: Callable[..., subprocess.CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        test_file = self._setup(tmp_path)
+        self._inject(run_hook, tmp_path)
+        content = test_file.read_text()
+        store = (tmp_path / ".workflow_state").read_text()
 
-    def test_todo_sweep_registered_in_hooks_json(self, plugin_root: Path) -> None:
-        """todo-sweep.sh must be registered in hooks.json."""
-        hooks_json = plugin_root / "hooks" / "hooks.json"
-        data = json.loads(hooks_json.read_text())
+        assert self._inject(run_hook, tmp_path) == {}
+        assert test_file.read_text() == content
+        assert (tmp_path / ".workflow_state").read_text() == store
 
-        pretool_hooks = data.get("hooks", {}).get("PreToolUse", [])
+    def test_rewrite_keeps_mode_and_symlinks(
+        self, run_hook: Callable[..., subprocess.CompletedProcess[str]], tmp_path: Path
+    ) -> None:
+        test_file = self._setup(tmp_path)
+        target = tmp_path / "shared" / "test_core.py"
+        target.parent.mkdir()
+        target.write_text(test_file.read_text())
+        target.chmod(0o640)
+        test_file.unlink()
+        test_file.symlink_to(target)
+
+        self._inject(run_hook, tmp_path)
+
+        assert test_file.is_symlink()
+        assert "TODO:BACKLOG[task-1]" in target.read_text()
+        assert target.stat().st_mode & 0o777 == 0o640
+
+    def test_removed_markers_stay_removed(
+        self,
+        run_hook: Callable[..., subprocess.CompletedProcess[str]],
+        session_state: Callable[[Path], dict[str, list[str]]],
+        tmp_path: Path,
+    ) -> None:
+        """A task whose marker the implementer removed is not injected again."""
+        test_file = self._setup(tmp_path)
+        self._inject(run_hook, tmp_path)
+        test_file.write_text(
+            test_file.read_text().replace(
+                "# TODO:BACKLOG[task-1]: See backlog for requirements\n", ""
+            )
+        )
+
+        assert self._inject(run_hook, tmp_path) == {}
+        assert "TODO:BACKLOG[task-1]" not in test_file.read_text()
+        assert session_state(tmp_path)["todo"].count("task-1:tests/test_core.py") == 1
+
+
+class TestHooksJsonRegistration:
+    """Tests that new hooks are properly registered in hooks.json."""
 
-        # Collect all commands from PreToolUse hooks matching verification
-        verification_commands = []
-        for hook_entry in pretool_hooks:
-            matcher = hook_entry.get("matcher", "")
-            if "verification" in matcher or "verify" in matcher:
-                for hook in hook_entry.get("hooks", []):
-                    verification_commands.append(hook.get("command", ""))
+    def test_todo_batch_injector_runs_after_task_counter(
+        self, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """The batch injector needs the backlog path the counter records."""
+        checks = hook_registry[("PreToolUse", "Skill.*(orchestrating|implement)")]
+        assert checks.index("backlog-task-counter.sh") < checks.index("todo-batch-injector.sh")
 
-        commands_str = " ".join(verification_commands)
+    def test_todo_injector_registered_in_hooks_json(
+        self, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """todo-injector.sh must be dispatched for PreToolUse Task."""
+        assert "todo-injector.sh" in hook_registry[("PreToolUse", "Task")], (
+            "todo-injector.sh not registered in PreToolUse Task hooks"
+        )
 
-        assert "todo-sweep.sh" in commands_str, (
+    def test_todo_sweep_registered_in_hooks_json(
+        self, hook_registry: dict[tuple[str, str], list[str]]
+    ) -> None:
+        """todo-sweep.sh must be dispatched for PreToolUse verification skills."""
+        # Collect all checks from PreToolUse entries matching verification
+        verification_checks = []
+        for (event, matcher), checks in hook_registry.items():
+            if event == "PreToolUse" and ("verification" in matcher or "verify" in matcher):
+                verification_checks.extend(checks)
+
+        assert "todo-sweep.sh" in verification_checks, (
             "todo-sweep.sh not registered in PreToolUse verification hooks"
         )